@@ -0,0 +1,435 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Offscreen rendering: must be set before pygame creates any display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game.config import *
+from game.core.level_manager import LevelManager
+from game.core.level_pack import LevelPack
+from game.core.simulation import Simulation
+from game.entities import GameMap
+from game.systems.pathfinding import FlowField, HierarchicalPathfinder
+from game.systems.camera import Camera
+from game.systems.replay import encode_keys, GAME_KEYS
+from game.systems.snapshot import encode_snapshot, decode_snapshot
+from game.utils import atomic_write
+
+# Headless benchmarks for the simulation and rendering hot paths.
+# Each result is one JSON object per line, so runs from two commits can be diffed:
+#   python -m game.benchmark --output bench_output.txt
+#   python -m game.benchmark --compare bench_output.txt
+
+_INPUT_PERIOD = 90
+_KEY_RIGHT = encode_keys({key: key == pygame.K_d for key in GAME_KEYS})
+_KEY_LEFT = encode_keys({key: key == pygame.K_a for key in GAME_KEYS})
+
+
+class Scenario:
+    def __init__(self, name: str, layout, player_start, enemies, fireballs: int = 3):
+        self.name = name
+        self.layout = layout
+        self.player_start = player_start
+        self.enemies = enemies
+        self.fireballs = fireballs
+
+    def build(self, batched: bool = None) -> Simulation:
+        return Simulation(self.layout, self.player_start, self.enemies, self.fireballs, batched=batched)
+
+
+def level_scenarios(level_manager: LevelManager):
+    for i in range(level_manager.level_count):
+        level_manager.set_level(i)
+        yield Scenario(
+            f"level{i}:{level_manager.get_current_level_name()}",
+            level_manager.get_current_level_data(),
+            level_manager.get_player_start(),
+            level_manager.get_current_level_enemies(),
+            level_manager.get_current_level_fireballs()
+        )
+
+
+def synthetic_layout(width: int, height: int, seed: int = 0):
+    # Floors every 4 rows with gaps, joined by ladders, coins scattered on the floors
+    rng = random.Random(seed)
+    grid = [[BLANK] * width for _ in range(height)]
+    for c in range(width):
+        grid[0][c] = grid[height - 1][c] = GROUND
+    for r in range(height):
+        grid[r][0] = grid[r][width - 1] = GROUND
+
+    for r in range(4, height - 1, 4):
+        for c in range(1, width - 1):
+            if rng.random() > 0.08:
+                grid[r][c] = GROUND
+        for _ in range(max(1, width // 10)):
+            c = rng.randrange(1, width - 1)
+            for lr in range(r - 4, r + 1):
+                if lr > 0:
+                    grid[lr][c] = LADDER
+
+    for _ in range(max(1, width * height // 150)):
+        r = rng.randrange(3, height - 1, 4)
+        c = rng.randrange(1, width - 1)
+        if grid[r][c] == BLANK:
+            grid[r][c] = COIN
+
+    return ["".join(row) for row in grid]
+
+
+def synthetic_scenario(name: str, width: int, height: int, enemy_count: int, seed: int = 0) -> Scenario:
+    layout = synthetic_layout(width, height, seed)
+    rng = random.Random(seed + 1)
+    open_cells = [(r, c) for r in range(1, height - 1) for c in range(1, width - 1)
+                  if layout[r][c] == BLANK and layout[r + 1][c] in (GROUND, LADDER)]
+    player = open_cells[0] if open_cells else (height - 2, 1)
+    # Keep enemies away from the player so runs last long enough to measure
+    far = [cell for cell in open_cells if abs(cell[0] - player[0]) + abs(cell[1] - player[1]) > 8]
+    enemies = [{'r': r, 'c': c} for r, c in rng.sample(far, min(enemy_count, len(far)))]
+    return Scenario(name, layout, {'r': player[0], 'c': player[1]}, enemies)
+
+
+def synthetic_scenarios():
+    yield synthetic_scenario("large:140x80", 140, 80, 8)
+    yield synthetic_scenario("crowd:35x20x40", MAP_WIDTH, MAP_HEIGHT, 40)
+    yield synthetic_scenario("crowd:140x80x200", 140, 80, 200)
+
+
+def viewport_scenarios():
+    # Only drawn through the camera; a full-level layer or flow field at this size is not the point
+    yield synthetic_scenario("huge:1000x500", 1000, 500, 0)
+
+
+def chase_scenarios():
+    # Maps big enough for HierarchicalPathfinder, with enemies spread over all of them
+    yield synthetic_scenario("chase:140x80x50", 140, 80, 50)
+    yield synthetic_scenario("chase:400x200x50", 400, 200, 50)
+    yield synthetic_scenario("chase:1000x500x50", 1000, 500, 50)
+
+
+def swarm_scenarios():
+    for count in (50, 200, 500, 1000):
+        yield synthetic_scenario(f"swarm:140x80x{count}", 140, 80, count)
+
+
+def _median_time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_ticks(scenario: Scenario, ticks: int, batched: bool = None) -> dict:
+    # Levels that end early (caught or won) are restarted; only stepping is timed
+    elapsed = 0.0
+    done = 0
+    restarts = 0
+    while done < ticks:
+        sim = scenario.build(batched)
+        start = time.perf_counter()
+        while done < ticks and sim.is_running:
+            right = (sim.tick_count // _INPUT_PERIOD) % 2 == 0
+            sim.set_input(_KEY_RIGHT if right else _KEY_LEFT)
+            sim.step()
+            done += 1
+        elapsed += time.perf_counter() - start
+        restarts += 1
+    return {"ticks_per_sec": done / elapsed, "ms_per_tick": elapsed * 1000 / done, "runs": restarts}
+
+
+def bench_enemy_storage(scenario: Scenario, ticks: int) -> dict:
+    # Enemy movement alone, stepped as Enemy objects and as an EnemyBatch. The player
+    # stays put, so the shared flow field is built once and not timed.
+    result = {"enemies": len(scenario.enemies)}
+    for label, batched in (("objects", False), ("batched", True)):
+        sim = scenario.build(batched)
+        goal = sim.player.row, sim.player.col
+        sim.flow_field.update(sim.map, goal)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            if batched:
+                sim.enemy_batch.step(sim.map, goal, sim.flow_field)
+            else:
+                for enemy in sim.enemies:
+                    enemy.update(FIXED_DT, sim.map, goal, sim.flow_field)
+                    sim.enemy_index.move(enemy)
+        result[f"{label}_ms_per_tick"] = (time.perf_counter() - start) * 1000 / ticks
+    result["speedup"] = result["objects_ms_per_tick"] / result["batched_ms_per_tick"]
+    return result
+
+
+def bench_pathfinding(scenario: Scenario, repeat: int) -> dict:
+    game_map = GameMap(scenario.layout)
+    cells = [(e['r'], e['c']) for e in scenario.enemies] or [(1, 1)]
+    # Goals spread across the whole graph, so every update is a full rebuild of realistic size
+    nodes = sorted(game_map.nav.adjacency)
+    goals = nodes[::max(1, len(nodes) // 32)] or [(1, 1)]
+    field = FlowField()
+
+    def rebuild_all():
+        for goal in goals:
+            field.update(game_map, goal)
+
+    def query_all():
+        for cell in cells:
+            field.next_move(cell)
+
+    rebuild = _median_time(rebuild_all, repeat) / len(goals)
+    query = _median_time(query_all, repeat * 10) / len(cells)
+    nav_build = _median_time(game_map.nav.rebuild, repeat)
+    return {
+        "flow_rebuild_us": rebuild * 1e6,
+        "query_us_per_enemy": query * 1e6,
+        "amortized_us_per_enemy": (rebuild / len(cells) + query) * 1e6,
+        "nav_build_us": nav_build * 1e6,
+        "enemies": len(scenario.enemies),
+    }
+
+
+def bench_hierarchical(scenario: Scenario, repeat: int, flow: bool = True) -> dict:
+    # Goal changes with every enemy asking for its next step, as in a tick where the
+    # player moved. Goals jump across the map, so each one is a fresh abstract search;
+    # the first pass also builds every region it touches.
+    game_map = GameMap(scenario.layout)
+    cells = [(e['r'], e['c']) for e in scenario.enemies] or [(1, 1)]
+    open_cells = [(r, c) for r, row in enumerate(scenario.layout) for c, tile in enumerate(row) if tile != GROUND]
+    goals = open_cells[::max(1, len(open_cells) // 32)]
+
+    def chase(pathfinder):
+        def run():
+            for goal in goals:
+                pathfinder.update(game_map, goal)
+                for cell in cells:
+                    pathfinder.next_move(cell)
+        return run
+
+    hierarchical = chase(HierarchicalPathfinder())
+    start = time.perf_counter()
+    hierarchical()
+    cold = time.perf_counter() - start
+    result = {
+        "hpa_cold_ms_per_goal": cold * 1000 / len(goals),
+        "hpa_ms_per_goal": _median_time(hierarchical, repeat) * 1000 / len(goals),
+        "regions": len(game_map.regions),
+        "enemies": len(cells),
+    }
+    if flow:
+        game_map.nav
+        result["flow_ms_per_goal"] = _median_time(chase(FlowField()), repeat) * 1000 / len(goals)
+    return result
+
+
+def _tile_assets():
+    assets = {}
+    for tile, filename in ((GROUND, 'ground.png'), (LADDER, 'ladder.gif'), (COIN, 'coin.jpg')):
+        path = os.path.join(ASSETS_DIR, filename)
+        try:
+            img = pygame.image.load(path).convert_alpha()
+        except (pygame.error, FileNotFoundError):
+            img = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            img.fill((128, 0, 128))
+        assets[tile] = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
+    return assets
+
+
+def bench_draw(scenario: Scenario, assets: dict, repeat: int) -> dict:
+    game_map = GameMap(scenario.layout)
+    size = (game_map.width * TILE_SIZE, game_map.height * TILE_SIZE)
+    surface = pygame.Surface(size)
+    background = pygame.Surface(size)
+    background.fill(COLOR_BG)
+    ground = game_map.find_tiles(GROUND)[:8]
+
+    def cold():
+        game_map.load_data(scenario.layout)
+        game_map.draw(surface, assets, background)
+
+    def warm():
+        game_map.draw(surface, assets, background)
+
+    def patched():
+        # A handful of digs and refills, as in a busy frame
+        for r, c in ground:
+            game_map.set_tile(r, c, BLANK)
+        game_map.draw(surface, assets, background)
+        for r, c in ground:
+            game_map.set_tile(r, c, GROUND)
+        game_map.draw(surface, assets, background)
+
+    return {
+        "cold_ms": _median_time(cold, repeat) * 1000,
+        "warm_ms": _median_time(warm, repeat) * 1000,
+        "patch_ms": _median_time(patched, repeat) * 1000 / 2,
+    }
+
+
+def bench_viewport(scenario: Scenario, assets: dict, frames: int) -> dict:
+    # Camera panning across the level, one map draw per frame as in the game loop;
+    # cost and resident chunks should not depend on the level size
+    game_map = GameMap(scenario.layout)
+    surface = pygame.Surface((SCREEN_WIDTH, GAME_HEIGHT))
+    background = pygame.Surface((SCREEN_WIDTH, GAME_HEIGHT))
+    background.fill(COLOR_BG)
+    camera = Camera(SCREEN_WIDTH, GAME_HEIGHT)
+    camera.set_world(*game_map.pixel_rect.size)
+    peak = 0
+    start = time.perf_counter()
+    for i in range(frames):
+        camera.scroll(TILE_SIZE // 4, TILE_SIZE // 8)
+        game_map.draw(surface, assets, background, camera.rect)
+        peak = max(peak, game_map.chunk_count)
+    elapsed = time.perf_counter() - start
+    return {"frame_ms": elapsed / frames * 1000, "peak_chunks": peak}
+
+
+def bench_save_load(scenario: Scenario, directory: str, repeat: int) -> dict:
+    sim = scenario.build()
+    sim.run_ticks(120)
+    path = os.path.join(directory, "bench.sav")
+    snap = sim.snapshot()
+
+    def save():
+        atomic_write(path, encode_snapshot(snap, scenario.layout), mode="wb")
+
+    def load():
+        with open(path, "rb") as f:
+            sim.restore(decode_snapshot(f.read(), scenario.layout))
+
+    save()
+    return {
+        "save_ms": _median_time(save, repeat) * 1000,
+        "load_ms": _median_time(load, repeat) * 1000,
+        "bytes": os.path.getsize(path),
+    }
+
+
+def bench_pack(directory: str, repeat: int) -> dict:
+    path = os.path.join(directory, "levels.json")
+    index = os.path.join(directory, "levels.idx")
+    shutil.copyfile(LEVELS_FILE, path)
+
+    def cold():
+        if os.path.exists(index):
+            os.remove(index)
+        LevelPack(path, index, LEVEL_CACHE_SIZE)
+
+    def warm():
+        LevelPack(path, index, LEVEL_CACHE_SIZE)
+
+    def decode_all():
+        pack = LevelPack(path, index, LEVEL_CACHE_SIZE)
+        for i in range(len(pack)):
+            pack.get(i)
+
+    cold_ms = _median_time(cold, repeat) * 1000
+    return {
+        "cold_index_ms": cold_ms,
+        "warm_index_ms": _median_time(warm, repeat) * 1000,
+        "decode_all_ms": _median_time(decode_all, repeat) * 1000,
+        "levels": len(LevelPack(path, index, LEVEL_CACHE_SIZE)),
+    }
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def run_benchmarks(ticks: int = 3000, repeat: int = 5, only: str = None):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    assets = _tile_assets()
+
+    yield {"bench": "meta", "commit": _commit(), "python": platform.python_version(),
+           "pygame": pygame.version.ver, "ticks": ticks, "repeat": repeat}
+
+    scenarios = list(level_scenarios(LevelManager())) + list(synthetic_scenarios())
+    if only:
+        scenarios = [s for s in scenarios if only in s.name]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for scenario in scenarios:
+            yield dict(bench="sim", scenario=scenario.name, **bench_ticks(scenario, ticks))
+            yield dict(bench="pathfinding", scenario=scenario.name, **bench_pathfinding(scenario, repeat))
+            yield dict(bench="draw", scenario=scenario.name, **bench_draw(scenario, assets, repeat))
+            yield dict(bench="viewport", scenario=scenario.name, **bench_viewport(scenario, assets, 600))
+            yield dict(bench="save_load", scenario=scenario.name, **bench_save_load(scenario, directory, repeat))
+        yield dict(bench="pack", scenario=os.path.basename(LEVELS_FILE), **bench_pack(directory, repeat))
+
+    for scenario in viewport_scenarios():
+        if not only or only in scenario.name:
+            yield dict(bench="viewport", scenario=scenario.name, **bench_viewport(scenario, assets, 600))
+
+    for scenario in swarm_scenarios():
+        if not only or only in scenario.name:
+            yield dict(bench="enemies", scenario=scenario.name, **bench_enemy_storage(scenario, ticks))
+
+    for scenario in chase_scenarios():
+        if not only or only in scenario.name:
+            # A whole-map flow field at 1000x500 takes seconds per goal, so it is left out there
+            flow = len(scenario.layout) * len(scenario.layout[0]) < 200000
+            yield dict(bench="pathfinders", scenario=scenario.name, **bench_hierarchical(scenario, repeat, flow))
+
+
+def compare(baseline_path: str, results: list):
+    # Ratio current/baseline for every numeric field; >1 means bigger (slower for *_ms/*_us)
+    baseline = {}
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                baseline[(row["bench"], row.get("scenario"))] = row
+
+    for row in results:
+        old = baseline.get((row["bench"], row.get("scenario")))
+        if old is None or row["bench"] == "meta":
+            continue
+        for key, value in row.items():
+            if isinstance(value, float) and old.get(key):
+                print(f"{row['bench']:<12} {row['scenario'][:28]:<28} {key:<24} "
+                      f"{old[key]:>12.3f} -> {value:>12.3f}  x{value / old[key]:.2f}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Loadrunner benchmarks")
+    parser.add_argument("--ticks", type=int, default=3000, help="simulation ticks per scenario")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per timing (median is reported)")
+    parser.add_argument("--only", help="run scenarios whose name contains this text")
+    parser.add_argument("--output", help="write JSON lines here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON lines file to compare against")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    results = []
+    try:
+        for row in run_benchmarks(args.ticks, args.repeat, args.only):
+            results.append(row)
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
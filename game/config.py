@@ -6,8 +6,13 @@ BASE_DIR = os.path.dirname(GAME_DIR)
 
 ASSETS_DIR = os.path.join(GAME_DIR, 'assets')
 SAVES_DIR = os.path.join(GAME_DIR, 'saves')
+REPLAYS_DIR = os.path.join(GAME_DIR, 'replays')
 LEVELS_FILE = os.path.join(GAME_DIR, 'levels.json')
-SCORES_FILE = os.path.join(GAME_DIR, 'scores.txt')
+LEVELS_INDEX_FILE = os.path.join(GAME_DIR, 'levels.idx')
+SCORES_FILE = os.path.join(GAME_DIR, 'scores.bin')
+# Text log used before scores.bin; imported once when the binary store does not exist
+LEGACY_SCORES_FILE = os.path.join(GAME_DIR, 'scores.txt')
+FONT_CACHE_FILE = os.path.join(GAME_DIR, 'font_paths.json')
 
 # MAP CONSTANTS
 TILE_SIZE = 24
@@ -28,6 +33,36 @@ PANEL_HEIGHT = 60
 TOTAL_HEIGHT = GAME_HEIGHT + PANEL_HEIGHT
 FPS = 60
 
+# CAMERA
+# The tile layer is rendered in CHUNK_TILES x CHUNK_TILES pieces; only chunks within
+# CHUNK_MARGIN chunks of the view are kept, so big levels cost the same as small ones
+CHUNK_TILES = 16
+CHUNK_MARGIN = 1
+# Half-size of the box around the view centre the player can move in before it scrolls
+CAMERA_DEADZONE = (TILE_SIZE * 4, TILE_SIZE * 3)
+EDITOR_SCROLL_SPEED = TILE_SIZE // 2
+
+# SIMULATION
+TICK_RATE = 60
+FIXED_DT = 1000.0 / TICK_RATE
+MAX_FRAME_TIME = 250.0
+# Levels with at least this many enemies step them as flat arrays (EnemyBatch)
+ENEMY_BATCH_THRESHOLD = 64
+# Levels with at least this many tiles route enemies with HierarchicalPathfinder over
+# REGION_SIZE x REGION_SIZE regions instead of a whole-map FlowField
+HIERARCHICAL_PATH_MIN_CELLS = 10000
+REGION_SIZE = 16
+
+# ASSETS
+# Sprites up to ATLAS_MAX_SPRITE px are packed into shared atlas pages
+ATLAS_PAGE_SIZE = 512
+ATLAS_MAX_SPRITE = 128
+# Baked by `python -m game.systems.asset_cache`; rebuilt from the images when stale
+SPRITE_PACK_FILE = os.path.join(GAME_DIR, 'sprites.pack')
+
+# Rendered text surfaces kept for reuse (labels, HUD strings, menu entries)
+TEXT_CACHE_SIZE = 256
+
 # COLORS
 COLOR_BG = (20, 20, 40)
 COLOR_PANEL = (30, 30, 30)
@@ -39,6 +74,7 @@ FALL_SPEED = 2.0
 ANIMATION_SPEED = 3.0
 HOLE_DURATION = 4000.0
 JUMP_HANG_TIME = 250.0
+MESSAGE_DURATION = 2000
 
 # FIREBALL
 FIREBALL_IMG = 'fireball.png'
@@ -48,6 +84,34 @@ FIREBALL_SPEED = 6.0
 EXPLOSION_DURATION = 500
 EXPLOSION_RADIUS_TILES = 0.6
 
+# PERSISTENCE
+LEVELS_SAVE_DELAY = 1.0
+LEVEL_CACHE_SIZE = 8
+# Fastest runs kept per level; the scores popup shows the first three
+SCORES_TOP_K = 10
+SCORES_SAVE_DELAY = 1.0
+# The score log is rewritten once it holds this many times the kept runs (and at least MIN)
+SCORES_COMPACT_RATIO = 2
+SCORES_COMPACT_MIN = 256
+
+# SAVES
+SAVE_SLOTS = ["quicksave", "slot2", "slot3", "slot4"]
+AUTOSAVE_INTERVAL = 10000.0
+AUTOSAVE_RING_SIZE = 5
+
+# LEVEL EVALUATION
+EVAL_RUNS = 8
+EVAL_MAX_TICKS = 90 * TICK_RATE
+EVAL_BOT_NOISE = 0.1
+EVAL_SAFE_DISTANCE = 3
+
+# PROFILING
+# Off turns every timing scope into a shared no-op; F9 shows the overlay, F10 records a trace
+PROFILING = os.environ.get("LOADRUNNER_PROFILE", "1") != "0"
+PROFILE_HISTORY = 120
+PROFILE_TRACE_LIMIT = 200000
+PROFILE_TRACE_FILE = os.path.join(BASE_DIR, 'trace.json')
+
 
 
 TOOL_ENEMY = "ENEMY"
\ No newline at end of file
@@ -1,3 +1,10 @@
 from .app import GameApp
-from .editor import Editor
-from .level_manager import LevelManager
\ No newline at end of file
+from .level_manager import LevelManager
+
+
+def __getattr__(name):
+    # The editor (and the level generator behind it) is only imported when asked for
+    if name == "Editor":
+        from .editor import Editor
+        return Editor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,76 +1,119 @@
 import pygame
 import sys
 import os
+import time
+from contextlib import contextmanager
 
 from game.config import *
-from game.entities import Player, GameMap, Enemy
 from game.core.level_manager import LevelManager
+from game.core.simulation import Simulation
 from game.systems import ScoreManager, SaveManager
+from game.systems.replay import save_replay
+from game.systems.profiler import profiler
+from game.systems.asset_cache import asset_cache
+from game.systems.scheduler import Scheduler
+from game.systems.camera import Camera
 from game.ui import UIRenderer
 from game.ui.components import Button, Dropdown
-from game.core.editor import Editor
-from game.entities.projectile import Fireball, Explosion
+
+UI_EVENT_MESSAGE_END = 1
 
 
 class GameApp:
     def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, TOTAL_HEIGHT))
-        pygame.display.set_caption("Lode Runner")
-
-        try:
-            icon = pygame.image.load(os.path.join(ASSETS_DIR, 'sprite.png'))
-            pygame.display.set_icon(icon)
-        except:
-            pass
+        # (phase, ms) for everything before the first frame; printed once it is on screen
+        self.startup_phases = []
+
+        with self._startup_phase("display"):
+            pygame.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, TOTAL_HEIGHT))
+            # Map and sprites draw here, so anything past the view is clipped off the HUD
+            self.play_area = self.screen.subsurface((0, 0, SCREEN_WIDTH, GAME_HEIGHT))
+            pygame.display.set_caption("Lode Runner")
+
+            try:
+                icon = asset_cache.get(os.path.join(ASSETS_DIR, 'sprite.png'), scale=(TILE_SIZE, TILE_SIZE))
+                pygame.display.set_icon(icon)
+            except:
+                pass
 
         self.clock = pygame.time.Clock()
-        self.level_manager = LevelManager()
+        with self._startup_phase("levels"):
+            self.level_manager = LevelManager()
         self.score_manager = ScoreManager()
-        self.ui = UIRenderer()
         self.save_manager = SaveManager()
-        self._load_assets()
+        with self._startup_phase("assets"):
+            self._load_assets()
 
         self.is_paused = False
         self.show_popup = False
 
-        self.game_finished = False
-        self.game_over = False
-
-        self.start_ticks = 0
-        self.pause_start = 0
-        self.total_pause_duration = 0
-        self.win_time = 0
+        # Messages are UI, so they expire on wall-clock time, paused or not
+        self.ui_events = Scheduler(self._on_ui_event, pygame.time.get_ticks())
         self.system_message = ""
-        self.system_message_time = 0
+        self._message_event = None
 
-        self.map: GameMap = None
-        self.player: Player = None
-        self.enemies = []
+        self.sim: Simulation = None
+        self.camera = Camera(SCREEN_WIDTH, GAME_HEIGHT, CAMERA_DEADZONE)
+        self.active_slot = 0
+        self.last_autosave_time = 0.0
 
-        self.projectiles = []
-        self.explosions = []
-        self.fireballs_left = 0
+        self._force_full_redraw = True
+        self._sprite_rects = []
+        self._last_hud_key = None
+        self.show_profiler = False
 
         self.is_editor_mode = False
-        self.editor = Editor(self.level_manager, self.assets)
+        # Built on the first switch to edit mode
+        self._editor = None
+
+        with self._startup_phase("ui"):
+            self.ui = UIRenderer()
+            self.game_dropdown = Dropdown(
+                60, GAME_HEIGHT + 15, 200, 30,
+                options=self.level_manager.get_all_level_names(),
+                callback=self._on_game_level_selected,
+                direction='up'
+            )
+            self.game_dropdown.selected_index = self.level_manager.current_index
 
-        self.game_dropdown = Dropdown(
-            60, GAME_HEIGHT + 15, 200, 30,
-            options=self.level_manager.get_all_level_names(),
-            callback=self._on_game_level_selected,
-            direction='up'
-        )
-        self.game_dropdown.selected_index = self.level_manager.current_index
+            self.mode_btn = Button(
+                SCREEN_WIDTH - 90, GAME_HEIGHT + 15, 80, 30,
+                text="EDIT",
+                callback=self.toggle_mode,
+                color=(100, 100, 200)
+            )
 
-        self.mode_btn = Button(
-            SCREEN_WIDTH - 90, GAME_HEIGHT + 15, 80, 30,
-            text="EDIT",
-            callback=self.toggle_mode,
-            color=(100, 100, 200)
-        )
+        with self._startup_phase("level"):
+            self.reset_level()
 
-        self.reset_level()
+    @contextmanager
+    def _startup_phase(self, name: str):
+        start = time.perf_counter()
+        yield
+        self.startup_phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def _after_first_frame(self):
+        total = sum(ms for _, ms in self.startup_phases)
+        print("Startup: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.startup_phases) +
+              f" (total {total:.0f} ms)")
+
+        # Every startup sprite has been requested by now; if any had to be decoded,
+        # the pack is missing, stale or incomplete, so save them all for the next launch
+        if asset_cache.loads and asset_cache.pack_path:
+            try:
+                asset_cache.bake(asset_cache.pack_path)
+            except (OSError, pygame.error) as e:
+                print(f"Could not write sprite pack: {e}")
+
+    @property
+    def editor(self):
+        if self._editor is None:
+            from game.core.editor import Editor
+            start = time.perf_counter()
+            self._editor = Editor(self.level_manager, self.assets)
+            print(f"Editor ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return self._editor
 
     def toggle_mode(self):
         self.is_editor_mode = not self.is_editor_mode
@@ -89,16 +132,9 @@ class GameApp:
         self.reset_level()
 
     def _load_assets(self):
-        def load_img(filename, color_key=None):
-            path = os.path.join(ASSETS_DIR, filename)
-            if not os.path.exists(path):
-                surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
-                surf.fill((128, 0, 128))
-                return surf
-            img = pygame.image.load(path).convert_alpha()
-            img = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
-            if color_key: img.set_colorkey(color_key)
-            return img
+        # Everything goes through the shared cache, so entities reuse these exact surfaces
+        def load_img(filename, color_key=None, size=(TILE_SIZE, TILE_SIZE)):
+            return asset_cache.get(os.path.join(ASSETS_DIR, filename), scale=size, crop=False, colorkey=color_key)
 
         self.assets = {
             LADDER: load_img('ladder.gif'),
@@ -110,75 +146,77 @@ class GameApp:
 
         # Fireball
         fb_size = int(TILE_SIZE / 3)
-        self.assets['fireball'] = load_img(FIREBALL_IMG)
-        self.assets['fireball'] = pygame.transform.scale(self.assets['fireball'], (fb_size, fb_size))
+        self.assets['fireball'] = load_img(FIREBALL_IMG, size=(fb_size, fb_size))
 
         # Explosion
         exp_size = int(TILE_SIZE * 1.2)
-        self.assets['explosion'] = load_img(EXPLOSION_IMG)
-        self.assets['explosion'] = pygame.transform.scale(self.assets['explosion'], (exp_size, exp_size))
+        self.assets['explosion'] = load_img(EXPLOSION_IMG, size=(exp_size, exp_size))
 
         # Pointer
         pointer_path = os.path.join(ASSETS_DIR, 'pointer.png')
         if os.path.exists(pointer_path):
-            self.assets['pointer'] = pygame.image.load(pointer_path).convert_alpha()
+            self.assets['pointer'] = asset_cache.get(pointer_path, crop=False)
 
-        try:
-            bg_path = os.path.join(ASSETS_DIR, 'cave_bg.png')
-            self.background = pygame.transform.scale(
-                pygame.image.load(bg_path).convert(), (SCREEN_WIDTH, GAME_HEIGHT)
-            )
-        except Exception:
+        bg_path = os.path.join(ASSETS_DIR, 'cave_bg.png')
+        if os.path.exists(bg_path):
+            self.background = asset_cache.get(bg_path, scale=(SCREEN_WIDTH, GAME_HEIGHT), crop=False).convert()
+        else:
             self.background = pygame.Surface((SCREEN_WIDTH, GAME_HEIGHT))
             self.background.fill(COLOR_BG)
 
     def reset_level(self):
-        lvl_data = self.level_manager.get_current_level_data()
-        self.map = GameMap(lvl_data)
-
-        start_pos = self.level_manager.get_player_start()
-        if start_pos is None:
-            start_pos = {'r': MAP_HEIGHT - 3, 'c': 2}
-
-        start_x = start_pos['c'] * TILE_SIZE
-        start_y = start_pos['r'] * TILE_SIZE
-        self.player = Player(start_x, start_y)
-
-        self.enemies = []
-        self.projectiles = []
-        self.explosions = []
-        self.fireballs_left = self.level_manager.get_current_level_fireballs()
-
-        enemy_data = self.level_manager.get_current_level_enemies()
-        for e_pos in enemy_data:
-            ex = e_pos['c'] * TILE_SIZE
-            ey = e_pos['r'] * TILE_SIZE
-            self.enemies.append(Enemy(ex, ey))
-
-        self.game_finished = False
-        self.game_over = False
+        self.sim = Simulation.from_level_manager(self.level_manager, self.assets)
+        self.sim.start_recording()
+        self.last_autosave_time = 0.0
+        self._snap_camera()
+
         self.is_paused = False
         self.show_popup = False
-        self.start_ticks = pygame.time.get_ticks()
-        self.total_pause_duration = 0
-        self.win_time = 0
-        self.system_message = ""
+        self._set_message("")
+        self._force_full_redraw = True
         self.game_dropdown.selected_index = self.level_manager.current_index
 
-    def show_message(self, text):
+    def _snap_camera(self):
+        game_map = self.sim.map
+        self.camera.set_world(game_map.width * TILE_SIZE, game_map.height * TILE_SIZE)
+        self.camera.center_on(*self.sim.player.rect.center)
+        self._force_full_redraw = True
+
+    def _set_message(self, text: str, duration: float = 0):
+        if self._message_event is not None:
+            self.ui_events.cancel(self._message_event)
+            self._message_event = None
         self.system_message = text
-        self.system_message_time = pygame.time.get_ticks()
+        if text and duration:
+            self._message_event = self.ui_events.schedule(duration, UI_EVENT_MESSAGE_END)
+
+    def show_message(self, text):
+        self._set_message(text, MESSAGE_DURATION)
+
+    def _on_ui_event(self, kind: int, a: int, b: int):
+        if kind == UI_EVENT_MESSAGE_END:
+            self._message_event = None
+            self.system_message = ""
+
+    @property
+    def game_finished(self) -> bool:
+        return self.sim.game_finished
+
+    @property
+    def game_over(self) -> bool:
+        return self.sim.game_over
 
     def _get_elapsed_time(self):
         if self.game_finished:
-            return self.win_time
-        if self.is_paused or self.game_over:
-            return self.pause_start - self.start_ticks - self.total_pause_duration
-        return pygame.time.get_ticks() - self.start_ticks - self.total_pause_duration
+            return self.sim.win_time
+        return int(self.sim.time_ms)
 
     def handle_input(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                self.level_manager.flush()
+                self.score_manager.flush()
+                self.save_manager.wait_for_saves()
                 pygame.quit()
                 sys.exit()
 
@@ -210,106 +248,45 @@ class GameApp:
                         if self.show_popup:
                             self.show_popup = False
                             self.is_paused = False
-                            self._resume_timer()
                         else:
                             self.is_paused = not self.is_paused
-                            if self.is_paused:
-                                self.pause_start = pygame.time.get_ticks()
-                            else:
-                                self._resume_timer()
+
+                    # SAVE SLOT (1-4)
+                    elif pygame.K_1 <= event.key < pygame.K_1 + len(SAVE_SLOTS):
+                        self.active_slot = event.key - pygame.K_1
+                        self.show_message(f"Slot {self.active_slot + 1}")
 
                     # QUICKSAVE (F1)
                     elif event.key == pygame.K_F1 and not self.is_paused:
-                        elapsed = self._get_elapsed_time()
-                        enemies_data = [(e.x, e.y, e.target_x, e.target_y) for e in self.enemies]
-
-                        proj_data = []
-                        for p in self.projectiles:
-                            proj_data.append({
-                                'x': p.rect.x,
-                                'y': p.rect.y,
-                                'direction': p.direction
-                            })
-
-                        expl_data = []
-                        for e in self.explosions:
-                            expl_data.append({
-                                'x': e.rect.x,
-                                'y': e.rect.y,
-                                'frame_index': e.frame_index
-                            })
-
-                        data = (
-                            self.player.x, self.player.y, self.player.coins,
-                            elapsed,
-                            self.map._data, self.map.holes,
-                            enemies_data,
-                            self.fireballs_left,
-                            proj_data,
-                            expl_data
-                        )
-                        self.save_manager.save_game(self.level_manager.current_index, data)
-                        self.show_message(f"Lvl {self.level_manager.current_index + 1} Saved")
+                        self.save_manager.save_game_async(self.level_manager.current_index, self.sim.snapshot(),
+                                                          self.level_manager.get_current_level_data(),
+                                                          SAVE_SLOTS[self.active_slot])
 
                     # QUICKLOAD (F2)
                     elif event.key == pygame.K_F2:
-                        data = self.save_manager.load_game(self.level_manager.current_index)
-                        if data:
-                            try:
-                                (p_x, p_y, p_coins, saved_elapsed, saved_map_data, saved_holes, saved_enemies,
-                                 saved_ammo, saved_proj_data, saved_expl_data) = data
-
-                                self.player.x = p_x
-                                self.player.y = p_y
-                                self.player.reset_movement()
-                                self.player._coins_collected = p_coins
-
-                                self.map._data = saved_map_data
-                                self.map.holes = []
-                                current_ticks = pygame.time.get_ticks()
-                                for h in saved_holes:
-                                    h['time'] = current_ticks
-                                    self.map.holes.append(h)
-
-                                self.enemies = []
-                                for e_data in saved_enemies:
-                                    ex, ey, tx, ty = e_data
-                                    enemy = Enemy(ex, ey)
-                                    enemy.target_x = tx
-                                    enemy.target_y = ty
-                                    self.enemies.append(enemy)
-
-                                self.fireballs_left = saved_ammo
-
-                                self.projectiles = []
-                                for p_dat in saved_proj_data:
-                                    fb = Fireball(
-                                        p_dat['x'], p_dat['y'], p_dat['direction'],
-                                        self.assets['fireball'], self.assets['explosion']
-                                    )
-                                    self.projectiles.append(fb)
-
-                                self.explosions = []
-                                for e_dat in saved_expl_data:
-                                    exp = Explosion(
-                                        e_dat['x'], e_dat['y'],
-                                        self.assets['explosion']
-                                    )
-                                    exp.frame_index = e_dat['frame_index']
-                                    self.explosions.append(exp)
-
-                                self.start_ticks = pygame.time.get_ticks() - saved_elapsed
-                                self.total_pause_duration = 0
-                                self.is_paused = False
-                                self.game_finished = False
-                                self.game_over = False
-                                self.win_time = 0
-                                self.show_message(f"Lvl {self.level_manager.current_index + 1} Loaded")
-                            except ValueError:
-                                self.show_message("Save Format Error!")
-                            except Exception as e:
-                                print(f"Load Error: {e}")
-                                self.show_message("Load Failed!")
+                        level_idx = self.level_manager.current_index
+                        slot = SAVE_SLOTS[self.active_slot]
+                        # A save still queued on the worker is newer than the file on disk
+                        self._load_snapshot(
+                            lambda: self.save_manager.latest_unwritten(level_idx, slot) or
+                            self.save_manager.load_game(level_idx, self.level_manager.get_current_level_data(), slot),
+                            f"Lvl {level_idx + 1} Loaded"
+                        )
+
+                    # PROFILER OVERLAY (F9) / CHROME TRACE (F10)
+                    elif event.key == pygame.K_F9:
+                        self.show_profiler = not self.show_profiler
+                    elif event.key == pygame.K_F10:
+                        self._toggle_trace()
+
+                    # REWIND TO AUTOSAVE (F3)
+                    elif event.key == pygame.K_F3:
+                        level_idx = self.level_manager.current_index
+                        self._load_snapshot(
+                            lambda: self.save_manager.rewind_autosave(level_idx,
+                                                                      self.level_manager.get_current_level_data()),
+                            "Rewound"
+                        )
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mx, my = event.pos
@@ -319,7 +296,6 @@ class GameApp:
                         if self.ui.nav_rects['close'].collidepoint((mx, my)):
                             self.show_popup = False
                             self.is_paused = False
-                            self._resume_timer()
                     elif not self.is_paused:
                         if event.button == 1 and my < GAME_HEIGHT:
                             self._handle_digging(mx, my)
@@ -331,43 +307,50 @@ class GameApp:
                             elif SCREEN_WIDTH - 250 < mx < SCREEN_WIDTH - 90:
                                 self.show_popup = True
                                 self.is_paused = True
-                                self.pause_start = pygame.time.get_ticks()
-
-        if not self.is_editor_mode and not self.is_paused and not self.game_finished and not self.game_over:
-            keys = pygame.key.get_pressed()
-            self.player.handle_input(keys, self.map)
 
-    def _spawn_fireball(self):
-        if self.fireballs_left > 0:
-            direction = 1 if self.player.facing_right else -1
-            start_x = self.player.x + (TILE_SIZE if direction == 1 else 0)
-            start_y = self.player.y
-
-            fireball = Fireball(
-                start_x,
-                start_y,
-                direction,
-                self.assets['fireball'],
-                self.assets['explosion']
-            )
-            self.projectiles.append(fireball)
+        if not self.is_editor_mode:
+            self.sim.set_input(pygame.key.get_pressed())
 
-            self.fireballs_left -= 1
+    def _load_snapshot(self, load, message):
+        try:
+            snap = load()
+            if snap:
+                self.sim.restore(snap)
+                self._snap_camera()
+                self.is_paused = False
+                self.last_autosave_time = self.sim.time_ms
+                self.show_message(message)
+        except ValueError as e:
+            print(f"Load Error: {e}")
+            self.show_message("Save Format Error!")
+        except Exception as e:
+            print(f"Load Error: {e}")
+            self.show_message("Load Failed!")
+
+    def _toggle_trace(self):
+        if not profiler.enabled:
+            self.show_message("Profiling Disabled")
+        elif profiler.is_tracing:
+            path = profiler.stop_trace(PROFILE_TRACE_FILE)
+            self.show_message("Trace Saved" if path else "Trace Failed!")
         else:
-            print("No fireballs left!")
+            profiler.start_trace()
+            self.show_message("Tracing...")
 
-    def _resume_timer(self):
-        if self.pause_start != 0:
-            self.total_pause_duration += pygame.time.get_ticks() - self.pause_start
-            self.pause_start = 0
+    def _spawn_fireball(self):
+        if not self.sim.spawn_fireball():
+            print("No fireballs left!")
 
     def _handle_digging(self, mx, my):
-        grid_c, grid_r = int(mx // TILE_SIZE), int(my // TILE_SIZE)
-        player_r, player_c = self.player.row, self.player.col
-        if abs(grid_r - player_r) <= 1 and abs(grid_c - player_c) <= 1:
-            self.map.dig_hole(grid_r, grid_c)
+        wx, wy = self.camera.to_world((mx, my))
+        grid_c, grid_r = int(wx // TILE_SIZE), int(wy // TILE_SIZE)
+        self.sim.dig(grid_r, grid_c)
+
+    def update(self, frame_ms: float = FIXED_DT):
+        for level_idx, slot, ok in self.save_manager.poll_completed():
+            if slot in SAVE_SLOTS:
+                self.show_message(f"Lvl {level_idx + 1} Saved" if ok else "Save Failed!")
 
-    def update(self):
         self.mode_btn.update(pygame.mouse.get_pos())
         if self.is_editor_mode:
             self.editor.update()
@@ -376,89 +359,196 @@ class GameApp:
             if self.is_paused or self.game_finished or self.game_over:
                 return
 
-            dt = 0
-            self.map.update_holes()
-            self.player.update(dt, self.map)
-
-            for proj in self.projectiles[:]:
-                proj.update(dt, self.map, self.enemies)
-
-                if proj.explosion_instance:
-                    self.explosions.append(proj.explosion_instance)
-                    self.projectiles.remove(proj)
-                elif proj.should_explode:
-                    self.projectiles.remove(proj)
-
-            for exp in self.explosions[:]:
-                exp.update(dt, self.map, self.enemies)
-                if exp.is_finished:
-                    self.explosions.remove(exp)
-
-            player_grid_pos = self.player.row, self.player.col
-            for enemy in self.enemies:
-                enemy.update(dt, self.map, player_grid_pos)
-
-                hitbox = enemy.rect.inflate(-10, -10)
-                if self.player.rect.colliderect(hitbox):
-                    self.game_over = True
-                    self.pause_start = pygame.time.get_ticks()
-                    print("GAME OVER")
-                    return
-
-            if self.player.coins >= self.map.total_coins:
-                self.win_time = self._get_elapsed_time()
-                self.game_finished = True
-                self.score_manager.save_score(self.level_manager.current_index, self.win_time)
-                print(f"Level Complete! Time: {self.win_time}ms")
-
-    def draw(self):
-        if self.is_editor_mode:
-            self.screen.fill((30, 30, 30))
-            self.editor.draw(self.screen)
+            self.sim.advance(frame_ms)
+
+            if self.sim.is_running and self.sim.time_ms - self.last_autosave_time >= AUTOSAVE_INTERVAL:
+                self.last_autosave_time = self.sim.time_ms
+                self.save_manager.autosave(self.level_manager.current_index, self.sim.snapshot(),
+                                           self.level_manager.get_current_level_data())
+
+            if self.game_over:
+                print("GAME OVER")
+                self._save_replay(False)
+            elif self.game_finished:
+                level_idx = self.level_manager.current_index
+                best = self.score_manager.get_best_time(level_idx)
+                self.score_manager.save_score(level_idx, self.sim.win_time)
+                print(f"Level Complete! Time: {self.sim.win_time}ms")
+                self._save_replay(best is None or self.sim.win_time < best)
+
+    def _save_replay(self, is_best: bool):
+        # Runs that were quickloaded or rewound have no recorder and are not replayable
+        if self.sim.recorder is None:
+            return
+        level_idx = self.level_manager.current_index
+        recording = self.sim.recorder.recording
+        save_replay(level_idx, recording)
+        if is_best:
+            save_replay(level_idx, recording, "best")
+
+    def _overlay_visible(self) -> bool:
+        return (self.is_paused or self.game_finished or self.game_over
+                or self.show_popup or self.game_dropdown.is_open)
+
+    def _message_visible(self) -> bool:
+        return bool(self.system_message)
+
+    def _draw_hud(self):
+        sim = self.sim
+        rect = self.ui.draw_hud(
+            self.screen, self.level_manager.current_index,
+            sim.player.coins, sim.map.total_coins,
+            self._get_elapsed_time(), self.game_finished,
+            self.score_manager.get_best_time(self.level_manager.current_index),
+            sim.fireballs_left,
+            self.assets['fireball']
+        )
+        self.game_dropdown.draw(self.screen)
+        self.mode_btn.draw(self.screen)
+        return rect
+
+    def _hud_key(self):
+        sim = self.sim
+        return (self.level_manager.current_index, sim.player.coins, sim.map.total_coins,
+                self._get_elapsed_time() // 1000, self.game_finished, sim.fireballs_left,
+                self.score_manager.get_best_time(self.level_manager.current_index),
+                self.game_dropdown.selected_index, self.mode_btn.is_hovered, self.mode_btn.text)
+
+    def _follow_player(self) -> bool:
+        # Track the interpolated position the player is drawn at, so scrolling does not jitter
+        player = self.sim.player
+        alpha = self.sim.alpha
+        x = player.prev_x + (player.x - player.prev_x) * alpha + player.rect.width / 2
+        y = player.prev_y + (player.y - player.prev_y) * alpha + player.rect.height / 2
+        return self.camera.follow(x, y)
+
+    def _draw_sprites(self):
+        sim = self.sim
+        alpha = sim.alpha
+        offset = self.camera.offset
+        view = self.camera.rect
+        sim.sync_entities()
+        if sim.map.pixel_rect.width <= view.width and sim.map.pixel_rect.height <= view.height:
+            enemies = sim.enemies
         else:
-            self.screen.blit(self.background, (0, 0))
-            self.map.draw(self.screen, self.assets)
-            self.player.draw(self.screen)
-            for enemy in self.enemies: enemy.draw(self.screen)
-            for proj in self.projectiles:
-                proj.draw(self.screen)
-            for exp in self.explosions:
-                exp.draw(self.screen)
-
-            display_time = self._get_elapsed_time()
-            best_time = self.score_manager.get_best_time(self.level_manager.current_index)
-
-            self.ui.draw_hud(
-                self.screen, self.level_manager.current_index,
-                self.player.coins, self.map.total_coins,
-                display_time, self.game_finished, best_time,
-                self.fireballs_left,
-                self.assets['fireball']
-            )
+            # Only enemies near the view; a tile of slack covers interpolation
+            enemies = sim.enemy_index.query_rect(view.inflate(2 * TILE_SIZE, 2 * TILE_SIZE))
+        screen = self.play_area
+        rects = [sim.player.draw(screen, alpha, offset)]
+        for enemy in enemies:
+            rects.append(enemy.draw(screen, alpha, offset))
+        for proj in sim.projectiles:
+            rects.append(proj.draw(screen, alpha, offset))
+        for exp in sim.explosions:
+            rects.append(exp.draw(screen, alpha, offset))
+        return rects
+
+    def _draw_map(self):
+        # The whole play area; past the edges of a level smaller than the view is plain fill
+        game_map = self.sim.map
+        if not game_map.pixel_rect.contains(self.camera.rect):
+            self.play_area.fill(COLOR_BG)
+        game_map.draw(self.play_area, self.assets, self.background, self.camera.rect)
+        game_map.take_dirty_rects()
+
+    def _draw_message(self):
+        if self._message_visible():
+            return [self.ui.draw_message(self.screen, self.system_message)]
+        return []
+
+    def _draw_profiler(self):
+        if not self.show_profiler:
+            return []
+        return [self.ui.draw_profiler(self.screen, profiler.fps(), profiler.averages(),
+                                      profiler.histogram(4.0, 10), 4.0)]
+
+    def _draw_full(self):
+        sim = self.sim
+        self._follow_player()
+        self._draw_map()
+        self._sprite_rects = self._draw_sprites()
+        self._draw_hud()
+        self._last_hud_key = self._hud_key()
+
+        # Draw summary panel
+        if self.game_finished or self.game_over:
+            self.ui.draw_summary_panel(self.screen, self.game_finished, sim.win_time)
+
+        elif self.is_paused:
+            self.ui.draw_pause(self.screen)
+
+        # Messages
+        self._sprite_rects += self._draw_message()
+
+        if self.show_popup:
+            scores = self.score_manager.get_top_scores(self.level_manager.current_index)
+            self.ui.draw_scores_popup(self.screen, self.level_manager.current_index, scores)
+
+        # Game dropdown opens over the play area, so keep it on top
+        if self.game_dropdown.is_open:
             self.game_dropdown.draw(self.screen)
 
-            # Draw summary panel
-            if self.game_finished or self.game_over:
-                self.ui.draw_summary_panel(self.screen, self.game_finished, self.win_time)
+        self._sprite_rects += self._draw_profiler()
+        pygame.display.flip()
 
-            elif self.is_paused:
-                self.ui.draw_pause(self.screen)
+    def _draw_dirty(self):
+        # Restore last frame's sprite areas from the cached layer, then push only what changed.
+        # A camera move shifts everything, so then the play area is redrawn as a whole.
+        game_map = self.sim.map
+        camera = self.camera
+        if self._follow_player():
+            self._draw_map()
+            sprite_rects = self._draw_sprites() + self._draw_message() + self._draw_profiler()
+            dirty = [self.play_area.get_rect()]
+        else:
+            game_map.update_layer(self.assets, self.background, camera.rect)
+            tile_rects = [camera.to_screen(rect) for rect in game_map.take_dirty_rects()
+                          if rect.colliderect(camera.rect)]
+            for rect in self._sprite_rects + tile_rects:
+                game_map.blit_region(self.play_area, rect.move(camera.offset), camera.offset)
 
-            # Messages
-            current_time = pygame.time.get_ticks()
-            if current_time - self.system_message_time < 2000 and self.system_message:
-                self.ui.draw_message(self.screen, self.system_message)
+            sprite_rects = self._draw_sprites() + self._draw_message() + self._draw_profiler()
+            dirty = self._sprite_rects + tile_rects + sprite_rects
+        self._sprite_rects = sprite_rects
 
-            if self.show_popup:
-                scores = self.score_manager.get_top_scores(self.level_manager.current_index)
-                self.ui.draw_scores_popup(self.screen, self.level_manager.current_index, scores)
+        hud_key = self._hud_key()
+        if hud_key != self._last_hud_key:
+            dirty.append(self._draw_hud())
+            self._last_hud_key = hud_key
 
-        self.mode_btn.draw(self.screen)
-        pygame.display.flip()
+        pygame.display.update(dirty)
+
+    def draw(self):
+        if self.is_editor_mode:
+            self.screen.fill((30, 30, 30))
+            self.editor.draw(self.screen)
+            self.mode_btn.draw(self.screen)
+            pygame.display.flip()
+            self._force_full_redraw = True
+            return
+
+        overlay = self._overlay_visible()
+        if self._force_full_redraw or overlay:
+            self._draw_full()
+        else:
+            self._draw_dirty()
+        # The frame after an overlay closes must repaint everything underneath it
+        self._force_full_redraw = overlay
 
     def run(self):
-        while True:
-            self.handle_input()
-            self.update()
+        with self._startup_phase("first frame"):
             self.draw()
-            self.clock.tick(FPS)
\ No newline at end of file
+        self._after_first_frame()
+
+        frame_ms = FIXED_DT
+        while True:
+            profiler.begin_frame()
+            self.ui_events.advance(pygame.time.get_ticks())
+            with profiler.scope("input"):
+                self.handle_input()
+            with profiler.scope("update"):
+                self.update(frame_ms)
+            with profiler.scope("draw"):
+                self.draw()
+            frame_ms = self.clock.tick(FPS)
+            profiler.end_frame()
\ No newline at end of file
@@ -1,8 +1,9 @@
 import pygame
-import random
+from game.ui.fonts import load_font
 from game.config import *
 from game.ui.components import Button, InputField, Dropdown
-from game.enums import MoveAxis, Direction, DIR_OFFSETS
+from game.systems.level_generator import LevelGenerator
+from game.systems.camera import Camera
 
 CURSOR_TOOL = "CURSOR"
 
@@ -16,10 +17,13 @@ class Editor:
         self.show_grid = True
 
         self.dragging_player = False
+        self.level_gen = LevelGenerator()
+        # Levels larger than the play area scroll with the arrow keys
+        self.camera = Camera(SCREEN_WIDTH, GAME_HEIGHT)
 
         self.name_input = InputField(250, 10, 300, 30, text="")
 
-        self.fb_label_font = pygame.font.SysFont("Arial", 14)
+        self.fb_label_font = load_font("Arial", 14)
         self.fb_input = InputField(630, 10, 50, 30, text="5")
 
         self.level_dropdown = Dropdown(
@@ -80,6 +84,20 @@ class Editor:
         self.fb_input.text = str(fb_count)
         self.level_dropdown.options = self.lvl_mgr.get_all_level_names()
         self.level_dropdown.selected_index = self.lvl_mgr.current_index
+        self._sync_camera()
+
+    def _sync_camera(self):
+        layout = self.lvl_mgr.get_current_level_data()
+        width = len(layout[0]) if layout else 0
+        self.camera.set_world(width * TILE_SIZE, len(layout) * TILE_SIZE)
+
+    def _cell_at(self, mx, my):
+        wx, wy = self.camera.to_world((mx, my))
+        return wy // TILE_SIZE, wx // TILE_SIZE
+
+    def _in_level(self, row, col) -> bool:
+        layout = self.lvl_mgr.get_current_level_data()
+        return 0 <= row < len(layout) and 0 <= col < len(layout[row])
 
     def _set_tool(self, tile):
         self.selected_tile = tile
@@ -94,86 +112,20 @@ class Editor:
         self._refresh_ui_data()
 
     def _generate_random_level(self):
-        rows = MAP_HEIGHT
-        cols = MAP_WIDTH
-
-        grid = [[GROUND for _ in range(cols)] for _ in range(rows)]
-
-        start_c = random.randint(2, cols - 3)
-        start_r = random.randint(2, rows - 3)
-
-        floor_points = {(start_r, start_c)}    # REFACTORED (Використання set замість list в editor)
-
-        grid[start_r][start_c] = START
-        # Player start
-        self.lvl_mgr.set_player_start(start_r, start_c)
-
-        max_segments = 100
-        curr_r, curr_c = start_r, start_c
-
-        for _ in range(max_segments):                  # REFACTORED (генерація рівнів → dict, dx, dy)
-            # Weights: 70% Horizontal, 30% Vertical
-            move_axis = random.choices(
-                [MoveAxis.HORIZONTAL, MoveAxis.VERTICAL],
-                weights=[70, 30],
-                k=1
-            )[0]
-
-            if move_axis == MoveAxis.HORIZONTAL:
-                direction = random.choice([Direction.RIGHT, Direction.LEFT])
-                length = random.randint(3, 8)
-                tile_to_place = BLANK
-            else:
-                direction = random.choice([Direction.UP, Direction.DOWN])
-                length = random.randint(2, 5)
-                tile_to_place = LADDER
+        # Only levels whose coins are all reachable from the start come back
+        level = self.level_gen.generate_valid()
+        if level is None:
+            print("Level generation failed")
+            return
 
-            for _ in range(length):
-                dr, dc = DIR_OFFSETS[direction]
-                next_r = curr_r + dr
-                next_c = curr_c + dc
+        start = level["player_start"]
+        self.lvl_mgr.set_player_start(start['r'], start['c'])
 
-                if not (1 <= next_r < rows - 1 and 1 <= next_c < cols - 1):
-                    break
-
-                curr_r, curr_c = next_r, next_c
-
-                if grid[curr_r][curr_c] not in (LADDER, COIN):
-                    grid[curr_r][curr_c] = tile_to_place
-
-                floor_points.add((curr_r, curr_c))
-
-                if tile_to_place == BLANK and random.random() < 0.05:
-                    grid[curr_r][curr_c] = COIN
-
-            # Branching
-            if random.random() < 0.3 or curr_c <= 1 or curr_c >= cols - 2:
-                if floor_points:
-                    curr_r, curr_c = random.choice(list(floor_points))
-
-        # Enemies
         self.lvl_mgr.get_current_level_enemies().clear()
-        enemies_placed = 0
-        attempts = 0
-        while enemies_placed < 4 and attempts < 200:
-            er = random.randint(1, rows - 2)
-            ec = random.randint(1, cols - 2)
-            tile = grid[er][ec]
-            dist = abs(er - start_r) + abs(ec - start_c)
-            if tile == BLANK and dist > 6:
-                if er + 1 < rows and grid[er + 1][ec] in [GROUND, LADDER]:
-                    self.lvl_mgr.add_enemy(er, ec)
-                    enemies_placed += 1
-            attempts += 1
-
-        fb_val = 5
-        try:
-            fb_val = int(self.fb_input.text)
-        except ValueError:
-            pass
+        for enemy in level["enemies"]:
+            self.lvl_mgr.add_enemy(enemy['r'], enemy['c'])
 
-        new_layout = ["".join(row) for row in grid]
-        self.lvl_mgr.update_current_level(self.name_input.text, new_layout, fb_val)
+        self.lvl_mgr.update_current_level(self.name_input.text, level["layout"], self._get_fb_count_from_input())
 
     def _delete_level(self):
         if self.lvl_mgr.delete_current_level():
@@ -204,8 +156,7 @@ class Editor:
             if btn.handle_event(event): return
 
         mx, my = pygame.mouse.get_pos()
-        col = mx // TILE_SIZE
-        row = my // TILE_SIZE
+        row, col = self._cell_at(mx, my)
 
         # Mouse Logic
         p_start = self.lvl_mgr.get_player_start()
@@ -223,7 +174,7 @@ class Editor:
                     # Other tools
                     if self.selected_tile == TOOL_ENEMY:
                         layout = self.lvl_mgr.get_current_level_data()
-                        if 0 <= row < len(layout) and 0 <= col < len(layout[0]):
+                        if self._in_level(row, col):
                             if layout[row][col] == BLANK:
                                 self.lvl_mgr.add_enemy(row, col)
                     elif self.selected_tile != CURSOR_TOOL:
@@ -242,7 +193,7 @@ class Editor:
 
         elif event.type == pygame.MOUSEMOTION:
             if self.dragging_player:
-                if 0 <= col < MAP_WIDTH and 0 <= row < MAP_HEIGHT:
+                if self._in_level(row, col):
                     self.lvl_mgr.set_player_start(row, col)
 
             elif pygame.mouse.get_pressed()[0]:
@@ -256,10 +207,9 @@ class Editor:
                     self._paint_tile(mx, my, BLANK)
 
     def _paint_tile(self, mx, my, tile_char):
-        col = mx // TILE_SIZE
-        row = my // TILE_SIZE
+        row, col = self._cell_at(mx, my)
 
-        if 0 <= col < MAP_WIDTH and 0 <= row < MAP_HEIGHT:
+        if self._in_level(row, col):
             p_start = self.lvl_mgr.get_player_start()
             if p_start is None: p_start = {'r': 1, 'c': 1}
 
@@ -272,6 +222,7 @@ class Editor:
                 return
             row_chars[col] = tile_char
             layout[row] = "".join(row_chars)
+            self.lvl_mgr.mark_dirty()
 
             if tile_char != BLANK:
                 self.lvl_mgr.remove_enemy(row, col)
@@ -284,28 +235,44 @@ class Editor:
         self.name_input.update(mouse_pos)
         self.fb_input.update(mouse_pos)
 
+        # Arrow keys scroll, unless they are editing a text field
+        self._sync_camera()
+        if not (self.name_input.active or self.fb_input.active):
+            keys = pygame.key.get_pressed()
+            dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * EDITOR_SCROLL_SPEED
+            dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * EDITOR_SCROLL_SPEED
+            if dx or dy:
+                self.camera.scroll(dx, dy)
+
     def draw(self, screen):
-        # Map
+        ox, oy = self.camera.offset
+
+        # Map, only the rows and columns in view
         layout = self.lvl_mgr.get_current_level_data()
-        for r, row_str in enumerate(layout):
-            for c, char in enumerate(row_str):
-                x, y = c * TILE_SIZE, r * TILE_SIZE
+        first_r, first_c = oy // TILE_SIZE, ox // TILE_SIZE
+        last_r = (oy + GAME_HEIGHT - 1) // TILE_SIZE + 1
+        last_c = (ox + SCREEN_WIDTH - 1) // TILE_SIZE + 1
+        for r in range(first_r, min(last_r, len(layout))):
+            row_str = layout[r]
+            for c in range(first_c, min(last_c, len(row_str))):
+                char = row_str[c]
                 if char in self.assets:
-                    screen.blit(self.assets[char], (x, y))
+                    screen.blit(self.assets[char], (c * TILE_SIZE - ox, r * TILE_SIZE - oy))
 
         # Enemies
         enemies = self.lvl_mgr.get_current_level_enemies()
         if enemies and 'enemy' in self.assets:
             enemy_img = self.assets['enemy']
             for e in enemies:
-                ex, ey = e['c'] * TILE_SIZE, e['r'] * TILE_SIZE
-                screen.blit(enemy_img, (ex, ey))
+                if first_r <= e['r'] < last_r and first_c <= e['c'] < last_c:
+                    ex, ey = e['c'] * TILE_SIZE - ox, e['r'] * TILE_SIZE - oy
+                    screen.blit(enemy_img, (ex, ey))
 
         # Player start position
         p_start = self.lvl_mgr.get_player_start()
         if p_start is None:
             p_start = {'r': 1, 'c': 1}
-        px, py = p_start['c'] * TILE_SIZE, p_start['r'] * TILE_SIZE
+        px, py = p_start['c'] * TILE_SIZE - ox, p_start['r'] * TILE_SIZE - oy
         if 'player' in self.assets:
             screen.blit(self.assets['player'], (px, py))
         else:
@@ -319,9 +286,9 @@ class Editor:
 
         # Grid
         if self.show_grid:
-            for x in range(0, SCREEN_WIDTH, TILE_SIZE):
+            for x in range(-(ox % TILE_SIZE), SCREEN_WIDTH, TILE_SIZE):
                 pygame.draw.line(screen, (50, 50, 50), (x, 0), (x, GAME_HEIGHT))
-            for y in range(0, GAME_HEIGHT, TILE_SIZE):
+            for y in range(-(oy % TILE_SIZE), GAME_HEIGHT, TILE_SIZE):
                 pygame.draw.line(screen, (50, 50, 50), (0, y), (SCREEN_WIDTH, y))
 
         # UI panel
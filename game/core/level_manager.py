@@ -1,105 +1,118 @@
-import json
 import os
-from typing import List, Dict, Any
-from game.config import LEVELS_FILE
-from game.utils import log_execution
+from typing import List, Dict, Any, Optional
+from game.config import LEVELS_FILE, LEVELS_INDEX_FILE, LEVELS_SAVE_DELAY, LEVEL_CACHE_SIZE
+from game.core.level_pack import LevelPack
+from game.systems.profiler import timed
+from game.utils import DebouncedWriter
 
 
 class LevelManager:
     def __init__(self):
-        self.levels: List[Dict[str, Any]] = self._load_levels()
+        self.pack: LevelPack = self._load_levels()
         self.current_index = 0
+        self._writer = DebouncedWriter(self._write_levels, LEVELS_SAVE_DELAY)
 
-    @log_execution
-    def _load_levels(self) -> List[Dict[str, Any]]:
+    @timed("LevelManager._load_levels")
+    def _load_levels(self) -> LevelPack:
         if not os.path.exists(LEVELS_FILE):
             print("Level file not found! Creating default.")
-            return self._create_default_file()
+        # Only the index is read here; layouts are decoded when a level is first used
+        return LevelPack(LEVELS_FILE, LEVELS_INDEX_FILE, LEVEL_CACHE_SIZE)
 
-        try:
-            with open(LEVELS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if data and isinstance(data[0], list):
-                    print("Detected old level format. Converting...")
-                    new_data = []
-                    for i, layout in enumerate(data):
-                        new_data.append({
-                            "id": i,
-                            "name": f"Level {i + 1}",
-                            "layout": layout
-                        })
-                    return new_data
-                return data
-        except json.JSONDecodeError:
-            print("Error decoding levels JSON")
-            return []
-
-    def _create_default_file(self):
-        return []
+    @property
+    def level_count(self) -> int:
+        return len(self.pack)
 
-    def save_levels(self):
+    def _current_level(self) -> Optional[Dict[str, Any]]:
+        if 0 <= self.current_index < len(self.pack):
+            return self.pack.get(self.current_index)
+        return None
+
+    def _write_levels(self):
         try:
-            with open(LEVELS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.levels, f, indent=2)
+            self.pack.write()
             print("Levels saved successfully.")
+            return True
         except IOError as e:
             print(f"Error saving levels: {e}")
+            return False
+
+    def mark_dirty(self):
+        if 0 <= self.current_index < len(self.pack):
+            self.pack.mark_changed(self.current_index)
+        self._writer.mark_dirty()
+
+    def save_levels(self):
+        self._writer.mark_dirty()
+        self._writer.flush()
+
+    def flush(self):
+        self._writer.flush()
 
 
     def get_current_level_data(self) -> List[str]:
-        if 0 <= self.current_index < len(self.levels):
-            return self.levels[self.current_index]["layout"]
+        lvl = self._current_level()
+        if lvl is not None:
+            return lvl["layout"]
         return []
 
     def get_current_level_name(self) -> str:
-        if 0 <= self.current_index < len(self.levels):
-            return self.levels[self.current_index].get("name", f"Level {self.current_index + 1}")
+        lvl = self._current_level()
+        if lvl is not None:
+            return lvl.get("name", f"Level {self.current_index + 1}")
         return "Unknown Level"
 
     def get_all_level_names(self) -> List[str]:
-        return [lvl.get("name", f"Level {i + 1}") for i, lvl in enumerate(self.levels)]
+        return self.pack.names()
 
     def get_current_level_enemies(self) -> list:
-        if 0 <= self.current_index < len(self.levels):
-            return self.levels[self.current_index].get("enemies", [])
+        lvl = self._current_level()
+        if lvl is not None:
+            return lvl.get("enemies", [])
         return []
 
     def get_current_level_fireballs(self) -> int:
-        if 0 <= self.current_index < len(self.levels):
-            return self.levels[self.current_index].get("fireballs", 5)
+        lvl = self._current_level()
+        if lvl is not None:
+            return lvl.get("fireballs", 5)
         return 5
 
     def get_player_start(self):
-        return self.levels[self.current_index].get('player_start', {'r': 1, 'c': 1})
+        return self._current_level().get('player_start', {'r': 1, 'c': 1})
 
     def set_player_start(self, row, col):
-        self.levels[self.current_index]['player_start'] = {'r': row, 'c': col}
+        with self.pack.lock:
+            self._current_level()['player_start'] = {'r': row, 'c': col}
 
     def get_current_level_projectiles(self):
-        return self.levels[self.current_index].get('projectiles', [])
+        return self._current_level().get('projectiles', [])
 
     def get_current_level_explosions(self):
-        return self.levels[self.current_index].get('explosions', [])
+        return self._current_level().get('explosions', [])
 
     def add_enemy(self, row, col):
-        if 0 <= self.current_index < len(self.levels):
-            lvl = self.levels[self.current_index]
-            if "enemies" not in lvl:
-                lvl["enemies"] = []
+        if 0 <= self.current_index < len(self.pack):
+            with self.pack.lock:
+                lvl = self._current_level()
+                if "enemies" not in lvl:
+                    lvl["enemies"] = []
 
-            for e in lvl["enemies"]:
-                if e['r'] == row and e['c'] == col:
-                    return
+                for e in lvl["enemies"]:
+                    if e['r'] == row and e['c'] == col:
+                        return
 
-            lvl["enemies"].append({'r': row, 'c': col})
-            self.save_levels()
+                lvl["enemies"].append({'r': row, 'c': col})
+            self.mark_dirty()
 
     def remove_enemy(self, row, col):
-        if 0 <= self.current_index < len(self.levels):
-            lvl = self.levels[self.current_index]
+        if 0 <= self.current_index < len(self.pack):
+            lvl = self._current_level()
             if "enemies" in lvl:
-                lvl["enemies"] = [e for e in lvl["enemies"] if not (e['r'] == row and e['c'] == col)]
-                self.save_levels()
+                kept = [e for e in lvl["enemies"] if not (e['r'] == row and e['c'] == col)]
+                if len(kept) != len(lvl["enemies"]):
+                    with self.pack.lock:
+                        lvl["enemies"] = kept
+                    self.mark_dirty()
 
 
     def create_new_level(self):
@@ -113,37 +126,39 @@ class LevelManager:
             layout.append(row)
 
         new_level = {
-            "id": len(self.levels),
+            "id": len(self.pack),
             "name": "New Level",
             "layout": layout,
             "fireballs": 2
         }
-        self.levels.append(new_level)
-        self.current_index = len(self.levels) - 1
-        self.save_levels()
+        self.pack.append(new_level)
+        self.current_index = len(self.pack) - 1
+        self.mark_dirty()
 
     def update_current_level(self, name: str, layout: List[str], max_fireballs: int,
                              projectiles=None, explosions=None):
-        if 0 <= self.current_index < len(self.levels):
-            self.levels[self.current_index]["name"] = name
-            self.levels[self.current_index]["layout"] = layout
-            self.levels[self.current_index]["fireballs"] = int(max_fireballs)
-            self.levels[self.current_index]['projectiles'] = projectiles if projectiles is not None else []
-            self.levels[self.current_index]['explosions'] = explosions if explosions is not None else []
-            self.save_levels()
+        lvl = self._current_level()
+        if lvl is not None:
+            with self.pack.lock:
+                lvl["name"] = name
+                lvl["layout"] = layout
+                lvl["fireballs"] = int(max_fireballs)
+                lvl['projectiles'] = projectiles if projectiles is not None else []
+                lvl['explosions'] = explosions if explosions is not None else []
+            self.mark_dirty()
 
     def delete_current_level(self):
-        if 0 <= self.current_index < len(self.levels) and len(self.levels) > 1:
-            self.levels.pop(self.current_index)
-            if self.current_index >= len(self.levels):
-                self.current_index = len(self.levels) - 1
-            self.save_levels()
+        if 0 <= self.current_index < len(self.pack) and len(self.pack) > 1:
+            self.pack.pop(self.current_index)
+            if self.current_index >= len(self.pack):
+                self.current_index = len(self.pack) - 1
+            self._writer.mark_dirty()
             return True
         return False
 
 
     def next_level(self):
-        if self.current_index < len(self.levels) - 1:
+        if self.current_index < len(self.pack) - 1:
             self.current_index += 1
             return True
         return False
@@ -155,5 +170,5 @@ class LevelManager:
         return False
 
     def set_level(self, index: int):
-        if 0 <= index < len(self.levels):
+        if 0 <= index < len(self.pack):
             self.current_index = index
\ No newline at end of file
@@ -0,0 +1,206 @@
+import json
+import os
+import textwrap
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+from game.utils import atomic_write, write_temp
+
+INDEX_VERSION = 1
+
+
+class LevelPack:
+    # levels.json stays a plain JSON array, but a sidecar index keeps each level's
+    # id, name and byte range so startup only reads the index and levels decode on demand.
+
+    def __init__(self, path: str, index_path: str, cache_size: int = 8):
+        self.path = path
+        self.index_path = index_path
+        self.cache_size = cache_size
+        self._entries: List[Dict[str, Any]] = []
+        self._lru: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Serializes write() calls; _lock itself is not held while the file is written
+        self._write_lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            self._entries = self._read_index() or self._build_index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    def names(self) -> List[str]:
+        return [e.get("name", f"Level {i + 1}") for i, e in enumerate(self._entries)]
+
+    def _source_stamp(self) -> Dict[str, int]:
+        stat = os.stat(self.path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _read_index(self) -> Optional[List[Dict[str, Any]]]:
+        if not os.path.exists(self.index_path):
+            return None
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if index.get("version") != INDEX_VERSION or index.get("source") != self._source_stamp():
+            return None
+        return [dict(e, level=None, dirty=False, rev=0) for e in index["levels"]]
+
+    def _build_index(self) -> List[Dict[str, Any]]:
+        # One full pass to find element boundaries; later starts only read the index
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        text = raw.decode('utf-8')
+        is_ascii = len(text) == len(raw)
+
+        def byte_pos(pos):
+            return pos if is_ascii else len(text[:pos].encode('utf-8'))
+
+        decoder = json.JSONDecoder()
+        entries = []
+        legacy = False
+        try:
+            pos = text.index('[') + 1
+            while True:
+                while text[pos] in ' \t\r\n,':
+                    pos += 1
+                if text[pos] == ']':
+                    break
+                level, end = decoder.raw_decode(text, pos)
+                if isinstance(level, list):
+                    if not legacy:
+                        print("Detected old level format. Converting...")
+                        legacy = True
+                    level = {"id": len(entries), "name": f"Level {len(entries) + 1}", "layout": level}
+                start = byte_pos(pos)
+                entries.append({
+                    "id": level.get("id", len(entries)),
+                    "name": level.get("name", f"Level {len(entries) + 1}"),
+                    "offset": start,
+                    "length": byte_pos(end) - start,
+                    "level": None,
+                    "dirty": False,
+                    "rev": 0
+                })
+                pos = end
+        except (ValueError, IndexError):
+            print("Error decoding levels JSON")
+            return []
+
+        self._write_index(self._index_data(entries))
+        return entries
+
+    def _index_data(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "source": self._source_stamp(),
+            "levels": [{k: e[k] for k in ("id", "name", "offset", "length")} for e in entries]
+        }
+
+    def _write_index(self, index: Dict[str, Any]):
+        try:
+            atomic_write(self.index_path, json.dumps(index))
+        except OSError as e:
+            print(f"Error saving level index: {e}")
+
+    def _read_payload(self, entry: Dict[str, Any]) -> bytes:
+        with open(self.path, 'rb') as f:
+            f.seek(entry["offset"])
+            return f.read(entry["length"])
+
+    def get(self, index: int) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries[index]
+            if entry["level"] is None:
+                level = json.loads(self._read_payload(entry))
+                if isinstance(level, list):
+                    level = {"id": entry["id"], "name": entry["name"], "layout": level}
+                entry["level"] = level
+            self._touch(entry)
+            return entry["level"]
+
+    def _touch(self, entry: Dict[str, Any]):
+        self._lru[id(entry)] = entry
+        self._lru.move_to_end(id(entry))
+        # Evict least recently used clean levels; dirty ones stay until written
+        for key in list(self._lru):
+            if len(self._lru) <= self.cache_size:
+                break
+            old = self._lru[key]
+            if not old["dirty"] and old is not entry:
+                old["level"] = None
+                del self._lru[key]
+
+    def mark_changed(self, index: int):
+        with self._lock:
+            entry = self._entries[index]
+            if entry["level"] is not None:
+                entry["dirty"] = True
+                # Lets a write that started before this change leave the entry dirty
+                entry["rev"] += 1
+                entry["name"] = entry["level"].get("name", entry["name"])
+                entry["id"] = entry["level"].get("id", entry["id"])
+
+    def append(self, level: Dict[str, Any]):
+        with self._lock:
+            entry = {"id": level.get("id", len(self._entries)), "name": level.get("name", "New Level"),
+                     "offset": None, "length": 0, "level": level, "dirty": True, "rev": 0}
+            self._entries.append(entry)
+            self._touch(entry)
+
+    def pop(self, index: int):
+        with self._lock:
+            entry = self._entries.pop(index)
+            self._lru.pop(id(entry), None)
+
+    def write(self):
+        # Lazily loaded levels are copied byte-for-byte; only decoded ones are re-serialized.
+        # The lock is held to build the payload and to swap the file in with its offsets,
+        # not while it is written and synced, so get() on the UI thread doesn't stall.
+        with self._write_lock:
+            with self._lock:
+                entries = list(self._entries)
+                revisions = [entry["rev"] for entry in entries]
+                chunks = []
+                for entry in entries:
+                    if entry["level"] is not None:
+                        chunk = textwrap.indent(json.dumps(entry["level"], indent=2), '  ').encode('utf-8')
+                    else:
+                        chunk = b'  ' + self._read_payload(entry)
+                    chunks.append(chunk)
+
+            payload = bytearray(b'[\n')
+            offsets = []
+            for i, chunk in enumerate(chunks):
+                if i:
+                    payload += b',\n'
+                start = len(payload) + 2
+                offsets.append((start, len(chunk) - 2))
+                payload += chunk
+            payload += b'\n]'
+
+            tmp_path = write_temp(self.path, bytes(payload), mode='wb')
+
+            # Readers seek by offset, so the rename and the new offsets land together
+            with self._lock:
+                os.replace(tmp_path, self.path)
+                for entry, rev, (offset, length) in zip(entries, revisions, offsets):
+                    entry["offset"] = offset
+                    entry["length"] = length
+                    if entry["rev"] == rev:
+                        entry["dirty"] = False
+                # Levels added or removed meanwhile are not in this file; the next write
+                # records them, and the index with them
+                unchanged = len(entries) == len(self._entries) and all(
+                    a is b for a, b in zip(entries, self._entries))
+                index = self._index_data(entries) if unchanged else None
+
+            if index is not None:
+                self._write_index(index)
@@ -0,0 +1,314 @@
+import pygame
+from typing import List, Optional
+from game.config import *
+from game.entities import Player, GameMap, Enemy, EnemyBatch
+from game.entities.projectile import Fireball, Explosion
+from game.systems.pathfinding import FlowField, HierarchicalPathfinder
+from game.systems.snapshot import Snapshot
+from game.systems.profiler import profiler
+from game.systems.spatial import SpatialHash
+from game.systems.scheduler import Scheduler
+from game.systems.replay import (KeyState, InputRecorder, encode_keys, level_fingerprint,
+                                 ACTION_DIG, ACTION_FIREBALL)
+
+# Timed world events; the arguments are ints so pending events can be saved
+EVENT_HOLE_REFILL = 1       # row, col
+EVENT_EXPLOSION_END = 2     # explosion serial (index into explosions in a save)
+
+
+def default_player_start(height: int) -> dict:
+    # Where the player starts on levels saved without a start cell
+    return {'r': height - 3, 'c': 2}
+
+
+# Headless world state stepped at a fixed rate, independent of rendering
+class Simulation:
+
+    def __init__(self, layout: List[str], player_start: Optional[dict], enemy_positions: list,
+                 fireballs: int, fireball_img: pygame.Surface = None, explosion_img: pygame.Surface = None,
+                 batched: Optional[bool] = None, hierarchical: Optional[bool] = None):
+        self.level_fingerprint = level_fingerprint(layout, player_start, enemy_positions, fireballs)
+        self.map = GameMap(layout)
+
+        if player_start is None:
+            player_start = default_player_start(self.map.height)
+        self.player = Player(player_start['c'] * TILE_SIZE, player_start['r'] * TILE_SIZE)
+
+        self.enemies = [Enemy(e['c'] * TILE_SIZE, e['r'] * TILE_SIZE) for e in enemy_positions]
+        # Crowds are stepped as flat arrays; otherwise enemies are bucketed by tile cell.
+        # Both answer the same hit-test queries, so projectiles do not care which it is.
+        if batched is None:
+            batched = len(self.enemies) >= ENEMY_BATCH_THRESHOLD
+        self.enemy_batch: Optional[EnemyBatch] = EnemyBatch(self.enemies) if batched else None
+        self.enemy_index = self.enemy_batch or SpatialHash()
+        self.enemy_index.rebuild(self.enemies)
+        self.projectiles = []
+        self.explosions = []
+        self._explosion_serial = 0
+        self.fireballs_left = fireballs
+        # Both answer update()/next_move(); flooding the whole map per player step stops
+        # paying off on big levels, where routing goes through regions instead
+        if hierarchical is None:
+            hierarchical = self.map.width * self.map.height >= HIERARCHICAL_PATH_MIN_CELLS
+        self.flow_field = HierarchicalPathfinder() if hierarchical else FlowField()
+
+        fb_size = int(TILE_SIZE / 3)
+        exp_size = int(TILE_SIZE * 1.2)
+        self.fireball_img = fireball_img or pygame.Surface((fb_size, fb_size))
+        self.explosion_img = explosion_img or pygame.Surface((exp_size, exp_size))
+
+        # Input is sampled as a key bitmask; digs and fireballs wait for the next tick
+        self.key_mask = 0
+        self._actions = []
+        self.recorder: Optional[InputRecorder] = None
+
+        self.time_ms = 0.0
+        self.tick_count = 0
+        self.accumulator = 0.0
+        # Runs on time_ms, so everything scheduled stops while the simulation is not stepped
+        self.events = Scheduler(self._on_event)
+
+        self.game_finished = False
+        self.game_over = False
+        self.win_time = 0
+
+    @classmethod
+    def from_level_manager(cls, level_manager, assets: dict = None):
+        assets = assets or {}
+        return cls(
+            level_manager.get_current_level_data(),
+            level_manager.get_player_start(),
+            level_manager.get_current_level_enemies(),
+            level_manager.get_current_level_fireballs(),
+            assets.get('fireball'),
+            assets.get('explosion')
+        )
+
+    @property
+    def is_running(self) -> bool:
+        return not self.game_finished and not self.game_over
+
+    @property
+    def alpha(self) -> float:
+        # Fraction of a tick left in the accumulator, used to interpolate drawing
+        return self.accumulator / FIXED_DT
+
+    def start_recording(self) -> InputRecorder:
+        self.recorder = InputRecorder(self.level_fingerprint)
+        return self.recorder
+
+    def set_input(self, keys):
+        self.key_mask = encode_keys(keys)
+
+    def queue_action(self, action: int, a: int = 0, b: int = 0):
+        self._actions.append((action, a, b))
+
+    def spawn_fireball(self) -> bool:
+        queued = sum(1 for action, _, _ in self._actions if action == ACTION_FIREBALL)
+        if self.fireballs_left - queued <= 0:
+            return False
+        self.queue_action(ACTION_FIREBALL)
+        return True
+
+    def dig(self, grid_r: int, grid_c: int):
+        self.queue_action(ACTION_DIG, grid_r, grid_c)
+
+    def _apply_fireball(self):
+        if self.fireballs_left <= 0:
+            return
+
+        direction = 1 if self.player.facing_right else -1
+        start_x = self.player.x + (TILE_SIZE if direction == 1 else 0)
+        start_y = self.player.y
+
+        self.projectiles.append(Fireball(start_x, start_y, direction, self.fireball_img, self.explosion_img))
+        self.fireballs_left -= 1
+
+    def _apply_dig(self, grid_r: int, grid_c: int):
+        player_r, player_c = self.player.row, self.player.col
+        if abs(grid_r - player_r) <= 1 and abs(grid_c - player_c) <= 1:
+            if self.map.dig_hole(grid_r, grid_c):
+                self.events.schedule(HOLE_DURATION, EVENT_HOLE_REFILL, grid_r, grid_c)
+
+    def _add_explosion(self, explosion: Explosion, lifetime: Optional[float] = EXPLOSION_DURATION):
+        explosion.serial = self._explosion_serial
+        self._explosion_serial += 1
+        self.explosions.append(explosion)
+        if lifetime is not None:
+            self.events.schedule(lifetime, EVENT_EXPLOSION_END, explosion.serial)
+
+    def _on_event(self, kind: int, a: int, b: int):
+        if kind == EVENT_HOLE_REFILL:
+            self.map.refill_hole(a, b)
+        elif kind == EVENT_EXPLOSION_END:
+            self.explosions = [e for e in self.explosions if e.serial != a]
+
+    def advance(self, frame_ms: float) -> int:
+        # Feed real frame time into the accumulator and run as many fixed ticks as fit
+        self.accumulator += min(frame_ms, MAX_FRAME_TIME)
+        ticks = 0
+        while self.accumulator >= FIXED_DT:
+            self.accumulator -= FIXED_DT
+            if self.is_running:
+                self.step()
+            ticks += 1
+        return ticks
+
+    def step(self, dt: float = FIXED_DT):
+        actions, self._actions = self._actions, []
+        if self.recorder is not None:
+            self.recorder.record_tick(self.tick_count, self.key_mask, actions)
+
+        self.time_ms += dt
+        self.tick_count += 1
+
+        batch = self.enemy_batch
+        if batch is None:
+            for enemy in self.enemies:
+                enemy.save_position()
+        else:
+            batch.save_positions()
+        for entity in (self.player, *self.projectiles, *self.explosions):
+            entity.save_position()
+
+        for action, a, b in actions:
+            if action == ACTION_DIG:
+                self._apply_dig(a, b)
+            elif action == ACTION_FIREBALL:
+                self._apply_fireball()
+
+        with profiler.scope("update.map"):
+            self.events.advance(self.time_ms)
+
+        with profiler.scope("update.player"):
+            keys = KeyState(self.key_mask)
+            self.player.handle_input(keys, self.map)
+            self.player.update(dt, self.map, keys, self.time_ms)
+
+        with profiler.scope("update.projectiles"):
+            for proj in self.projectiles[:]:
+                proj.update(dt, self.map, self.enemies, self.enemy_index)
+
+                if proj.explosion_instance:
+                    self._add_explosion(proj.explosion_instance)
+                    self.projectiles.remove(proj)
+                elif proj.should_explode:
+                    self.projectiles.remove(proj)
+
+            victims = []
+            for exp in self.explosions:
+                exp.update(dt, self.map, self.enemies, self.enemy_index)
+                if exp.victims:
+                    victims += exp.victims
+                    exp.victims = []
+            if victims:
+                self.enemies = [e for e in self.enemies if e in self.enemy_index]
+
+        with profiler.scope("update.enemies"):
+            player_grid_pos = self.player.row, self.player.col
+            if self.enemies:
+                self.flow_field.update(self.map, player_grid_pos)
+            if batch is not None:
+                batch.step(self.map, player_grid_pos, self.flow_field)
+            else:
+                for enemy in self.enemies:
+                    enemy.update(dt, self.map, player_grid_pos, self.flow_field)
+                    self.enemy_index.move(enemy)
+
+            if self.enemy_index.query_rect(self.player.rect, inset=5):
+                self.game_over = True
+                self.accumulator = 0.0
+                return
+
+        if self.player.coins >= self.map.total_coins:
+            self.game_finished = True
+            self.win_time = int(self.time_ms)
+            self.accumulator = 0.0
+
+    def sync_entities(self):
+        # Batched enemies only live in arrays between ticks; call before reading or drawing them
+        if self.enemy_batch is not None:
+            self.enemy_batch.sync()
+
+    def snapshot(self) -> Snapshot:
+        self.sync_entities()
+        # Explosions are saved in list order, so their end events refer to that index
+        slot = {e.serial: i for i, e in enumerate(self.explosions)}
+        # Refills for cells off the map have nothing to refill and don't fit the hole records
+        events = [(kind, remaining, slot[a] if kind == EVENT_EXPLOSION_END else a, b)
+                  for kind, remaining, a, b in self.events.pending()
+                  if (kind != EVENT_EXPLOSION_END or a in slot) and
+                  (kind != EVENT_HOLE_REFILL or (0 <= a < self.map.height and 0 <= b < self.map.width))]
+        # Ages are still written for builds that predate the event section
+        holes = [(a, b, HOLE_DURATION - remaining) for kind, remaining, a, b in events if kind == EVENT_HOLE_REFILL]
+        ages = {a: EXPLOSION_DURATION - remaining for kind, remaining, a, _ in events if kind == EVENT_EXPLOSION_END}
+        return Snapshot(
+            self.player.x, self.player.y, self.player.coins, int(self.time_ms), self.fireballs_left,
+            self.map.get_layout(),
+            holes,
+            [(e.x, e.y, e.target_x, e.target_y) for e in self.enemies],
+            [(p.x, p.y, p.direction) for p in self.projectiles],
+            [(e.rect.centerx, e.rect.centery, ages.get(i, 0.0)) for i, e in enumerate(self.explosions)],
+            events
+        )
+
+    def restore(self, snap: Snapshot):
+        # A recording cannot describe a jump to saved state, so it ends here
+        self.recorder = None
+        self._actions = []
+
+        self.player.x = snap.player_x
+        self.player.y = snap.player_y
+        self.player.reset_movement()
+        self.player._coins_collected = snap.coins
+
+        self.time_ms = float(snap.elapsed_ms)
+        self.accumulator = 0.0
+        self.events.clear(self.time_ms)
+
+        self.map.load_data(snap.layout)
+
+        self.enemies = []
+        for ex, ey, tx, ty in snap.enemies:
+            enemy = Enemy(ex, ey)
+            enemy.target_x = tx
+            enemy.target_y = ty
+            self.enemies.append(enemy)
+        self.enemy_index.rebuild(self.enemies)
+
+        self.fireballs_left = snap.fireballs_left
+
+        self.projectiles = []
+        for px, py, direction in snap.projectiles:
+            fb = Fireball(px, py, direction, self.fireball_img, self.explosion_img)
+            # The constructor offsets y from a tile-aligned spawn point; restore the exact spot
+            fb.y = py
+            fb.save_position()
+            self.projectiles.append(fb)
+
+        self.explosions = []
+        self._explosion_serial = 0
+        for ex, ey, _age in snap.explosions:
+            # End events come from the save below
+            self._add_explosion(Explosion(ex, ey, self.explosion_img), lifetime=None)
+
+        if snap.events:
+            for kind, remaining, a, b in snap.events:
+                self.events.schedule(remaining, kind, a, b)
+        else:
+            for r, c, age in snap.holes:
+                self.events.schedule(HOLE_DURATION - age, EVENT_HOLE_REFILL, r, c)
+            for i, (_, _, age) in enumerate(snap.explosions):
+                self.events.schedule(EXPLOSION_DURATION - age, EVENT_EXPLOSION_END, i)
+
+        self.game_finished = False
+        self.game_over = False
+        self.win_time = 0
+
+    def run_ticks(self, count: int) -> int:
+        # Step up to `count` ticks as fast as possible, stopping early on win/lose
+        done = 0
+        while done < count and self.is_running:
+            self.step()
+            done += 1
+        return done
@@ -2,4 +2,5 @@ from .entity import Entity
 from .player import Player
 from .map import GameMap
 from .enemy import Enemy
-from .projectile import Explosion, Fireball
\ No newline at end of file
+from .projectile import Explosion, Fireball
+from .batch import EnemyBatch
@@ -0,0 +1,108 @@
+import math
+from array import array
+from itertools import compress, repeat
+from operator import add, sub, eq, and_, or_, lt, gt, ge, le
+from typing import List
+import pygame
+from game.config import TILE_SIZE
+
+
+class EnemyBatch:
+    # Struct-of-arrays enemy state for crowded levels. Positions, targets and facing live
+    # in flat arrays and are stepped a column at a time (zip comprehensions, map() over
+    # operators), with no per-object attribute access. The Enemy objects are only written
+    # back by sync(), before drawing or saving.
+    # Has the same query/remove interface as SpatialHash, so projectiles work with either.
+
+    def __init__(self, enemies: list):
+        self.load(enemies)
+
+    def load(self, enemies: list):
+        self.enemies = list(enemies)
+        self.x = array('d', (e.x for e in self.enemies))
+        self.y = array('d', (e.y for e in self.enemies))
+        self.target_x = array('d', (e.target_x for e in self.enemies))
+        self.target_y = array('d', (e.target_y for e in self.enemies))
+        self.speed = array('d', (e.move_speed for e in self.enemies))
+        # 1 = facing right
+        self.facing = array('b', (e.image is e.image_right for e in self.enemies))
+        self.prev_x = array('d', self.x)
+        self.prev_y = array('d', self.y)
+        self._slot = {id(e): i for i, e in enumerate(self.enemies)}
+
+    # SpatialHash compatibility
+    rebuild = load
+
+    def __len__(self) -> int:
+        return len(self.enemies)
+
+    def __contains__(self, enemy) -> bool:
+        return id(enemy) in self._slot
+
+    def save_positions(self):
+        self.prev_x = array('d', self.x)
+        self.prev_y = array('d', self.y)
+
+    def step(self, map_obj, player_pos, flow_field):
+        # Same clamp as Enemy.update, one pass per column; comparing a + s against t
+        # (not t - a against s) keeps the floats bit-identical to the per-object path
+        old_x = self.x
+        x = self.x = array('d', [(t if a + s >= t else a + s) if a < t else (t if a - s <= t else a - s)
+                                 for a, t, s in zip(old_x, self.target_x, self.speed)])
+        y = self.y = array('d', [(t if a + s >= t else a + s) if a < t else (t if a - s <= t else a - s)
+                                 for a, t, s in zip(self.y, self.target_y, self.speed)])
+        # Turn right on a move right, keep facing unless it was a move left
+        self.facing = array('b', map(or_, map(gt, x, old_x), map(and_, self.facing, map(ge, x, old_x))))
+
+        arrived = list(compress(range(len(x)), map(and_, map(eq, x, self.target_x), map(eq, y, self.target_y))))
+        if not arrived:
+            return
+        flow_field.update(map_obj, player_pos)
+        half = TILE_SIZE / 2
+        for i in arrived:
+            # Next step comes from the shared field built from the player's cell
+            next_move = flow_field.next_move((int((y[i] + half) // TILE_SIZE), int((x[i] + half) // TILE_SIZE)))
+            if next_move:
+                self.target_x[i] = float(next_move[1] * TILE_SIZE)
+                self.target_y[i] = float(next_move[0] * TILE_SIZE)
+
+    def _overlapping(self, left: int, top: int, right: int, bottom: int, inset: int = 0) -> List[int]:
+        # Indices whose tile-sized rect, shrunk by `inset` per side, overlaps the box
+        size = TILE_SIZE - 2 * inset
+        xs = list(map(int, self.x))
+        ys = list(map(int, self.y))
+        hit_x = map(and_, map(lt, xs, repeat(right - inset)), map(gt, xs, repeat(left - inset - size)))
+        hit_y = map(and_, map(lt, ys, repeat(bottom - inset)), map(gt, ys, repeat(top - inset - size)))
+        return list(compress(range(len(xs)), map(and_, hit_x, hit_y)))
+
+    def query_rect(self, rect: pygame.Rect, inset: int = 0) -> list:
+        return [self.enemies[i] for i in self._overlapping(rect.left, rect.top, rect.right, rect.bottom, inset)]
+
+    def query_radius(self, x: float, y: float, radius: float) -> list:
+        half = TILE_SIZE / 2
+        dx = map(sub, map(add, self.x, repeat(half)), repeat(x))
+        dy = map(sub, map(add, self.y, repeat(half)), repeat(y))
+        inside = map(le, map(math.hypot, dx, dy), repeat(radius))
+        return [self.enemies[i] for i in compress(range(len(self.x)), inside)]
+
+    def move(self, enemy):
+        pass
+
+    def remove(self, enemy):
+        i = self._slot.pop(id(enemy), None)
+        if i is None:
+            return
+        for arr in (self.x, self.y, self.target_x, self.target_y, self.speed, self.facing, self.prev_x, self.prev_y):
+            del arr[i]
+        del self.enemies[i]
+        self._slot = {id(e): j for j, e in enumerate(self.enemies)}
+
+    def sync(self):
+        # Push array state onto the Enemy objects for drawing and hit-box reads
+        for i, enemy in enumerate(self.enemies):
+            x, y = self.x[i], self.y[i]
+            enemy.image = enemy.image_right if self.facing[i] else enemy.image_left
+            enemy._x, enemy._y = x, y
+            enemy.rect.topleft = (int(x), int(y))
+            enemy.prev_x, enemy.prev_y = self.prev_x[i], self.prev_y[i]
+            enemy.target_x, enemy.target_y = self.target_x[i], self.target_y[i]
@@ -8,6 +8,8 @@ class Entity(ABC, pygame.sprite.Sprite):
         super().__init__()
         self._x = x
         self._y = y
+        self.prev_x = x
+        self.prev_y = y
 
         self.image = pygame.Surface((24, 24))
         self.rect = self.image.get_rect(topleft=(x, y))
@@ -30,9 +32,19 @@ class Entity(ABC, pygame.sprite.Sprite):
         self._y = value
         self.rect.y = int(value)
 
+    def save_position(self):
+        self.prev_x = self._x
+        self.prev_y = self._y
+
     @abstractmethod
     def update(self, dt: float, map_obj):
         pass
 
-    def draw(self, screen: pygame.Surface):
-        screen.blit(self.image, self.rect)
\ No newline at end of file
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0, offset=(0, 0)) -> pygame.Rect:
+        # offset is the camera's world position; the returned rect is in screen space
+        if alpha >= 1.0:
+            return screen.blit(self.image, (self.rect.x - offset[0], self.rect.y - offset[1]))
+        # Interpolate between the last two simulation ticks
+        x = self.prev_x + (self._x - self.prev_x) * alpha
+        y = self.prev_y + (self._y - self.prev_y) * alpha
+        return screen.blit(self.image, (int(x) - offset[0], int(y) - offset[1]))
\ No newline at end of file
@@ -1,67 +1,260 @@
 import pygame
-from typing import List, Tuple, Generator
+from typing import Dict, List, Tuple, Generator, Optional
 from game.config import *
+from game.systems.pathfinding import NavGraph, RegionGraph
+
+# Tiles are stored as their ASCII byte, so layouts encode straight into the grid
+TILE_CODES = {tile: ord(tile) for tile in (BLANK, GROUND, LADDER, COIN, START)}
+_CODE_TO_TILE = [chr(code) for code in range(256)]
+_GROUND_CODE = TILE_CODES[GROUND]
+_CHUNK_PX = CHUNK_TILES * TILE_SIZE
 
 
 class GameMap:
+    # Flat row-major bytearray with a one-tile GROUND border around the level, so reads up
+    # to one tile past an edge (tile_near) need no bounds check; get_tile stays checked
+    # for callers that can land further out.
+
     def __init__(self, layout: List[str]):
-        self._data = [list(row) for row in layout]
-        self.holes = []
-        self._initial_coins = sum(row.count(COIN) for row in self._data)
+        # Bumped on every tile change so cached path data knows when to rebuild
+        self.version = 0
+        self._nav: Optional[NavGraph] = None
+        self._regions: Optional[RegionGraph] = None
+        # Pre-rendered background + tiles in (chunk_row, chunk_col) pieces, built around the
+        # view and patched per tile instead of redrawn each frame
+        self._chunks: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._dirty_tiles = set()
+        self._dirty_rects: List[pygame.Rect] = []
+        self._set_grid(layout)
+        self._initial_coins = self.count_tiles(COIN)
 
-    @property
-    def width(self) -> int:
-        return len(self._data[0]) if self._data else 0
+    def _set_grid(self, layout):
+        rows = ["".join(row) for row in layout]
+        self.height = len(rows)
+        self.width = max((len(row) for row in rows), default=0)
 
-    @property
-    def height(self) -> int:
-        return len(self._data)
+        stride = self.width + 2
+        border = bytes([_GROUND_CODE]) * stride
+        grid = bytearray(border)
+        for row in rows:
+            grid += GROUND.encode('ascii')
+            grid += row.ljust(self.width, BLANK).encode('ascii')
+            grid += GROUND.encode('ascii')
+        grid += border
+
+        self._stride = stride
+        self._grid = grid
 
     @property
     def total_coins(self) -> int:
         return self._initial_coins
 
-    def __getitem__(self, index: int) -> List[str]:
-        return self._data[index]
+    @property
+    def nav(self) -> NavGraph:
+        if self._nav is None:
+            self._nav = NavGraph(self)
+        return self._nav
+
+    @property
+    def regions(self) -> RegionGraph:
+        if self._regions is None:
+            self._regions = RegionGraph(self)
+        return self._regions
+
+    def __getitem__(self, index: int) -> str:
+        start = (index + 1) * self._stride + 1
+        return self._grid[start:start + self.width].decode('ascii')
 
+    def _index(self, row: int, col: int) -> int:
+        return (row + 1) * self._stride + col + 1
 
     def get_tile(self, row: int, col: int) -> str:
-        if 0 <= row < self.height and 0 <= col < self.width:
-            return self._data[row][col]
+        # Checked read for any cell (clicks, entities, jumps two rows up); off the map is GROUND
+        if -1 <= row <= self.height and -1 <= col <= self.width:
+            return _CODE_TO_TILE[self._grid[(row + 1) * self._stride + col + 1]]
         return GROUND
 
+    def tile_near(self, row: int, col: int) -> str:
+        # Unchecked read for the neighbour lookups in pathfinding. Only valid at most one
+        # tile outside the level, where it reads the GROUND border; further out it returns
+        # the wrong cell or wraps around the grid instead of failing.
+        return _CODE_TO_TILE[self._grid[(row + 1) * self._stride + col + 1]]
+
     def set_tile(self, row: int, col: int, value: str):
         if 0 <= row < self.height and 0 <= col < self.width:
-            self._data[row][col] = value
+            index = self._index(row, col)
+            old_value = _CODE_TO_TILE[self._grid[index]]
+            self._grid[index] = TILE_CODES.get(value, ord(value))
+            self.version += 1
+            if self._nav is not None:
+                self._nav.on_tile_changed(row, col, old_value, value)
+            if self._regions is not None:
+                self._regions.on_tile_changed(row, col, old_value, value)
+            if self._chunks:
+                self._dirty_tiles.add((row, col))
+
+    def load_data(self, data: List[str]):
+        self._set_grid(data)
+        self.version += 1
+        if self._nav is not None:
+            self._nav.rebuild()
+        if self._regions is not None:
+            self._regions.rebuild()
+        self._chunks.clear()
+        self._dirty_tiles.clear()
+
+    def get_layout(self) -> List[str]:
+        return [self[r] for r in range(self.height)]
+
+    def count_tiles(self, tile_type: str) -> int:
+        # The border is all GROUND, so strip it out of ground counts
+        total = self._grid.count(TILE_CODES.get(tile_type, ord(tile_type)))
+        if tile_type == GROUND:
+            total -= 2 * self._stride + 2 * self.height
+        return total
+
+    def find_tiles(self, tile_type: str) -> List[Tuple[int, int]]:
+        # bytearray.find scans in C, so this stays cheap even on big grids
+        code = TILE_CODES.get(tile_type, ord(tile_type))
+        grid, stride, width = self._grid, self._stride, self.width
+        cells = []
+        index = grid.find(code)
+        while index != -1:
+            r, c = divmod(index, stride)
+            if 1 <= r <= self.height and 1 <= c <= width:
+                cells.append((r - 1, c - 1))
+            index = grid.find(code, index + 1)
+        return cells
 
     def iter_tiles(self, tile_type: str) -> Generator[Tuple[int, int], None, None]:
-        for r in range(self.height):
-            for c in range(self.width):
-                if self._data[r][c] == tile_type:
-                    yield r, c
+        yield from self.find_tiles(tile_type)
 
-    def dig_hole(self, row: int, col: int):
-        if self.get_tile(row, col) == GROUND:
+    def dig_hole(self, row: int, col: int) -> bool:
+        # The caller schedules the refill; returns whether there was ground to dig. The
+        # padded border reads as ground too, but it isn't part of the level.
+        if 0 <= row < self.height and 0 <= col < self.width and self.get_tile(row, col) == GROUND:
             self.set_tile(row, col, BLANK)
-            self.holes.append({'r': row, 'c': col, 'time': pygame.time.get_ticks()})
-
-    def update_holes(self):
-        current_time = pygame.time.get_ticks()
-        for hole in self.holes[:]:
-            if current_time - hole['time'] > HOLE_DURATION:
-                self.set_tile(hole['r'], hole['c'], GROUND)
-                self.holes.remove(hole)
-
-    def draw(self, screen: pygame.Surface, asset_dict: dict):
-        for r in range(self.height):
-            for c in range(self.width):
-                tile_char = self._data[r][c]
-                if tile_char != BLANK and tile_char in asset_dict:
-                    img = asset_dict[tile_char]
-                    screen.blit(img, (c * TILE_SIZE, r * TILE_SIZE))
+            return True
+        return False
+
+    def refill_hole(self, row: int, col: int):
+        self.set_tile(row, col, GROUND)
+
+    @property
+    def pixel_rect(self) -> pygame.Rect:
+        return pygame.Rect(0, 0, self.width * TILE_SIZE, self.height * TILE_SIZE)
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self._chunks)
+
+    @staticmethod
+    def _paint_background(surface: pygame.Surface, rect: pygame.Rect, origin: Tuple[int, int],
+                          background: Optional[pygame.Surface]):
+        # The background repeats across the world; rect is in surface coordinates and
+        # origin is where the surface sits in the world
+        if background is None:
+            surface.fill((0, 0, 0, 0), rect)
+            return
+        bw, bh = background.get_size()
+        wx, wy = origin[0] + rect.x, origin[1] + rect.y
+        surface.set_clip(rect)
+        for by in range(wy - wy % bh, wy + rect.height, bh):
+            for bx in range(wx - wx % bw, wx + rect.width, bw):
+                surface.blit(background, (bx - origin[0], by - origin[1]))
+        surface.set_clip(None)
+
+    def _build_chunk(self, chunk: Tuple[int, int], asset_dict: dict,
+                     background: Optional[pygame.Surface]) -> pygame.Surface:
+        r0, c0 = chunk[0] * CHUNK_TILES, chunk[1] * CHUNK_TILES
+        rows = min(CHUNK_TILES, self.height - r0)
+        cols = min(CHUNK_TILES, self.width - c0)
+        size = (cols * TILE_SIZE, rows * TILE_SIZE)
+        surface = pygame.Surface(size) if background is not None else pygame.Surface(size, pygame.SRCALPHA)
+        self._paint_background(surface, surface.get_rect(), (c0 * TILE_SIZE, r0 * TILE_SIZE), background)
+
+        blank_code = TILE_CODES[BLANK]
+        grid, stride = self._grid, self._stride
+        for r in range(rows):
+            base = (r0 + r + 1) * stride + c0 + 1
+            for c in range(cols):
+                code = grid[base + c]
+                if code != blank_code:
+                    img = asset_dict.get(_CODE_TO_TILE[code])
+                    if img is not None:
+                        surface.blit(img, (c * TILE_SIZE, r * TILE_SIZE))
+        return surface
+
+    def _chunk_range(self, rect: pygame.Rect, margin: int) -> Tuple[range, range]:
+        rows = range(max(0, rect.top // _CHUNK_PX - margin),
+                     min((self.height - 1) // CHUNK_TILES, (rect.bottom - 1) // _CHUNK_PX + margin) + 1)
+        cols = range(max(0, rect.left // _CHUNK_PX - margin),
+                      min((self.width - 1) // CHUNK_TILES, (rect.right - 1) // _CHUNK_PX + margin) + 1)
+        return rows, cols
+
+    def update_layer(self, asset_dict: dict, background: Optional[pygame.Surface] = None,
+                     view: Optional[pygame.Rect] = None):
+        # Build chunks near the view (world pixels, default the whole level), drop the ones
+        # that fell out of range, and patch tiles changed since the last call
+        if view is None:
+            view = self.pixel_rect
+        rows, cols = self._chunk_range(view, CHUNK_MARGIN)
+        for chunk in [chunk for chunk in self._chunks
+                      if not (rows.start - 1 <= chunk[0] < rows.stop + 1 and
+                              cols.start - 1 <= chunk[1] < cols.stop + 1)]:
+            del self._chunks[chunk]
+
+        for cr in rows:
+            for cc in cols:
+                if (cr, cc) not in self._chunks:
+                    surface = self._build_chunk((cr, cc), asset_dict, background)
+                    self._chunks[(cr, cc)] = surface
+                    self._dirty_rects.append(surface.get_rect(topleft=(cc * _CHUNK_PX, cr * _CHUNK_PX)))
+
+        for r, c in self._dirty_tiles:
+            surface = self._chunks.get((r // CHUNK_TILES, c // CHUNK_TILES))
+            # Tiles in chunks that are not resident are drawn when the chunk is built
+            if surface is None:
+                continue
+            local = pygame.Rect((c % CHUNK_TILES) * TILE_SIZE, (r % CHUNK_TILES) * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            self._paint_background(surface, local, (c // CHUNK_TILES * _CHUNK_PX, r // CHUNK_TILES * _CHUNK_PX),
+                                   background)
+            tile = self.get_tile(r, c)
+            if tile != BLANK and tile in asset_dict:
+                surface.blit(asset_dict[tile], local)
+            self._dirty_rects.append(pygame.Rect(c * TILE_SIZE, r * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        self._dirty_tiles.clear()
+
+    def blit_region(self, screen: pygame.Surface, rect: pygame.Rect, origin: Tuple[int, int] = (0, 0)):
+        # Copy a world-pixel rect of the layer onto screen, shifted by -origin
+        rect = rect.clip(self.pixel_rect)
+        if not rect.width or not rect.height:
+            return
+        rows, cols = self._chunk_range(rect, 0)
+        for cr in rows:
+            for cc in cols:
+                surface = self._chunks.get((cr, cc))
+                if surface is None:
+                    continue
+                x, y = cc * _CHUNK_PX, cr * _CHUNK_PX
+                area = rect.clip(surface.get_rect(topleft=(x, y)))
+                screen.blit(surface, (area.x - origin[0], area.y - origin[1]), area.move(-x, -y))
+
+    def take_dirty_rects(self) -> List[pygame.Rect]:
+        # World areas whose layer pixels changed since the last call
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        return rects
+
+    def draw(self, screen: pygame.Surface, asset_dict: dict, background: Optional[pygame.Surface] = None,
+             view: Optional[pygame.Rect] = None):
+        if view is None:
+            view = self.pixel_rect
+        self.update_layer(asset_dict, background, view)
+        self.blit_region(screen, view, view.topleft)
 
     @staticmethod
     def get_grid_pos(x: float, y: float) -> Tuple[int, int]:
         col = int(x // TILE_SIZE)
         row = int((y - 1) // TILE_SIZE)
-        return row, col
\ No newline at end of file
+        return row, col
@@ -4,7 +4,7 @@ from typing import Optional
 from game.entities.entity import Entity
 from game.config import *
 from game.entities.map import GameMap
-from game.utils import load_image_asset
+from game.systems.asset_cache import asset_cache
 from game.enums import Direction, DIR_OFFSETS
 
 class Player(Entity):
@@ -12,10 +12,8 @@ class Player(Entity):
         super().__init__(x, y)
 
         sprite_path = os.path.join(ASSETS_DIR, 'sprite.png')
-        original_img = load_image_asset(sprite_path, scale=(TILE_SIZE, TILE_SIZE))
-
-        self.image_right = original_img
-        self.image_left = pygame.transform.flip(original_img, True, False)
+        self.image_right = asset_cache.get(sprite_path, scale=(TILE_SIZE, TILE_SIZE))
+        self.image_left = asset_cache.get(sprite_path, scale=(TILE_SIZE, TILE_SIZE), flip=True)
 
         self.image = self.image_right
         self.facing_right = True
@@ -50,6 +48,7 @@ class Player(Entity):
         self.is_animating = False
         self.is_jumping = False
         self.jump_peak_time = None
+        self.save_position()
 
     def _is_aligned_y(self) -> bool:
         return abs(self.y % TILE_SIZE) < 0.1
@@ -132,8 +131,9 @@ class Player(Entity):
             self.target_y = self.y + dr * TILE_SIZE
             self.is_animating = True
 
-    def update(self, dt: float, map_obj: GameMap):
-        current_time = pygame.time.get_ticks()
+    def update(self, dt: float, map_obj: GameMap, keys=None, current_time: Optional[float] = None):
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
 
         if self.is_animating:
             if self.x < self.target_x:
@@ -155,7 +155,8 @@ class Player(Entity):
         elif self.jump_peak_time is not None:
             if current_time - self.jump_peak_time > JUMP_HANG_TIME:
                 self.jump_peak_time = None
-            keys = pygame.key.get_pressed()
+            if keys is None:
+                keys = pygame.key.get_pressed()
             if keys[pygame.K_w]:
                 row, col = self.row, self.col
                 if map_obj.get_tile(row - 1, col) == LADDER:
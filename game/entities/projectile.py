@@ -3,6 +3,7 @@ import math
 from game.config import *
 from game.entities.entity import Entity
 from game.entities.map import GameMap
+from game.systems.spatial import SpatialHash
 
 
 class Explosion(Entity):
@@ -12,20 +13,23 @@ class Explosion(Entity):
         self.rect = self.image.get_rect(center=(int(x), int(y)))
         self._x = self.rect.x
         self._y = self.rect.y
-        self.frame_index = 0
-        self.is_finished = False
-
-    def update(self, dt: float, map_obj, enemies: list):
-        step = dt if dt > 0 else 16.6
-        self.frame_index += step
-
-        if self.frame_index > EXPLOSION_DURATION:
-            self.is_finished = True
-            return
+        self.save_position()
+        self.serial = 0
+        self.victims = []
 
+    def update(self, dt: float, map_obj, enemies: list, index: SpatialHash = None):
+        # Lives for EXPLOSION_DURATION; the simulation schedules its removal
         kill_radius_px = EXPLOSION_RADIUS_TILES * TILE_SIZE
         cx, cy = self.rect.center
 
+        if index is not None:
+            # The caller drops victims from its enemy list in one pass
+            for enemy in index.query_radius(cx, cy, kill_radius_px):
+                index.remove(enemy)
+                self.victims.append(enemy)
+                print("Enemy destroyed by explosion!")
+            return
+
         for enemy in enemies[:]:
             ex = enemy.x + TILE_SIZE / 2
             ey = enemy.y + TILE_SIZE / 2
@@ -36,9 +40,6 @@ class Explosion(Entity):
                     enemies.remove(enemy)
                     print("Enemy destroyed by explosion!")
 
-    def draw(self, screen: pygame.Surface):
-        screen.blit(self.image, self.rect)
-
 
 class Fireball(Entity):
     def __init__(self, x: float, y: float, direction: int, image: pygame.Surface, explosion_img: pygame.Surface):
@@ -56,13 +57,13 @@ class Fireball(Entity):
         self.should_explode = False
         self.explosion_instance = None
 
-    def update(self, dt: float, map_obj: GameMap, enemies: list):
+    def update(self, dt: float, map_obj: GameMap, enemies: list, index: SpatialHash = None):
         self.x += FIREBALL_SPEED * self.direction
 
         self.rect.x = int(self.x)
         self.rect.y = int(self.y)
 
-        if self.x < 0 or self.x > SCREEN_WIDTH:
+        if self.x < 0 or self.x > map_obj.width * TILE_SIZE:
             self.should_explode = True
 
         cx = self.x + self.rect.width / 2
@@ -72,15 +73,16 @@ class Fireball(Entity):
         if tile == GROUND:
             self.should_explode = True
 
-        for enemy in enemies:
-            if self.rect.colliderect(enemy.rect):
+        if index is not None:
+            if index.query_rect(self.rect):
                 self.should_explode = True
-                break
+        else:
+            for enemy in enemies:
+                if self.rect.colliderect(enemy.rect):
+                    self.should_explode = True
+                    break
 
         if self.should_explode:
             center_x = self.x + self.rect.width / 2
             center_y = self.y + self.rect.height / 2
-            self.explosion_instance = Explosion(center_x, center_y, self.explosion_img)
-
-    def draw(self, screen: pygame.Surface):
-        screen.blit(self.image, self.rect)
\ No newline at end of file
+            self.explosion_instance = Explosion(center_x, center_y, self.explosion_img)
\ No newline at end of file
@@ -1,2 +1,3 @@
 from .score_system import ScoreManager
-from .save_system import SaveManager
\ No newline at end of file
+from .save_system import SaveManager
+from .pathfinding import FlowField, HierarchicalPathfinder
\ No newline at end of file
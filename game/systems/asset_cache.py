@@ -0,0 +1,281 @@
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+import pygame
+from game.config import GAME_DIR, ATLAS_PAGE_SIZE, ATLAS_MAX_SPRITE, SPRITE_PACK_FILE
+from game.utils import load_image_asset, atomic_write
+
+Key = Tuple[str, Optional[Tuple[int, int]], bool, bool, Optional[tuple]]
+
+# Sprite pack: header, JSON index, then raw RGBA surfaces (atlas pages and large
+# standalone images) at 16-byte aligned offsets
+_PACK_MAGIC = b"LRSP"
+_PACK_VERSION = 1
+_PACK_HEADER = struct.Struct('<4sII')
+
+
+def _file_hash(path: str) -> str:
+    # Only needed when a source's stat changed, so keep hashlib off the startup path
+    import hashlib
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _source_stamp(path: str) -> Optional[list]:
+    # (size, mtime, content hash); the hash decides, the stat only skips rehashing
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, _file_hash(path)]
+
+
+def _encode_key(key: Key) -> list:
+    path, scale, flip, crop, colorkey = key
+    return [os.path.relpath(path, GAME_DIR), scale, flip, crop, colorkey]
+
+
+def _decode_key(data: list) -> Key:
+    rel, scale, flip, crop, colorkey = data
+    return (os.path.normpath(os.path.join(GAME_DIR, rel)), tuple(scale) if scale else None, flip, crop,
+            tuple(colorkey) if colorkey else None)
+
+
+class _AtlasPage:
+    # Shelf packer: sprites fill rows left to right, a new row starts under the tallest one
+    PADDING = 1
+
+    def __init__(self, size: int):
+        self.size = size
+        self.surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        # Headless runs (no display mode set) keep the generic format
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self._x = 0
+        self._y = 0
+        self._row_height = 0
+
+    def place(self, width: int, height: int) -> Optional[pygame.Rect]:
+        pad = self.PADDING
+        if self._x + width > self.size:
+            self._x = 0
+            self._y += self._row_height + pad
+            self._row_height = 0
+        if self._x + width > self.size or self._y + height > self.size:
+            return None
+        rect = pygame.Rect(self._x, self._y, width, height)
+        self._x += width + pad
+        self._row_height = max(self._row_height, height)
+        return rect
+
+
+class AssetCache:
+    # Process-wide image cache. Each (path, scale, flip, crop, colorkey) is decoded once;
+    # small sprites are copied into shared atlas pages and handed out as subsurfaces,
+    # so spawning entities or reloading a level never touches the disk.
+
+    def __init__(self, page_size: int = ATLAS_PAGE_SIZE, max_sprite: int = ATLAS_MAX_SPRITE):
+        self.page_size = page_size
+        self.max_sprite = max_sprite
+        self.pages: List[_AtlasPage] = []
+        self._sprites: Dict[Key, pygame.Surface] = {}
+        self._sources: Dict[Tuple[str, bool], pygame.Surface] = {}
+        self.loads = 0
+        # Baked sprites are checked on first use; the mapping must outlive their surfaces
+        self.pack_path: Optional[str] = SPRITE_PACK_FILE
+        self.pack_loaded = False
+        self._pack_checked = False
+        self._mapping: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def _source(self, path: str, crop: bool) -> pygame.Surface:
+        # crop=True goes through load_image_asset (corner colorkey + bounding-box crop),
+        # crop=False is the file as-is
+        key = (path, crop)
+        image = self._sources.get(key)
+        if image is None:
+            self.loads += 1
+            if crop:
+                image = load_image_asset(path)
+            elif not os.path.exists(path):
+                print(f"Error: Image {path} not found!")
+                image = pygame.Surface((24, 24))
+                image.fill((128, 0, 128))
+            else:
+                image = pygame.image.load(path)
+                if pygame.display.get_surface() is not None:
+                    image = image.convert_alpha()
+            self._sources[key] = image
+        return image
+
+    def _pack(self, image: pygame.Surface) -> pygame.Surface:
+        width, height = image.get_size()
+        if width > self.max_sprite or height > self.max_sprite:
+            return image
+
+        for page in self.pages:
+            rect = page.place(width, height)
+            if rect is not None:
+                break
+        else:
+            page = _AtlasPage(self.page_size)
+            self.pages.append(page)
+            rect = page.place(width, height)
+
+        # Page pixels start fully transparent, so an additive blit copies per-pixel alpha
+        # exactly; opaque and colorkeyed images use a normal blit, which writes alpha 255
+        if image.get_flags() & pygame.SRCALPHA and image.get_colorkey() is None:
+            page.surface.blit(image, rect, special_flags=pygame.BLEND_RGBA_ADD)
+        else:
+            page.surface.blit(image, rect)
+        return page.surface.subsurface(rect)
+
+    def get(self, path: str, scale: Optional[Tuple[int, int]] = None, flip: bool = False,
+            crop: bool = True, colorkey: Optional[tuple] = None) -> pygame.Surface:
+        if not self._pack_checked:
+            self._pack_checked = True
+            if self.pack_path:
+                self.load_pack(self.pack_path)
+
+        key = (os.path.normpath(path), tuple(scale) if scale else None, flip, crop,
+               tuple(colorkey) if colorkey else None)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        image = self._source(path, crop)
+        if scale:
+            image = pygame.transform.scale(image, scale)
+        if flip:
+            image = pygame.transform.flip(image, True, False)
+        if colorkey:
+            image = image.copy()
+            image.set_colorkey(colorkey)
+
+        sprite = self._pack(image)
+        self._sprites[key] = sprite
+        return sprite
+
+    def load_pack(self, path: str) -> bool:
+        # Map a baked pack and serve its sprites without decoding anything. The whole pack
+        # is ignored if any source image changed since it was baked.
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, version, index_len = _PACK_HEADER.unpack_from(mapping, 0)
+            if magic != _PACK_MAGIC or version != _PACK_VERSION:
+                print(f"Sprite pack {path} has an unknown format, ignoring it")
+                return False
+            index = json.loads(bytes(mapping[_PACK_HEADER.size:_PACK_HEADER.size + index_len]))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Error reading sprite pack {path}: {e}")
+            return False
+
+        for rel, (size, mtime_ns, digest) in index["sources"].items():
+            source = os.path.join(GAME_DIR, rel)
+            try:
+                st = os.stat(source)
+            except OSError:
+                print(f"Sprite pack is stale ({rel} is missing)")
+                return False
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns) and _file_hash(source) != digest:
+                print(f"Sprite pack is stale ({rel} changed)")
+                return False
+
+        has_display = pygame.display.get_surface() is not None
+        view = memoryview(mapping)
+        surfaces = []
+        for offset, width, height in index["surfaces"]:
+            surf = pygame.image.frombuffer(view[offset:offset + width * height * 4], (width, height), "RGBA")
+            # Converting copies into the display format; headless runs use the mapping as-is
+            surfaces.append(surf.convert_alpha() if has_display else surf)
+
+        for key, surface_idx, rect in index["sprites"]:
+            self._sprites[_decode_key(key)] = surfaces[surface_idx].subsurface(rect)
+
+        self._mapping = mapping
+        self.pack_loaded = True
+        return True
+
+    def bake(self, path: str) -> int:
+        # Write every sprite cached so far (atlas pages and standalone images) as raw RGBA
+        surfaces, parent_idx, sprites = [], {}, []
+        for key, sprite in self._sprites.items():
+            parent = sprite.get_parent() or sprite
+            if id(parent) not in parent_idx:
+                parent_idx[id(parent)] = len(surfaces)
+                surfaces.append(parent)
+            x, y = sprite.get_abs_offset()
+            sprites.append([_encode_key(key), parent_idx[id(parent)], [x, y, *sprite.get_size()]])
+
+        sources = {}
+        for path_, *_ in self._sprites:
+            stamp = _source_stamp(path_)
+            if stamp is not None:
+                sources[os.path.relpath(path_, GAME_DIR)] = stamp
+
+        blobs = [pygame.image.tobytes(surf, "RGBA") for surf in surfaces]
+        entries = []
+        index = b""
+        # Offsets depend on the index length, so settle the index size first
+        for _ in range(2):
+            offset = _PACK_HEADER.size + len(index)
+            entries = []
+            for surf, blob in zip(surfaces, blobs):
+                offset = (offset + 15) & ~15
+                entries.append([offset, *surf.get_size()])
+                offset += len(blob)
+            index = json.dumps({"sources": sources, "surfaces": entries, "sprites": sprites}).encode("utf-8")
+            index += b" " * (-len(index) % 16)
+
+        out = bytearray(_PACK_HEADER.pack(_PACK_MAGIC, _PACK_VERSION, len(index)))
+        out += index
+        for (offset, _, _), blob in zip(entries, blobs):
+            out += bytes(offset - len(out))
+            out += blob
+        atomic_write(path, bytes(out), mode="wb")
+        return len(sprites)
+
+    def clear(self):
+        self.pages.clear()
+        self._sprites.clear()
+        self._sources.clear()
+        self._mapping = None
+        self.pack_loaded = False
+        self._pack_checked = False
+
+
+asset_cache = AssetCache()
+
+
+def main(argv=None):
+    # Offline bake: start the game headless so every startup sprite is requested once
+    import argparse
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    parser = argparse.ArgumentParser(description="Bake processed sprites into a raw pixel pack")
+    parser.add_argument("--output", default=SPRITE_PACK_FILE)
+    args = parser.parse_args(argv)
+
+    from game.core.app import GameApp
+    # Under -m this module is __main__, so use the instance the game imports
+    from game.systems.asset_cache import asset_cache as cache
+
+    cache.pack_path = None
+    started = time.perf_counter()
+    GameApp()
+    count = cache.bake(args.output)
+    print(f"Baked {count} sprites from {cache.loads} images into {args.output} "
+          f"({os.path.getsize(args.output) // 1024} KiB, {time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
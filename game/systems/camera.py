@@ -0,0 +1,58 @@
+from typing import Tuple
+import pygame
+
+
+class Camera:
+    # World-space viewport over the play area. It scrolls only once the target leaves a
+    # dead zone around the view centre and never shows past the level edges, so levels
+    # no bigger than the screen keep the view fixed at (0, 0).
+
+    def __init__(self, width: int, height: int, deadzone: Tuple[int, int] = (0, 0)):
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.deadzone = deadzone
+        self._world = pygame.Rect(0, 0, width, height)
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        return self.rect.topleft
+
+    def set_world(self, width: int, height: int):
+        self._world.size = (width, height)
+        self._clamp()
+
+    def _clamp(self):
+        world = self._world
+        self.rect.x = max(0, min(self.rect.x, world.width - self.rect.width))
+        self.rect.y = max(0, min(self.rect.y, world.height - self.rect.height))
+
+    def center_on(self, x: float, y: float):
+        self.rect.center = (int(x), int(y))
+        self._clamp()
+
+    def follow(self, x: float, y: float) -> bool:
+        # Returns whether the view moved, in which case the whole play area is stale
+        old = self.rect.topleft
+        cx, cy = self.rect.center
+        dx, dy = self.deadzone
+        if x < cx - dx:
+            self.rect.x += int(x - (cx - dx))
+        elif x > cx + dx:
+            self.rect.x += int(x - (cx + dx))
+        if y < cy - dy:
+            self.rect.y += int(y - (cy - dy))
+        elif y > cy + dy:
+            self.rect.y += int(y - (cy + dy))
+        self._clamp()
+        return self.rect.topleft != old
+
+    def scroll(self, dx: int, dy: int) -> bool:
+        old = self.rect.topleft
+        self.rect.move_ip(dx, dy)
+        self._clamp()
+        return self.rect.topleft != old
+
+    def to_world(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        return pos[0] + self.rect.x, pos[1] + self.rect.y
+
+    def to_screen(self, rect: pygame.Rect) -> pygame.Rect:
+        return rect.move(-self.rect.x, -self.rect.y)
@@ -0,0 +1,250 @@
+import json
+import os
+import random
+import statistics
+import sys
+from collections import deque
+from multiprocessing import Pool
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple, Union
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game.config import *
+from game.core.simulation import Simulation, default_player_start
+from game.entities import GameMap
+from game.systems.pathfinding import Cell, FlowField, get_player_moves
+from game.systems.replay import encode_keys, GAME_KEYS
+
+# Monte-Carlo level evaluation: static reachability plus headless bot playthroughs,
+# spread over a process pool so thousands of candidate levels can be filtered.
+
+_TICKS_PER_TILE = TILE_SIZE / ANIMATION_SPEED
+_KEY_MASKS = {key: encode_keys({k: k == key for k in GAME_KEYS}) for key in GAME_KEYS}
+
+
+def _start_cell(level: Dict[str, Any]) -> Cell:
+    # Same cell Simulation puts the player on, so analysis and playthroughs agree
+    start = level.get("player_start") or default_player_start(len(level.get("layout", [])))
+    return start['r'], start['c']
+
+
+def dig_moves(game_map: GameMap, r: int, c: int) -> List[Tuple[Cell, Cell]]:
+    # (destination, cell to dig) for holes the player can open and then drop or walk into.
+    # Simulation._apply_dig takes any ground next to the player; only holes below and to
+    # the sides lead anywhere, and a hole lasts HOLE_DURATION, long enough to pass one cell.
+    if game_map.get_tile(r + 1, c) not in (GROUND, LADDER) and game_map.get_tile(r, c) != LADDER:
+        return []
+    moves = []
+    for dr, dc in ((1, 0), (0, -1), (0, 1), (1, -1), (1, 1)):
+        hole = (r + dr, c + dc)
+        if not (0 <= hole[0] < game_map.height and 0 <= hole[1] < game_map.width):
+            continue
+        if game_map.get_tile(*hole) != GROUND:
+            continue
+        # A hole diagonally below is entered by stepping onto the open cell beside it
+        if dr and dc and game_map.get_tile(r, hole[1]) == GROUND:
+            continue
+        moves.append((hole, hole))
+    return moves
+
+
+def player_actions(game_map: GameMap, r: int, c: int) -> List[Tuple[Cell, Union[int, Cell, None]]]:
+    # get_player_moves plus digging; a dig's action is the cell to dig instead of a key
+    return get_player_moves(game_map, r, c) + dig_moves(game_map, r, c)
+
+
+def reachable_cells(game_map: GameMap, start: Cell) -> Dict[Cell, int]:
+    # Cells the player can rest in or pass through, digging included, with their move count
+    dist = {start: 0}
+    q = deque([start])
+    while q:
+        cell = q.popleft()
+        for nxt, _ in player_actions(game_map, *cell):
+            if nxt not in dist:
+                dist[nxt] = dist[cell] + 1
+                q.append(nxt)
+    return dist
+
+
+def _tour_length(game_map: GameMap, start: Cell, coins: Set[Cell]) -> Optional[int]:
+    # Greedy nearest-coin tour; a cheap upper bound on the moves a perfect run needs
+    remaining = set(coins)
+    pos, total = start, 0
+    while remaining:
+        dist = reachable_cells(game_map, pos)
+        reachable = [c for c in remaining if c in dist]
+        if not reachable:
+            return None
+        pos = min(reachable, key=dist.get)
+        total += dist[pos]
+        remaining.discard(pos)
+    return total
+
+
+def analyze_level(level: Dict[str, Any]) -> Dict[str, Any]:
+    game_map = GameMap(level.get("layout", []))
+    start = _start_cell(level)
+    coins = set(game_map.find_tiles(COIN))
+    dist = reachable_cells(game_map, start)
+    reachable_coins = coins & dist.keys()
+
+    # Enemies follow the directed nav graph, so measure their path length to the start
+    field = FlowField()
+    field.update(game_map, start)
+    enemy_dists = [field.distance((e['r'], e['c'])) for e in level.get("enemies", [])]
+    enemy_dists = [d for d in enemy_dists if d is not None]
+
+    tour = _tour_length(game_map, start, coins) if len(reachable_coins) == len(coins) else None
+    return {
+        "coins": len(coins),
+        "reachable_coins": len(reachable_coins),
+        "reachable_cells": len(dist),
+        "start_trapped": len(player_actions(game_map, *start)) == 0 or
+                         any(d <= EVAL_SAFE_DISTANCE for d in enemy_dists),
+        "nearest_enemy": min(enemy_dists) if enemy_dists else None,
+        "solvable": len(coins) > 0 and len(reachable_coins) == len(coins),
+        # Greedy tour, so an upper bound on a perfect run, not a minimum
+        "tour_time_ms": int(tour * _TICKS_PER_TILE * FIXED_DT) if tour is not None else None,
+    }
+
+
+class GreedyBot:
+    # Walks the shortest player path to the nearest coin, avoiding cells next to enemies
+    # when it can; `noise` is the chance of a random move, which makes runs differ.
+
+    def __init__(self, rng: random.Random, noise: float):
+        self.rng = rng
+        self.noise = noise
+        self.mask = 0
+
+    def _is_idle(self, player) -> bool:
+        return (not player.is_animating and player.jump_peak_time is None
+                and player.x % TILE_SIZE == 0 and player.y % TILE_SIZE == 0)
+
+    def _path_key(self, game_map: GameMap, start: Cell, blocked: Set[Cell]) -> Union[int, Cell, None]:
+        # First action towards the nearest coin: a key, or a cell to dig
+        first_key = {start: None}
+        q = deque([start])
+        while q:
+            cell = q.popleft()
+            if cell != start and game_map.get_tile(*cell) == COIN:
+                return first_key[cell]
+            for nxt, key in player_actions(game_map, *cell):
+                if nxt not in first_key and nxt not in blocked:
+                    first_key[nxt] = key if cell == start else first_key[cell]
+                    q.append(nxt)
+        return None
+
+    def choose(self, sim) -> int:
+        player = sim.player
+        if not self._is_idle(player):
+            return self.mask
+
+        cell = (player.row, player.col)
+        moves = get_player_moves(sim.map, *cell)
+        if moves and self.rng.random() < self.noise:
+            key = self.rng.choice(moves)[1]
+        else:
+            danger = set()
+            sim.sync_entities()
+            for enemy in sim.enemies:
+                er, ec = enemy._get_grid_pos()
+                danger.update(((er, ec), (er - 1, ec), (er + 1, ec), (er, ec - 1), (er, ec + 1)))
+            danger.discard(cell)
+            key = self._path_key(sim.map, cell, danger)
+            if key is None and danger:
+                key = self._path_key(sim.map, cell, set())
+            if isinstance(key, tuple):
+                # Dig now; once the hole is open the next plan walks or falls into it
+                sim.dig(*key)
+                key = None
+
+        self.mask = _KEY_MASKS.get(key, 0)
+        return self.mask
+
+
+def play_level(level: Dict[str, Any], seed: int, noise: float = EVAL_BOT_NOISE,
+               max_ticks: int = EVAL_MAX_TICKS) -> Dict[str, Any]:
+    row, col = _start_cell(level)
+    sim = Simulation(level.get("layout", []), {'r': row, 'c': col},
+                     level.get("enemies", []), level.get("fireballs", 5))
+    bot = GreedyBot(random.Random(seed), noise)
+    while sim.is_running and sim.tick_count < max_ticks:
+        sim.set_input(bot.choose(sim))
+        sim.step()
+
+    total = sim.map.total_coins
+    return {
+        "won": sim.game_finished,
+        "caught": sim.game_over,
+        "ticks": sim.tick_count,
+        "time_ms": sim.win_time if sim.game_finished else None,
+        "progress": sim.player.coins / total if total else 1.0,
+    }
+
+
+def evaluate_level(level: Dict[str, Any], runs: int = EVAL_RUNS, seed: int = 0,
+                   max_ticks: int = EVAL_MAX_TICKS) -> Dict[str, Any]:
+    result = analyze_level(level)
+    result["name"] = level.get("name")
+    result["runs"] = runs
+
+    # Unsolvable levels skip the expensive part
+    plays = [play_level(level, seed + i, max_ticks=max_ticks) for i in range(runs)] if result["solvable"] else []
+    wins = [p for p in plays if p["won"]]
+    result["wins"] = len(wins)
+    result["win_rate"] = len(wins) / runs if runs and plays else 0.0
+    result["caught_rate"] = sum(p["caught"] for p in plays) / runs if runs and plays else 0.0
+
+    # 0 = every bot run cleared it, 1 = no bot picked up anything
+    score = [1.0 if p["won"] else 0.9 * p["progress"] for p in plays]
+    result["difficulty"] = round(1.0 - statistics.mean(score), 3) if score else 1.0
+    result["est_time_ms"] = int(statistics.median(p["time_ms"] for p in wins)) if wins else None
+    return result
+
+
+def _evaluate_job(job):
+    index, level, runs, seed, max_ticks = job
+    result = evaluate_level(level, runs, seed, max_ticks)
+    result["index"] = index
+    return result
+
+
+def evaluate_levels(levels: Iterable[Dict[str, Any]], runs: int = EVAL_RUNS, seed: int = 0,
+                    max_ticks: int = EVAL_MAX_TICKS, processes: Optional[int] = None) -> List[Dict[str, Any]]:
+    # Results come back in input order; processes=1 runs inline, which is easier to debug
+    jobs = [(i, level, runs, seed + i * runs, max_ticks) for i, level in enumerate(levels)]
+    if processes == 1 or len(jobs) <= 1:
+        return [_evaluate_job(job) for job in jobs]
+
+    workers = processes or os.cpu_count() or 1
+    with Pool(workers) as pool:
+        return pool.map(_evaluate_job, jobs, chunksize=max(1, len(jobs) // (4 * workers)))
+
+
+def main(argv=None):
+    import argparse
+    from game.core.level_manager import LevelManager
+
+    parser = argparse.ArgumentParser(description="Evaluate levels with reachability checks and bot playthroughs")
+    parser.add_argument("path", nargs="?", help="JSON file with a list of levels (default: the level pack)")
+    parser.add_argument("--runs", type=int, default=EVAL_RUNS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=EVAL_MAX_TICKS)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.path:
+        with open(args.path, "r", encoding="utf-8") as f:
+            levels = json.load(f)
+    else:
+        pack = LevelManager().pack
+        levels = [pack.get(i) for i in range(len(pack))]
+
+    for result in evaluate_levels(levels, args.runs, args.seed, args.max_ticks, args.processes):
+        sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import os
+import random
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from game.config import *
+
+# Bulk level generation on flat byte grids. Carving is done with slice assignment
+# (extended slices for ladders), and reachability is a bit-parallel flood fill:
+# the whole grid is one Python int, and each move rule is a shift plus mask.
+
+# Horizontal runs open ground but keep ladders/coins; vertical runs turn floor or air into ladder
+_CARVE_FLOOR = bytes.maketrans(GROUND.encode('ascii'), BLANK.encode('ascii'))
+_CARVE_LADDER = bytes.maketrans((GROUND + BLANK).encode('ascii'), (LADDER * 2).encode('ascii'))
+
+_BIT_TABLES = {}
+
+
+def _bit_table(tiles: Tuple[str, ...]) -> dict:
+    table = _BIT_TABLES.get(tiles)
+    if table is None:
+        table = {i: '0' for i in range(128)}
+        table.update({ord(t): '1' for t in tiles})
+        _BIT_TABLES[tiles] = table
+    return table
+
+
+class BitGrid:
+    # A layout as bit masks, one bit per cell, row-major with a spare GROUND column
+    # per row so shifting by one never carries a bit into the next row.
+
+    def __init__(self, layout: List[str]):
+        self.height = len(layout)
+        self.width = max((len(row) for row in layout), default=0)
+        self.stride = self.width + 1
+        self.text = "".join(row.ljust(self.width, BLANK) + GROUND for row in layout)
+        self.all = (1 << (self.stride * self.height)) - 1
+        self.last_row = ((1 << self.stride) - 1) << (self.stride * (self.height - 1)) if self.height else 0
+
+    def mask(self, *tiles: str) -> int:
+        # int(text, 2) is linear for base 2, so this stays in C
+        bits = self.text.translate(_bit_table(tiles))[::-1]
+        return int(bits, 2) if bits else 0
+
+    def bit(self, row: int, col: int) -> int:
+        return 1 << (row * self.stride + col)
+
+    def cells(self, mask: int) -> List[Tuple[int, int]]:
+        bits = bin(mask)[:1:-1]
+        out = []
+        i = bits.find('1')
+        while i != -1:
+            out.append(divmod(i, self.stride))
+            i = bits.find('1', i + 1)
+        return out
+
+    def reach(self, start: Tuple[int, int]) -> int:
+        # Same rules as pathfinding.get_player_moves, applied to every frontier cell at once
+        s = self.stride
+        ground = self.mask(GROUND)
+        ladder = self.mask(LADDER)
+        passable = ~ground & self.all
+
+        below_solid = ((ground | ladder) >> s) | self.last_row
+        support = below_solid & passable
+        stand = support | ladder
+        can_climb = ladder | (support & (ladder >> s))
+        above_open = (passable << s) & self.all
+        jump = support & above_open
+        ladder_jump = jump & ~can_climb
+
+        reached = self.bit(*start) & passable
+        frontier = reached
+        while frontier:
+            standing = frontier & stand
+            climbing = frontier & can_climb
+            lifted = (frontier & jump) >> s
+            moves = (((frontier & ~stand) << s)
+                     | (climbing << s) | (climbing >> s)
+                     | (standing << 1) | (standing >> 1)
+                     | (lifted << 1) | (lifted >> 1)) & passable
+            moves |= ((frontier & ladder_jump) >> (2 * s)) & ladder
+            frontier = moves & ~reached
+            reached |= frontier
+        return reached
+
+
+class LevelGenerator:
+    # Seeded random-walk generator (the editor's algorithm, carved in bulk), keeping only
+    # levels where every coin is reachable from the start.
+
+    def __init__(self, seed: Optional[int] = None, width: int = MAP_WIDTH, height: int = MAP_HEIGHT,
+                 segments: int = 100, enemies: int = 4, fireballs: int = 5,
+                 min_coins: int = 3, max_coins: int = 12):
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+        self.rng = random.Random(self.seed)
+        self.width = width
+        self.height = height
+        self.segments = segments
+        self.enemies = enemies
+        self.fireballs = fireballs
+        self.min_coins = min_coins
+        self.max_coins = max_coins
+        self.attempts = 0
+
+    def _carve(self) -> Tuple[bytearray, Tuple[int, int]]:
+        rng = self.rng
+        rows, cols = self.height, self.width
+        grid = bytearray(GROUND.encode('ascii')) * (rows * cols)
+
+        start_r = rng.randint(2, rows - 3)
+        start_c = rng.randint(2, cols - 3)
+        r, c = start_r, start_c
+        visited = [(r, c, r, c)]
+
+        for _ in range(self.segments):
+            if rng.random() < 0.7:
+                length = rng.randint(3, 8)
+                end = min(max(c + rng.choice((-1, 1)) * length, 1), cols - 2)
+                lo, hi = min(c, end), max(c, end)
+                i = r * cols
+                grid[i + lo:i + hi + 1] = grid[i + lo:i + hi + 1].translate(_CARVE_FLOOR)
+                visited.append((r, lo, r, hi))
+                c = end
+            else:
+                length = rng.randint(2, 5)
+                end = min(max(r + rng.choice((-1, 1)) * length, 1), rows - 2)
+                lo, hi = min(r, end), max(r, end)
+                sl = slice(lo * cols + c, hi * cols + c + 1, cols)
+                grid[sl] = grid[sl].translate(_CARVE_LADDER)
+                visited.append((lo, c, hi, c))
+                r = end
+
+            # Branching
+            if rng.random() < 0.3 or c <= 1 or c >= cols - 2:
+                r0, c0, r1, c1 = rng.choice(visited)
+                r, c = rng.randint(r0, r1), rng.randint(c0, c1)
+
+        grid[start_r * cols + start_c] = ord(START)
+        return grid, (start_r, start_c)
+
+    def generate(self) -> Optional[Dict[str, Any]]:
+        # One attempt; None when the carved level cannot hold enough reachable coins
+        self.attempts += 1
+        rng = self.rng
+        grid, start = self._carve()
+        cols = self.width
+        layout = [grid[r * cols:(r + 1) * cols].decode('ascii') for r in range(self.height)]
+
+        bits = BitGrid(layout)
+        reached = bits.reach(start)
+        floor = reached & bits.mask(BLANK) & ((bits.mask(GROUND, LADDER) >> bits.stride) | bits.last_row)
+        spots = [(r, c) for r, c in bits.cells(floor) if abs(r - start[0]) + abs(c - start[1]) > 1]
+        if len(spots) < self.min_coins + self.enemies:
+            return None
+
+        coin_count = min(self.max_coins, max(self.min_coins, len(spots) // 12))
+        chosen = rng.sample(spots, coin_count)
+        for r, c in chosen:
+            grid[r * cols + c] = ord(COIN)
+
+        taken = set(chosen)
+        far = [(r, c) for r, c in spots
+               if (r, c) not in taken and abs(r - start[0]) + abs(c - start[1]) > 6]
+        enemies = rng.sample(far, min(self.enemies, len(far)))
+
+        return {
+            "name": f"Generated {self.seed}-{self.attempts}",
+            "layout": [grid[r * cols:(r + 1) * cols].decode('ascii') for r in range(self.height)],
+            "player_start": {'r': start[0], 'c': start[1]},
+            "enemies": [{'r': r, 'c': c} for r, c in enemies],
+            "fireballs": self.fireballs,
+        }
+
+    def generate_valid(self, max_attempts: int = 100) -> Optional[Dict[str, Any]]:
+        for _ in range(max_attempts):
+            level = self.generate()
+            if level is not None:
+                return level
+        return None
+
+    def batch(self, count: int, max_attempts: int = 100) -> Iterator[Dict[str, Any]]:
+        for _ in range(count):
+            level = self.generate_valid(max_attempts)
+            if level is None:
+                return
+            yield level
+
+
+def coins_reachable(level: Dict[str, Any]) -> bool:
+    bits = BitGrid(level["layout"])
+    start = level.get("player_start") or {'r': 1, 'c': 1}
+    coins = bits.mask(COIN)
+    return coins != 0 and bits.reach((start['r'], start['c'])) & coins == coins
+
+
+def emit_levels(levels: List[Dict[str, Any]], path: str) -> int:
+    # Appends to the pack at `path` (creating it if needed) and writes it once
+    from game.core.level_pack import LevelPack
+
+    index_path = os.path.splitext(path)[0] + ".idx"
+    pack = LevelPack(path, index_path, LEVEL_CACHE_SIZE)
+    for level in levels:
+        pack.append(dict(level, id=len(pack)))
+    pack.write()
+    return len(pack)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate random levels into a level pack")
+    parser.add_argument("output", help="level pack to append to, e.g. game/levels_generated.json")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--evaluate", type=int, default=0, metavar="RUNS",
+                        help="also require at least one bot win in RUNS playthroughs")
+    args = parser.parse_args(argv)
+
+    generator = LevelGenerator(args.seed)
+    started = time.perf_counter()
+    levels = list(generator.batch(args.count))
+    elapsed = time.perf_counter() - started
+    print(f"Generated {len(levels)} levels in {elapsed:.2f}s "
+          f"({len(levels) / max(elapsed, 1e-9):.0f}/s, {generator.attempts} attempts, seed {generator.seed})")
+
+    if args.evaluate:
+        from game.systems.evaluator import evaluate_levels
+        results = evaluate_levels(levels, runs=args.evaluate)
+        levels = [level for level, result in zip(levels, results) if result["wins"]]
+        print(f"{len(levels)} levels passed bot playthroughs")
+
+    total = emit_levels(levels, args.output)
+    print(f"{args.output} now holds {total} levels")
+
+
+if __name__ == "__main__":
+    main()
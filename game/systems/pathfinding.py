@@ -0,0 +1,543 @@
+import heapq
+import pygame
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from game.config import *
+
+Cell = Tuple[int, int]
+
+
+def get_neighbors(map_obj, r: int, c: int) -> List[Cell]:
+    # (r, c) must be on the map: every read is one tile away at most, and the map's GROUND
+    # border stands in for the edge checks
+    neighbors = []
+    tile = map_obj.tile_near
+
+    current_tile = tile(r, c)
+    tile_below = tile(r + 1, c)
+
+    is_on_ground = tile_below in [GROUND, LADDER]
+    is_on_ladder = current_tile == LADDER
+
+    # Falling
+    if not is_on_ground and not is_on_ladder:
+        if tile_below != GROUND:
+            neighbors.append((r + 1, c))
+
+    # Normal movement
+    else:
+        # Up
+        if is_on_ladder:
+            if tile(r - 1, c) != GROUND:
+                neighbors.append((r - 1, c))
+
+        # Down
+        if tile_below != GROUND:
+            neighbors.append((r + 1, c))
+
+        # Left
+        if tile(r, c - 1) != GROUND:
+            neighbors.append((r, c - 1))
+
+        # Right
+        if tile(r, c + 1) != GROUND:
+            neighbors.append((r, c + 1))
+
+    return neighbors
+
+
+def get_player_moves(map_obj, r: int, c: int) -> List[Tuple[Cell, Optional[int]]]:
+    # Player.handle_input rules from a resting cell: (destination, key to hold).
+    # A None key means the player just falls. Neighbour reads go through tile_near; only
+    # the two-rows-up jump check needs the bounds-checked get_tile.
+    tile = map_obj.tile_near
+    current_tile = tile(r, c)
+    tile_below = tile(r + 1, c)
+    tile_above = tile(r - 1, c)
+
+    on_stable = tile_below in (GROUND, LADDER)
+    on_ladder = current_tile == LADDER
+    if not on_stable and not on_ladder:
+        return [((r + 1, c), None)]
+
+    moves = []
+    can_climb = on_ladder or (on_stable and tile_below == LADDER)
+    if can_climb:
+        if tile_below != GROUND:
+            moves.append(((r + 1, c), pygame.K_s))
+        if tile_above != GROUND:
+            moves.append(((r - 1, c), pygame.K_w))
+    elif on_stable and tile_above != GROUND and map_obj.get_tile(r - 2, c) == LADDER:
+        # Straight jump, then keep holding W at the peak to grab the ladder
+        moves.append(((r - 2, c), pygame.K_w))
+
+    for dc, key, jump_key in ((-1, pygame.K_a, pygame.K_q), (1, pygame.K_d, pygame.K_e)):
+        if tile(r, c + dc) != GROUND:
+            moves.append(((r, c + dc), key))
+        if on_stable and tile_above != GROUND and tile(r - 1, c + dc) != GROUND:
+            moves.append(((r - 1, c + dc), jump_key))
+
+    return moves
+
+
+def _move_class(tile: str) -> str:
+    # Movement rules only distinguish ground, ladders and everything else
+    return tile if tile in (GROUND, LADDER) else BLANK
+
+
+class NavGraph:
+    # Cached adjacency built from get_neighbors, patched locally when a tile changes
+
+    def __init__(self, map_obj):
+        self._map = map_obj
+        self.version = 0
+        self.rebuild()
+
+    def rebuild(self):
+        self.width = self._map.width
+        self.height = self._map.height
+        self.adjacency: Dict[Cell, List[Cell]] = {}
+        self.reverse: Dict[Cell, List[Cell]] = {}
+        for r in range(self.height):
+            for c in range(self.width):
+                self._set_cell((r, c), get_neighbors(self._map, r, c))
+        self.version += 1
+
+    def _set_cell(self, cell: Cell, neighbors: List[Cell]):
+        for n in self.adjacency.get(cell, ()):
+            self.reverse[n].remove(cell)
+        self.adjacency[cell] = neighbors
+        for n in neighbors:
+            self.reverse.setdefault(n, []).append(cell)
+
+    def on_tile_changed(self, row: int, col: int, old_tile: str, new_tile: str):
+        if _move_class(old_tile) == _move_class(new_tile):
+            return
+
+        # A tile is read by its own cell, the cell above (as ground) and its side/below neighbours
+        changed = False
+        for r, c in ((row, col), (row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < self.height and 0 <= c < self.width:
+                neighbors = get_neighbors(self._map, r, c)
+                if neighbors != self.adjacency[(r, c)]:
+                    self._set_cell((r, c), neighbors)
+                    changed = True
+        if changed:
+            self.version += 1
+
+    def neighbors(self, r: int, c: int) -> List[Cell]:
+        return self.adjacency.get((r, c), [])
+
+    def predecessors(self, r: int, c: int) -> List[Cell]:
+        return self.reverse.get((r, c), [])
+
+
+class FlowField:
+    # One reverse BFS from the player's cell, shared by every enemy.
+    # Rebuilt only when the goal cell or the navigation graph changes.
+
+    def __init__(self):
+        self.goal: Optional[Cell] = None
+        self._nav = None
+        self._nav_version = -1
+        self._next_step: Dict[Cell, Cell] = {}
+        self._dist: Dict[Cell, int] = {}
+        self.rebuilds = 0
+
+    def update(self, map_obj, goal: Cell):
+        nav = map_obj.nav
+        if goal == self.goal and nav is self._nav and nav.version == self._nav_version:
+            return
+
+        self.goal = goal
+        self._nav = nav
+        self._nav_version = nav.version
+        self._rebuild(nav)
+
+    def _rebuild(self, nav: NavGraph):
+        # Movement is directed (falling is one-way), so walk reversed edges from the goal
+        reverse = nav.reverse
+        dist = {self.goal: 0}
+        next_step = {}
+        q = deque([self.goal])
+        while q:
+            curr = q.popleft()
+            d = dist[curr] + 1
+            for prev in reverse.get(curr, ()):
+                if prev not in dist:
+                    dist[prev] = d
+                    next_step[prev] = curr
+                    q.append(prev)
+
+        self._dist = dist
+        self._next_step = next_step
+        self.rebuilds += 1
+
+    def distance(self, cell: Cell) -> Optional[int]:
+        return self._dist.get(cell)
+
+    def next_move(self, cell: Cell) -> Optional[Cell]:
+        return self._next_step.get(cell)
+
+
+def _strong_components(adjacency: Dict[Cell, List[Cell]]) -> Dict[Cell, int]:
+    # Iterative Tarjan over the cells in adjacency; edges to cells outside it are ignored
+    index, low, component = {}, {}, {}
+    stack, on_stack = [], set()
+    counter = count = 0
+    for root in adjacency:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            v, edges = work[-1]
+            for w in edges:
+                if w not in adjacency:
+                    continue
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(adjacency[w])))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component[w] = count
+                        if w == v:
+                            break
+                    count += 1
+    return component
+
+
+class _Region:
+    __slots__ = ("adjacency", "reverse", "component", "core", "centers", "inner_pred", "entries")
+
+    def __init__(self, game_map, rows: range, cols: range):
+        # Ground is never entered, so it has no place in the graph
+        self.adjacency = {(r, c): get_neighbors(game_map, r, c)
+                          for r in rows for c in cols if game_map.get_tile(r, c) != GROUND}
+        self.reverse: Dict[Cell, List[Cell]] = {}
+        for cell, neighbors in self.adjacency.items():
+            for n in neighbors:
+                self.reverse.setdefault(n, []).append(cell)
+        self.component, self.core = self._components()
+        count = max(self.component.values(), default=-1) + 1
+
+        sums = [[0, 0, 0] for _ in range(count)]
+        for (r, c), k in self.component.items():
+            sums[k][0] += r
+            sums[k][1] += c
+            sums[k][2] += 1
+        self.centers = [(sr / n, sc / n) for sr, sc, n in sums]
+
+        # Predecessors of each component: other components here with an edge into it, and
+        # (outside cell, cell here) for the edges into it across the border (its entrances)
+        self.inner_pred = [set() for _ in range(count)]
+        self.entries: List[List[Tuple[Cell, Cell]]] = [[] for _ in range(count)]
+        for cell, neighbors in self.adjacency.items():
+            k = self.component[cell]
+            for n in neighbors:
+                if n in self.adjacency and self.component[n] != k:
+                    self.inner_pred[self.component[n]].add(k)
+            r, c = cell
+            if r in (rows.start, rows.stop - 1) or c in (cols.start, cols.stop - 1):
+                for u in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if (u[0] in rows and u[1] in cols) or not (
+                            0 <= u[0] < game_map.height and 0 <= u[1] < game_map.width):
+                        continue
+                    if game_map.get_tile(*u) != GROUND and cell in get_neighbors(game_map, *u):
+                        self.entries[k].append((u, cell))
+
+    def _components(self) -> Tuple[Dict[Cell, int], set]:
+        # Cells that reach each other without leaving the region share a component. A cell
+        # with a single way on (falling, mostly) joins the component it drops into, or the
+        # one component of its chain if that drops out of the region: it reaches everything
+        # that component reaches, and the region doesn't fragment into one node per air cell.
+        # The rest, the core, is what every member of a component can get to.
+        adjacency = self.adjacency
+        strong = _strong_components(adjacency)
+        sizes: Dict[int, int] = {}
+        for k in strong.values():
+            sizes[k] = sizes.get(k, 0) + 1
+
+        merged: Dict[Cell, int] = {}
+        core = set(adjacency)
+        for cell in adjacency:
+            chain = []
+            while (cell not in merged and sizes[strong[cell]] == 1 and len(adjacency[cell]) == 1
+                   and adjacency[cell][0] in adjacency):
+                chain.append(cell)
+                cell = adjacency[cell][0]
+            k = merged.setdefault(cell, strong[cell])
+            for link in chain:
+                merged[link] = k
+                core.discard(link)
+
+        # Renumber densely
+        ids: Dict[int, int] = {}
+        return {cell: ids.setdefault(k, len(ids)) for cell, k in merged.items()}, core
+
+
+class RegionGraph:
+    # The grid cut into REGION_SIZE squares for hierarchical search. The abstract nodes are
+    # (region, component) pairs, linked by the tile edges that cross region borders and by
+    # the one-way edges between components of a region (falls). A region is built on first
+    # use and dropped when a nearby tile changes, so nothing here is proportional to the
+    # whole map until that much of it has been searched.
+
+    def __init__(self, map_obj, size: int = REGION_SIZE):
+        self._map = map_obj
+        self.size = size
+        self.version = 0
+        self._regions: Dict[Cell, _Region] = {}
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def region_of(self, cell: Cell) -> Cell:
+        return cell[0] // self.size, cell[1] // self.size
+
+    def region(self, key: Cell) -> _Region:
+        region = self._regions.get(key)
+        if region is None:
+            size = self.size
+            rows = range(key[0] * size, min((key[0] + 1) * size, self._map.height))
+            cols = range(key[1] * size, min((key[1] + 1) * size, self._map.width))
+            region = _Region(self._map, rows, cols)
+            self._regions[key] = region
+        return region
+
+    def node(self, cell: Cell) -> Optional[Tuple[Cell, int]]:
+        key = self.region_of(cell)
+        k = self.region(key).component.get(cell)
+        return None if k is None else (key, k)
+
+    def predecessors(self, node: Tuple[Cell, int]) -> List[Tuple[Tuple[Cell, int], float]]:
+        # (node, cost) for every abstract node with an edge into this one; costs are the
+        # distances between component centres
+        key, k = node
+        region = self.region(key)
+        cr, cc = region.centers[k]
+        result = []
+        for j in region.inner_pred[k]:
+            pr, pc = region.centers[j]
+            result.append(((key, j), abs(pr - cr) + abs(pc - cc)))
+        for u, _ in region.entries[k]:
+            pred_key = self.region_of(u)
+            pred = self.region(pred_key)
+            j = pred.component[u]
+            pr, pc = pred.centers[j]
+            result.append(((pred_key, j), abs(pr - cr) + abs(pc - cc)))
+        return result
+
+    def rebuild(self):
+        self._regions.clear()
+        self.version += 1
+
+    def on_tile_changed(self, row: int, col: int, old_tile: str, new_tile: str):
+        if _move_class(old_tile) == _move_class(new_tile):
+            return
+        # Same five cells NavGraph re-reads. Entrance lists also read the edges of the
+        # cells just outside a region, so the neighbouring regions of those go too.
+        for r, c in ((row, col), (row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            for cell in ((r, c), (r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                self._regions.pop(self.region_of(cell), None)
+        self.version += 1
+
+
+# Marks nodes that are right at the goal's region: their next step is the goal's own field
+_ARRIVED = object()
+
+
+class HierarchicalPathfinder:
+    # Same update()/next_move() interface as FlowField, for maps too big to flood every
+    # time the player moves. One backward Dijkstra over RegionGraph nodes runs from the
+    # goal, resumed only as far as the enemies asking need it, and is kept while the goal
+    # stays among the same nodes and no tile changes. An enemy then walks tiles only inside
+    # its current region, to the entrance of the next node on its way; within the goal's
+    # region the last stretch comes from an exact local BFS. Reachability is exact, path
+    # lengths are near-optimal as in HPA*.
+
+    def __init__(self):
+        self.goal: Optional[Cell] = None
+        self._graph: Optional[RegionGraph] = None
+        self._version = -1
+        self._seeds: Dict[tuple, float] = {}
+        self._heap: list = []
+        self._dist: Dict[tuple, float] = {}
+        self._settled = set()
+        self._toward: Dict[tuple, tuple] = {}
+        self._next_step: Dict[Cell, Cell] = {}
+        self._local_next: Dict[Cell, Cell] = {}
+        self.rebuilds = 0
+
+    def update(self, map_obj, goal: Cell):
+        graph = map_obj.regions
+        if goal == self.goal and graph is self._graph and graph.version == self._version:
+            return
+        self._graph = graph
+        self._set_goal(goal)
+
+    def _set_goal(self, goal: Cell):
+        self.goal = goal
+        self._local_next = self._local_field(goal)
+        seeds = self._seed_nodes(goal)
+        if seeds.keys() == self._seeds.keys() and self._graph.version == self._version:
+            return
+
+        # Restart the abstract search; refined tile steps lead to the next node, so they
+        # are only stale once the abstract field changes
+        self._version = self._graph.version
+        self._seeds = seeds
+        self._dist = dict(seeds)
+        self._heap = [(cost, node) for node, cost in seeds.items()]
+        heapq.heapify(self._heap)
+        self._settled = set()
+        self._toward = dict.fromkeys(seeds, _ARRIVED)
+        self._next_step = {}
+        self.rebuilds += 1
+
+    def _local_field(self, goal: Cell) -> Dict[Cell, Cell]:
+        # Reverse BFS from the goal inside its region: next step for every cell that gets
+        # there without leaving it
+        reverse = self._graph.region(self._graph.region_of(goal)).reverse
+        next_step = {}
+        seen = {goal}
+        q = deque([goal])
+        while q:
+            curr = q.popleft()
+            for prev in reverse.get(curr, ()):
+                if prev not in seen:
+                    seen.add(prev)
+                    next_step[prev] = curr
+                    q.append(prev)
+        return next_step
+
+    def _seed_nodes(self, goal: Cell) -> Dict[tuple, float]:
+        # Nodes whose every member reaches the goal through its region: components with a
+        # core cell in the local field, and the nodes just outside with an entrance into it
+        graph = self._graph
+        key = graph.region_of(goal)
+        region = graph.region(key)
+        local = self._local_next
+        seeds = {}
+
+        def seed(node_key, k):
+            cr, cc = graph.region(node_key).centers[k]
+            cost = abs(cr - goal[0]) + abs(cc - goal[1])
+            if cost < seeds.get((node_key, k), cost + 1):
+                seeds[(node_key, k)] = cost
+
+        for cell in local:
+            if cell in region.core:
+                seed(key, region.component[cell])
+        if goal in region.core:
+            seed(key, region.component[goal])
+        for entrances in region.entries:
+            for u, cell in entrances:
+                if cell == goal or cell in local:
+                    u_key = graph.region_of(u)
+                    seed(u_key, graph.region(u_key).component[u])
+        return seeds
+
+    def _next_node(self, node) -> Optional[tuple]:
+        # Resume the backward search until node is settled; None if the goal is unreachable
+        graph, dist, settled, heap = self._graph, self._dist, self._settled, self._heap
+        while node not in settled:
+            if not heap:
+                return None
+            d, b = heapq.heappop(heap)
+            if b in settled or d > dist[b]:
+                continue
+            settled.add(b)
+            for a, cost in graph.predecessors(b):
+                nd = d + cost
+                if nd < dist.get(a, nd + 1):
+                    dist[a] = nd
+                    self._toward[a] = b
+                    heapq.heappush(heap, (nd, a))
+        return self._toward.get(node)
+
+    def _refine(self, cell: Cell, node, target) -> Optional[Cell]:
+        # BFS inside cell's region to the first tile of the target node (or of the goal's
+        # field), recording the steps so enemies behind this one reuse them
+        graph = self._graph
+        region = graph.region(node[0])
+        adjacency, component = region.adjacency, region.component
+        arrived = target is _ARRIVED
+        same_region = not arrived and target[0] == node[0]
+        parent = {cell: None}
+        q = deque([cell])
+        end = None
+        while q and end is None:
+            curr = q.popleft()
+            for n in adjacency[curr]:
+                if n in parent:
+                    continue
+                if arrived:
+                    found = n == self.goal or n in self._local_next
+                elif n in adjacency:
+                    found = same_region and component[n] == target[1]
+                else:
+                    found = not same_region and graph.node(n) == target
+                if found:
+                    end = n
+                    parent[n] = curr
+                    break
+                if n in adjacency:
+                    parent[n] = curr
+                    q.append(n)
+        if end is None:
+            return None
+
+        step = end
+        while parent[step] != cell:
+            self._next_step[parent[step]] = step
+            step = parent[step]
+        self._next_step[cell] = step
+        return step
+
+    def distance(self, cell: Cell) -> Optional[int]:
+        # Length of the path next_move would follow; walks it, so meant for tools, not ticks
+        steps = 0
+        while cell != self.goal:
+            cell = self.next_move(cell)
+            if cell is None:
+                return None
+            steps += 1
+        return steps
+
+    def next_move(self, cell: Cell) -> Optional[Cell]:
+        if self._graph is None or cell == self.goal:
+            return None
+        if self._graph.version != self._version:
+            self._set_goal(self.goal)
+
+        step = self._local_next.get(cell)
+        if step is not None:
+            return step
+        step = self._next_step.get(cell)
+        if step is not None:
+            return step
+
+        node = self._graph.node(cell)
+        if node is None:
+            return None
+        target = self._next_node(node)
+        if target is None:
+            return None
+        return self._refine(cell, node, target)
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Dict, List, Optional
+from game.config import PROFILING, PROFILE_HISTORY, PROFILE_TRACE_LIMIT
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    # One reusable instance per name, so entering a scope allocates nothing
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.add_sample(self._name, self._start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    # Named timing scopes summed per frame; the last `history` frames are kept in a ring.
+    # When disabled, scope() hands back a shared no-op and timed() leaves functions untouched.
+
+    def __init__(self, enabled: bool = PROFILING, history: int = PROFILE_HISTORY,
+                 trace_limit: int = PROFILE_TRACE_LIMIT):
+        self.enabled = enabled
+        self._scopes: Dict[str, _Scope] = {}
+        self._current: Dict[str, float] = {}
+        self._frames = deque(maxlen=history)
+        self._frame_times = deque(maxlen=history)
+        self._frame_start = None
+        self._origin = time.perf_counter()
+        self._trace = None
+        self._trace_limit = trace_limit
+
+    def scope(self, name: str):
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = self._scopes[name] = _Scope(self, name)
+        return scope
+
+    def add_sample(self, name: str, start: float, end: float):
+        self._current[name] = self._current.get(name, 0.0) + (end - start) * 1000.0
+        if self._trace is not None:
+            self._trace.append((name, start, end, threading.get_ident()))
+
+    def begin_frame(self):
+        if self.enabled:
+            # Samples taken between frames (startup, loading) only go to the trace
+            self._current = {}
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        end = time.perf_counter()
+        self.add_sample("frame", self._frame_start, end)
+        self._frames.append(self._current)
+        self._frame_times.append(self._current["frame"])
+        self._current = {}
+        self._frame_start = None
+
+    def frame_times(self) -> List[float]:
+        return list(self._frame_times)
+
+    def averages(self) -> Dict[str, float]:
+        # Mean ms per frame for each scope over the ring; missing frames count as 0
+        if not self._frames:
+            return {}
+        totals: Dict[str, float] = {}
+        for frame in self._frames:
+            for name, ms in frame.items():
+                totals[name] = totals.get(name, 0.0) + ms
+        return {name: ms / len(self._frames) for name, ms in totals.items()}
+
+    def fps(self) -> float:
+        if not self._frame_times:
+            return 0.0
+        return 1000.0 * len(self._frame_times) / max(sum(self._frame_times), 1e-6)
+
+    def histogram(self, bin_ms: float, bins: int) -> List[int]:
+        # Last bin collects everything slower than the range
+        counts = [0] * bins
+        for ms in self._frame_times:
+            counts[min(int(ms // bin_ms), bins - 1)] += 1
+        return counts
+
+    @property
+    def is_tracing(self) -> bool:
+        return self._trace is not None
+
+    def start_trace(self):
+        if self.enabled:
+            self._trace = deque(maxlen=self._trace_limit)
+
+    def stop_trace(self, path: str) -> Optional[str]:
+        # Chrome trace event format; open in chrome://tracing or Perfetto
+        events, self._trace = self._trace, None
+        if events is None:
+            return None
+        trace = {
+            "traceEvents": [
+                {"name": name, "ph": "X", "pid": os.getpid(), "tid": tid,
+                 "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6}
+                for name, start, end, tid in events
+            ],
+            "displayTimeUnit": "ms"
+        }
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(trace, f)
+        except OSError as e:
+            print(f"Trace dump failed: {e}")
+            return None
+        return path
+
+
+profiler = Profiler()
+
+
+def timed(name: str = None):
+    # Decorator form of profiler.scope, resolved once at import time
+    def decorator(func):
+        if not profiler.enabled:
+            return func
+        scope_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.scope(scope_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
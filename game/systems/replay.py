@@ -0,0 +1,205 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from typing import List, Optional, Tuple
+
+import pygame
+from game.config import REPLAYS_DIR
+from game.utils import atomic_write
+
+# Only these keys affect the simulation, so a tick's input fits in one bitmask
+GAME_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_q, pygame.K_e)
+_KEY_BITS = {key: 1 << i for i, key in enumerate(GAME_KEYS)}
+
+ACTION_KEYS = 0
+ACTION_DIG = 1
+ACTION_FIREBALL = 2
+
+MAGIC = b'LRRP'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHII')     # magic, version, level fingerprint, total ticks
+_EVENT = struct.Struct('<IBhh')       # tick, action, a, b
+
+
+def encode_keys(keys) -> int:
+    if isinstance(keys, int):
+        return keys
+    mask = 0
+    for key, bit in _KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class KeyState:
+    # Stands in for pygame.key.get_pressed() when input comes from a mask
+
+    def __init__(self, mask: int):
+        self.mask = mask
+
+    def __getitem__(self, key: int) -> bool:
+        return bool(self.mask & _KEY_BITS.get(key, 0))
+
+
+def level_fingerprint(layout: List[str], player_start: Optional[dict], enemies: list, fireballs: int) -> int:
+    data = json.dumps([layout, player_start, enemies, fireballs], sort_keys=True)
+    return zlib.crc32(data.encode('utf-8'))
+
+
+class Recording:
+    def __init__(self, fingerprint: int, events: List[Tuple[int, int, int, int]] = None, total_ticks: int = 0):
+        self.fingerprint = fingerprint
+        # (tick, action, a, b); key events only appear when the mask changes
+        self.events = events if events is not None else []
+        self.total_ticks = total_ticks
+
+    def encode(self) -> bytes:
+        out = [_HEADER.pack(MAGIC, VERSION, self.fingerprint, self.total_ticks)]
+        out.extend(_EVENT.pack(*event) for event in self.events)
+        return b''.join(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Recording":
+        try:
+            magic, version, fingerprint, total_ticks = _HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ValueError(f"Corrupt replay: {e}") from e
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if version > VERSION:
+            raise ValueError(f"Replay version {version} is newer than supported ({VERSION})")
+
+        body = data[_HEADER.size:]
+        if len(body) % _EVENT.size:
+            raise ValueError("Corrupt replay events")
+        events = [_EVENT.unpack_from(body, i) for i in range(0, len(body), _EVENT.size)]
+        return cls(fingerprint, events, total_ticks)
+
+
+class InputRecorder:
+    def __init__(self, fingerprint: int):
+        self.recording = Recording(fingerprint)
+        self._last_mask = 0
+
+    def record_tick(self, tick: int, mask: int, actions: list):
+        if mask != self._last_mask:
+            self.recording.events.append((tick, ACTION_KEYS, mask, 0))
+            self._last_mask = mask
+        for action, a, b in actions:
+            self.recording.events.append((tick, action, a, b))
+        self.recording.total_ticks = tick + 1
+
+
+def play_recording(sim, recording: Recording):
+    # Drives a freshly built Simulation headless, as fast as the CPU allows
+    if recording.fingerprint != sim.level_fingerprint:
+        raise ValueError("Replay was recorded on a different level")
+
+    events = recording.events
+    i = 0
+    for tick in range(recording.total_ticks):
+        while i < len(events) and events[i][0] == tick:
+            _, action, a, b = events[i]
+            if action == ACTION_KEYS:
+                sim.set_input(a)
+            else:
+                sim.queue_action(action, a, b)
+            i += 1
+        if not sim.is_running:
+            break
+        sim.step()
+    return sim
+
+
+def verify_run(sim, recording: Recording, expected_time: int) -> bool:
+    play_recording(sim, recording)
+    return sim.game_finished and sim.win_time == expected_time
+
+
+def replay_path(level_idx: int, name: str = "last") -> str:
+    return os.path.join(REPLAYS_DIR, f"{name}_{level_idx}.rpl")
+
+
+def save_replay(level_idx: int, recording: Recording, name: str = "last") -> bool:
+    if not os.path.exists(REPLAYS_DIR):
+        os.makedirs(REPLAYS_DIR)
+    try:
+        atomic_write(replay_path(level_idx, name), recording.encode(), mode="wb")
+        return True
+    except OSError as e:
+        print(f"Replay save failed: {e}")
+        return False
+
+
+def load_replay(level_idx: int, name: str = "last") -> Optional[Recording]:
+    # Raises ValueError for files that are not valid replays
+    path = replay_path(level_idx, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return Recording.decode(f.read())
+
+
+def main(argv=None):
+    # Headless playback of a saved run: reproduce a bug, check a best time, or time the
+    # simulation on real input
+    import argparse
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    parser = argparse.ArgumentParser(description="Play a recorded run back on a fresh simulation")
+    parser.add_argument("level", type=int, help="level index the replay was recorded on")
+    parser.add_argument("--name", default="last", help="replay to load: last or best")
+    parser.add_argument("--verify", action="store_true",
+                        help="fail unless the run finishes in the level's best recorded time")
+    args = parser.parse_args(argv)
+
+    from game.core.level_manager import LevelManager
+    from game.core.simulation import Simulation
+    from game.systems.score_system import ScoreManager
+
+    try:
+        recording = load_replay(args.level, args.name)
+    except ValueError as e:
+        print(f"Replay error: {e}")
+        return 1
+    if recording is None:
+        print(f"No replay at {replay_path(args.level, args.name)}")
+        return 1
+
+    level_manager = LevelManager()
+    if not 0 <= args.level < level_manager.level_count:
+        print(f"No level {args.level}")
+        return 1
+    # Built the way the game builds it, so the level fingerprint matches
+    level_manager.current_index = args.level
+    sim = Simulation.from_level_manager(level_manager)
+    best = ScoreManager().get_best_time(args.level) if args.verify else None
+
+    started = time.perf_counter()
+    try:
+        verified = verify_run(sim, recording, best) if args.verify else play_recording(sim, recording)
+    except ValueError as e:
+        print(f"Replay error: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    outcome = "won" if sim.game_finished else "caught" if sim.game_over else "unfinished"
+    print(f"{outcome} after {sim.tick_count}/{recording.total_ticks} ticks"
+          + (f", time {sim.win_time}ms" if sim.game_finished else "")
+          + f" ({sim.tick_count / max(elapsed, 1e-9):.0f} ticks/s)")
+
+    if args.verify:
+        if not verified:
+            print(f"Verification failed: best recorded time is {best}")
+            return 1
+        print("Verified against the best recorded time")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,158 @@
-import pickle
 import os
-from typing import Any, Optional
-from game.config import SAVES_DIR
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+from game.config import SAVES_DIR, SAVE_SLOTS, AUTOSAVE_RING_SIZE
+from game.systems.snapshot import Snapshot, encode_snapshot, decode_snapshot
+from game.utils import atomic_write
+
+
+AUTOSAVE_PREFIX = "autosave"
+
+
+class AutosaveRing:
+    # Last few autosaves of one level kept in memory, newest last, for instant rewind
+
+    def __init__(self, size: int):
+        self._snapshots = deque(maxlen=size)
+        self.sequence = 0
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def push(self, snapshot: Snapshot) -> int:
+        self._snapshots.append(snapshot)
+        self._cursor = 0
+        slot = self.sequence % self._snapshots.maxlen
+        self.sequence += 1
+        return slot
+
+    def rewind(self) -> Optional[Snapshot]:
+        # Each call steps one autosave further back, until a new one is pushed
+        if not self._snapshots:
+            return None
+        self._cursor = min(self._cursor + 1, len(self._snapshots))
+        return self._snapshots[-self._cursor]
 
 
 class SaveManager:
 
+    def __init__(self):
+        # Saves are encoded and written on a worker thread; only the latest
+        # snapshot per (level, slot) is kept, so rapid repeated saves coalesce into one write.
+        self._pending = {}
+        self._in_flight = {}
+        self._completed = deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._autosaves = {}
+
     @staticmethod
     def ensure_save_dir():
         if not os.path.exists(SAVES_DIR):
             os.makedirs(SAVES_DIR)
 
     @staticmethod
-    def save_game(level_idx: int, data: Any):
-        SaveManager.ensure_save_dir()
-        filename = os.path.join(SAVES_DIR, f"quicksave_{level_idx}.dat")
+    def _save_path(level_idx: int, slot: str = SAVE_SLOTS[0]) -> str:
+        return os.path.join(SAVES_DIR, f"{slot}_{level_idx}.sav")
+
+    @staticmethod
+    def save_game(level_idx: int, snapshot: Snapshot, base_layout: Optional[List[str]] = None,
+                  slot: str = SAVE_SLOTS[0]):
+        filename = SaveManager._save_path(level_idx, slot)
 
         try:
-            with open(filename, "wb") as f:
-                pickle.dump(data, f)
+            SaveManager.ensure_save_dir()
+            atomic_write(filename, encode_snapshot(snapshot, base_layout), mode="wb")
             print(f"Game saved to {filename}")
-        except (OSError, pickle.PicklingError) as e:
+            return True
+        except OSError as e:
             print(f"Save failed: {e}")
+            return False
+
+    def save_game_async(self, level_idx: int, snapshot: Snapshot, base_layout: Optional[List[str]] = None,
+                        slot: str = SAVE_SLOTS[0]):
+        with self._cond:
+            self._pending[(level_idx, slot)] = (snapshot, base_layout)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="SaveWorker", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+
+    def _run_worker(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                key, (snapshot, base_layout) = self._pending.popitem()
+                self._in_flight[key] = snapshot
+
+            level_idx, slot = key
+            ok = False
+            try:
+                ok = SaveManager.save_game(level_idx, snapshot, base_layout, slot)
+            except Exception as e:
+                # Encoding errors too: the worker must outlive a bad save, or wait_for_saves hangs
+                print(f"Save failed: {e}")
+            finally:
+                with self._cond:
+                    if self._in_flight.get(key) is snapshot:
+                        del self._in_flight[key]
+                    self._completed.append((level_idx, slot, ok))
+                    self._cond.notify_all()
+
+    def poll_completed(self) -> List[Tuple[int, str, bool]]:
+        # Called once per frame from the main thread
+        done = []
+        while self._completed:
+            done.append(self._completed.popleft())
+        return done
+
+    def latest_unwritten(self, level_idx: int, slot: str = SAVE_SLOTS[0]) -> Optional[Snapshot]:
+        key = (level_idx, slot)
+        with self._cond:
+            if key in self._pending:
+                return self._pending[key][0]
+            return self._in_flight.get(key)
+
+    def autosave(self, level_idx: int, snapshot: Snapshot, base_layout: Optional[List[str]] = None):
+        ring = self._autosaves.setdefault(level_idx, AutosaveRing(AUTOSAVE_RING_SIZE))
+        ring_slot = ring.push(snapshot)
+        self.save_game_async(level_idx, snapshot, base_layout, f"{AUTOSAVE_PREFIX}{ring_slot}")
+
+    def rewind_autosave(self, level_idx: int, base_layout: Optional[List[str]] = None) -> Optional[Snapshot]:
+        ring = self._autosaves.get(level_idx)
+        if ring:
+            return ring.rewind()
+
+        # Nothing autosaved this session: fall back to the newest autosave file on disk
+        paths = [SaveManager._save_path(level_idx, f"{AUTOSAVE_PREFIX}{i}") for i in range(AUTOSAVE_RING_SIZE)]
+        paths = [p for p in paths if os.path.exists(p)]
+        if not paths:
+            return None
+        with open(max(paths, key=os.path.getmtime), "rb") as f:
+            return decode_snapshot(f.read(), base_layout)
+
+    def wait_for_saves(self):
+        with self._cond:
+            while self._pending or self._in_flight:
+                self._cond.wait()
 
     @staticmethod
-    def load_game(level_idx: int) -> Optional[Any]:
-        filename = os.path.join(SAVES_DIR, f"quicksave_{level_idx}.dat")
+    def load_game(level_idx: int, base_layout: Optional[List[str]] = None,
+                  slot: str = SAVE_SLOTS[0]) -> Optional[Snapshot]:
+        # Raises ValueError for files that are not valid snapshots
+        filename = SaveManager._save_path(level_idx, slot)
 
         if not os.path.exists(filename):
             return None
 
         try:
             with open(filename, "rb") as f:
-                data = pickle.load(f)
-            return data
-        except (OSError, pickle.UnpicklingError, EOFError) as e:
+                data = f.read()
+        except OSError as e:
             print(f"Load failed: {e}")
-            return None
\ No newline at end of file
+            return None
+
+        return decode_snapshot(data, base_layout)
@@ -0,0 +1,66 @@
+import heapq
+from typing import Callable, List, Optional, Tuple
+
+# Event entries are lists so cancel() can flag them in place:
+#   [due, seq, kind, a, b, live]
+# seq keeps events with the same due time in scheduling order.
+_DUE, _SEQ, _KIND, _A, _B, _LIVE = range(6)
+
+
+class Scheduler:
+    # Min-heap of timed events on a clock the owner advances. Nothing runs until the
+    # earliest event is due, so a tick with no due events costs one comparison.
+    # Events carry an int kind and two int arguments, which keeps them serializable.
+
+    def __init__(self, handler: Callable[[int, int, int], None], now: float = 0.0):
+        self.now = now
+        self._handler = handler
+        self._heap: List[list] = []
+        self._seq = 0
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def schedule(self, delay: float, kind: int, a: int = 0, b: int = 0) -> list:
+        event = [self.now + delay, self._seq, kind, a, b, True]
+        self._seq += 1
+        self._live += 1
+        heapq.heappush(self._heap, event)
+        return event
+
+    def cancel(self, event: list):
+        if event[_LIVE]:
+            event[_LIVE] = False
+            self._live -= 1
+
+    @property
+    def next_due(self) -> Optional[float]:
+        heap = self._heap
+        while heap and not heap[0][_LIVE]:
+            heapq.heappop(heap)
+        return heap[0][_DUE] if heap else None
+
+    def advance(self, now: float) -> int:
+        # Fire everything due by `now`, earliest first; handlers may schedule more
+        self.now = now
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][_DUE] <= now:
+            event = heapq.heappop(heap)
+            if event[_LIVE]:
+                event[_LIVE] = False
+                self._live -= 1
+                self._handler(event[_KIND], event[_A], event[_B])
+                fired += 1
+        return fired
+
+    def pending(self) -> List[Tuple[int, float, int, int]]:
+        # (kind, remaining ms, a, b) in firing order, for saving
+        live = sorted(e for e in self._heap if e[_LIVE])
+        return [(e[_KIND], e[_DUE] - self.now, e[_A], e[_B]) for e in live]
+
+    def clear(self, now: float = 0.0):
+        self.now = now
+        self._heap = []
+        self._live = 0
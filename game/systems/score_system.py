@@ -1,57 +1,146 @@
 import os
+import struct
+import threading
+from bisect import insort
 from typing import Dict, List, Optional
-from game.config import SCORES_FILE
+from game.config import (SCORES_FILE, LEGACY_SCORES_FILE, SCORES_TOP_K, SCORES_SAVE_DELAY,
+                         SCORES_COMPACT_MIN, SCORES_COMPACT_RATIO)
+from game.utils import DebouncedWriter, atomic_write
+
+# File layout: header <4sHH (magic, format version, flags) followed by an append-only
+# log of <HI records (level index, time ms). Compaction rewrites the log with only the
+# records still kept in memory, so the file stays around levels * SCORES_TOP_K records.
+
+MAGIC = b'LRSC'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHH')
+_RECORD = struct.Struct('<HI')
 
 
 class ScoreManager:
 
     def __init__(self):
-        self._scores: Dict[int, List[int]] = self._load_scores()
+        # Read on first use, not at startup
+        self._loaded: Optional[Dict[int, List[int]]] = None
+        # Records in the file (including ones compaction would drop) and runs not yet written
+        self._records = 0
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        self._writer = DebouncedWriter(self._write_scores, SCORES_SAVE_DELAY)
+
+    @property
+    def _scores(self) -> Dict[int, List[int]]:
+        if self._loaded is None:
+            self._loaded = self._load_scores()
+        return self._loaded
+
+    def _keep(self, scores: Dict[int, List[int]], level_idx: int, time_ms: int):
+        # Each level holds its SCORES_TOP_K fastest runs, sorted; slower runs are dropped
+        times = scores.setdefault(level_idx, [])
+        if len(times) >= SCORES_TOP_K and time_ms >= times[-1]:
+            return
+        insort(times, time_ms)
+        del times[SCORES_TOP_K:]
 
     def _load_scores(self) -> Dict[int, List[int]]:
         scores = {}
         if not os.path.exists(SCORES_FILE):
+            if os.path.exists(LEGACY_SCORES_FILE):
+                self._import_legacy(scores)
             return scores
 
         try:
-            with open(SCORES_FILE, "r") as f:
-                lines = f.readlines()
-                clean_lines = [line.strip() for line in lines if line.strip()]
+            with open(SCORES_FILE, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error reading scores: {e}")
+            return scores
+
+        if len(data) < _HEADER.size or _HEADER.unpack_from(data)[:2] != (MAGIC, VERSION):
+            print(f"Scores file {SCORES_FILE} has an unknown format, ignoring it")
+            return scores
 
-                for line in clean_lines:
+        # A crash mid-append can leave a partial record at the end; it is skipped
+        body = memoryview(data)[_HEADER.size:]
+        body = body[:len(body) - len(body) % _RECORD.size]
+        for level_idx, time_ms in _RECORD.iter_unpack(body):
+            self._keep(scores, level_idx, time_ms)
+        self._records = len(body) // _RECORD.size
+        return scores
+
+    def _import_legacy(self, scores: Dict[int, List[int]]):
+        # One-time migration from the old "level:time" text log
+        try:
+            with open(LEGACY_SCORES_FILE, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
                     try:
                         lvl_str, time_str = line.split(":")
-                        lvl_idx = int(lvl_str)
-                        time_ms = int(time_str)
-
-                        if lvl_idx not in scores:
-                            scores[lvl_idx] = []
-                        scores[lvl_idx].append(time_ms)
+                        self._keep(scores, int(lvl_str), int(time_str))
                     except ValueError:
                         print(f"Skipping corrupt line: {line}")
-                        continue
         except OSError as e:
             print(f"Error reading scores: {e}")
+            return
 
-        return scores
-
-    def save_score(self, level_idx: int, time_ms: int):
-        if level_idx not in self._scores:
-            self._scores[level_idx] = []
-        self._scores[level_idx].append(time_ms)
+        self._compact(scores)
 
+    def _compact(self, scores: Dict[int, List[int]]) -> bool:
+        rows = [(level_idx, time_ms) for level_idx, times in scores.items() for time_ms in times]
+        data = _HEADER.pack(MAGIC, VERSION, 0) + b''.join(_RECORD.pack(*row) for row in rows)
         try:
-            with open(SCORES_FILE, "a") as f:
-                f.write(f"{level_idx}:{time_ms}\n")
+            atomic_write(SCORES_FILE, data, mode="wb")
+            self._records = len(rows)
+            return True
         except OSError as e:
-            print(f"Error saving score: {e}")
+            print(f"Error saving scores: {e}")
+            return False
+
+    def _write_scores(self) -> bool:
+        # Runs on the writer's thread: append the batch, or rewrite the file once dropped
+        # runs outweigh the kept ones. A failed write puts the batch back for the next try.
+        with self._lock:
+            pending, self._pending = self._pending, []
+            kept = sum(len(times) for times in self._scores.values())
+            compact = self._records + len(pending) > max(SCORES_COMPACT_MIN, kept * SCORES_COMPACT_RATIO)
+            if compact:
+                snapshot = {level_idx: list(times) for level_idx, times in self._scores.items()}
+        if not pending:
+            return True
+
+        if compact:
+            if self._compact(snapshot):
+                return True
+        else:
+            try:
+                with open(SCORES_FILE, "ab") as f:
+                    if f.tell() == 0:
+                        f.write(_HEADER.pack(MAGIC, VERSION, 0))
+                    f.write(b''.join(_RECORD.pack(*row) for row in pending))
+                self._records += len(pending)
+                return True
+            except OSError as e:
+                print(f"Error saving score: {e}")
+
+        with self._lock:
+            self._pending[:0] = pending
+        return False
+
+    def save_score(self, level_idx: int, time_ms: int):
+        with self._lock:
+            self._keep(self._scores, level_idx, time_ms)
+            self._pending.append((level_idx, time_ms))
+        self._writer.mark_dirty()
+
+    def flush(self):
+        self._writer.flush()
 
     def get_best_time(self, level_idx: int) -> Optional[int]:
-        if level_idx not in self._scores or not self._scores[level_idx]:
-            return None
-        return min(self._scores[level_idx])
+        times = self._scores.get(level_idx)
+        return times[0] if times else None
 
     def get_top_scores(self, level_idx: int, limit: int = 3) -> List[int]:
-        if level_idx not in self._scores:
-            return []
-        return sorted(self._scores[level_idx])[:limit]
\ No newline at end of file
+        return self._scores.get(level_idx, [])[:limit]
@@ -0,0 +1,156 @@
+import struct
+import zlib
+from typing import List, Optional
+
+# File layout:
+#   header   <4sHH   magic, format version, flags
+#   sections <4sI    tag, body length, then the body
+# Entity sections hold <IH (record count, record size) followed by fixed-size records.
+# Readers skip unknown sections and ignore trailing bytes of longer records,
+# so new fields can be appended without breaking older saves.
+
+MAGIC = b'LRSV'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHH')
+_SECTION = struct.Struct('<4sI')
+_RECORDS = struct.Struct('<IH')
+_GRID = struct.Struct('<HHB')
+
+_PLAYER = struct.Struct('<ffIIi')      # x, y, coins, elapsed ms, fireballs left
+_HOLE = struct.Struct('<HHf')          # row, col, age ms
+_ENEMY = struct.Struct('<ffff')        # x, y, target x, target y
+_PROJECTILE = struct.Struct('<ffb')    # x, y, direction
+_EXPLOSION = struct.Struct('<fff')     # x, y, age ms
+_EVENT = struct.Struct('<Bfhh')        # kind, remaining ms, two arguments
+_DELTA = struct.Struct('<IB')          # cell index, tile byte
+_BASE = struct.Struct('<I')            # CRC32 of the layout the deltas apply to
+
+GRID_RAW = 0
+# Deltas with no record of their base; only read, for saves written before GRID_DELTA_CRC
+GRID_DELTA = 1
+GRID_DELTA_CRC = 2
+
+
+class Snapshot:
+    def __init__(self, player_x: float, player_y: float, coins: int, elapsed_ms: int, fireballs_left: int,
+                 layout: List[str], holes: list, enemies: list, projectiles: list, explosions: list,
+                 events: Optional[list] = None):
+        self.player_x = player_x
+        self.player_y = player_y
+        self.coins = coins
+        self.elapsed_ms = elapsed_ms
+        self.fireballs_left = fireballs_left
+        self.layout = layout
+        # (row, col, age_ms)
+        self.holes = holes
+        # (x, y, target_x, target_y)
+        self.enemies = enemies
+        # (x, y, direction)
+        self.projectiles = projectiles
+        # (x, y, age_ms)
+        self.explosions = explosions
+        # (kind, remaining_ms, a, b); saves from before the scheduler only have the ages above
+        self.events = events or []
+
+
+def _pack_records(record: struct.Struct, rows) -> bytes:
+    return _RECORDS.pack(len(rows), record.size) + b''.join(record.pack(*row) for row in rows)
+
+
+def _unpack_records(record: struct.Struct, body: bytes) -> list:
+    count, size = _RECORDS.unpack_from(body)
+    if size < record.size or _RECORDS.size + count * size > len(body):
+        raise ValueError("Corrupt snapshot records")
+    return [record.unpack_from(body, _RECORDS.size + i * size) for i in range(count)]
+
+
+def _encode_grid(layout: List[str], base_layout: Optional[List[str]]) -> bytes:
+    height = len(layout)
+    width = len(layout[0]) if layout else 0
+    raw = "".join(layout).encode('ascii')
+
+    if base_layout and len(base_layout) == height and len(base_layout[0]) == width:
+        base = "".join(base_layout).encode('ascii')
+        changes = [(i, b) for i, (a, b) in enumerate(zip(base, raw)) if a != b]
+        if _BASE.size + len(changes) * _DELTA.size < len(raw):
+            return (_GRID.pack(width, height, GRID_DELTA_CRC) + _BASE.pack(zlib.crc32(base))
+                    + _pack_records(_DELTA, changes))
+
+    return _GRID.pack(width, height, GRID_RAW) + raw
+
+
+def _decode_grid(body: bytes, base_layout: Optional[List[str]]) -> List[str]:
+    width, height, mode = _GRID.unpack_from(body)
+    payload = body[_GRID.size:]
+
+    if mode in (GRID_DELTA, GRID_DELTA_CRC):
+        if not base_layout or len(base_layout) != height or len(base_layout[0]) != width:
+            raise ValueError("Snapshot grid does not match the level layout")
+        cells = bytearray("".join(base_layout).encode('ascii'))
+        if mode == GRID_DELTA_CRC:
+            # Saves are keyed by level index, which may now hold an edited or different level
+            (crc,) = _BASE.unpack_from(payload)
+            if crc != zlib.crc32(cells):
+                raise ValueError("Snapshot was saved against a different level layout")
+            payload = payload[_BASE.size:]
+        for index, code in _unpack_records(_DELTA, payload):
+            if index >= len(cells):
+                raise ValueError("Corrupt snapshot grid")
+            cells[index] = code
+    elif mode == GRID_RAW:
+        cells = payload[:width * height]
+        if len(cells) != width * height:
+            raise ValueError("Corrupt snapshot grid")
+    else:
+        raise ValueError(f"Unknown grid encoding {mode}")
+
+    text = bytes(cells).decode('ascii')
+    return [text[r * width:(r + 1) * width] for r in range(height)]
+
+
+def encode_snapshot(snap: Snapshot, base_layout: Optional[List[str]] = None) -> bytes:
+    sections = [
+        (b'PLYR', _PLAYER.pack(snap.player_x, snap.player_y, snap.coins, int(snap.elapsed_ms), snap.fireballs_left)),
+        (b'GRID', _encode_grid(snap.layout, base_layout)),
+        (b'HOLE', _pack_records(_HOLE, snap.holes)),
+        (b'ENMY', _pack_records(_ENEMY, snap.enemies)),
+        (b'PROJ', _pack_records(_PROJECTILE, snap.projectiles)),
+        (b'EXPL', _pack_records(_EXPLOSION, snap.explosions)),
+        (b'EVNT', _pack_records(_EVENT, snap.events)),
+    ]
+    out = [_HEADER.pack(MAGIC, VERSION, 0)]
+    for tag, body in sections:
+        out.append(_SECTION.pack(tag, len(body)))
+        out.append(body)
+    return b''.join(out)
+
+
+def decode_snapshot(data: bytes, base_layout: Optional[List[str]] = None) -> Snapshot:
+    try:
+        magic, version, _flags = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a save file")
+        if version > VERSION:
+            raise ValueError(f"Save version {version} is newer than supported ({VERSION})")
+
+        sections = {}
+        pos = _HEADER.size
+        while pos < len(data):
+            tag, length = _SECTION.unpack_from(data, pos)
+            pos += _SECTION.size
+            sections[tag] = data[pos:pos + length]
+            pos += length
+
+        player_x, player_y, coins, elapsed_ms, fireballs_left = _PLAYER.unpack_from(sections[b'PLYR'])
+        return Snapshot(
+            player_x, player_y, coins, elapsed_ms, fireballs_left,
+            _decode_grid(sections[b'GRID'], base_layout),
+            _unpack_records(_HOLE, sections[b'HOLE']) if b'HOLE' in sections else [],
+            _unpack_records(_ENEMY, sections[b'ENMY']) if b'ENMY' in sections else [],
+            _unpack_records(_PROJECTILE, sections[b'PROJ']) if b'PROJ' in sections else [],
+            _unpack_records(_EXPLOSION, sections[b'EXPL']) if b'EXPL' in sections else [],
+            _unpack_records(_EVENT, sections[b'EVNT']) if b'EVNT' in sections else [],
+        )
+    except (struct.error, KeyError) as e:
+        raise ValueError(f"Corrupt save file: {e}") from e
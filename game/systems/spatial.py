@@ -0,0 +1,88 @@
+import math
+from typing import Dict, List, Tuple
+import pygame
+from game.config import TILE_SIZE
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    # Uniform grid of buckets keyed by the tile cell under each entity's centre.
+    # Queries pad by one cell, so entities up to two cells wide are still found.
+
+    def __init__(self, cell_size: int = TILE_SIZE):
+        self.cell_size = cell_size
+        self._buckets: Dict[Cell, list] = {}
+        self._cell_of: Dict[int, Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def __contains__(self, entity) -> bool:
+        return id(entity) in self._cell_of
+
+    def _cell(self, entity) -> Cell:
+        center = entity.rect.center
+        return center[1] // self.cell_size, center[0] // self.cell_size
+
+    def insert(self, entity):
+        cell = self._cell(entity)
+        self._cell_of[id(entity)] = cell
+        self._buckets.setdefault(cell, []).append(entity)
+
+    def remove(self, entity):
+        cell = self._cell_of.pop(id(entity), None)
+        if cell is not None:
+            bucket = self._buckets[cell]
+            bucket.remove(entity)
+            if not bucket:
+                del self._buckets[cell]
+
+    def move(self, entity):
+        # Called for every moving entity each tick, so the unchanged-cell path is kept minimal
+        rect = entity.rect
+        size = self.cell_size
+        cell = (rect.centery // size, rect.centerx // size)
+        key = id(entity)
+        old = self._cell_of.get(key)
+        if old == cell:
+            return
+        if old is not None:
+            bucket = self._buckets[old]
+            bucket.remove(entity)
+            if not bucket:
+                del self._buckets[old]
+        self._cell_of[key] = cell
+        self._buckets.setdefault(cell, []).append(entity)
+
+    def rebuild(self, entities):
+        self._buckets.clear()
+        self._cell_of.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def _nearby(self, left: float, top: float, right: float, bottom: float):
+        size = self.cell_size
+        buckets = self._buckets
+        for r in range(int(top // size) - 1, int(bottom // size) + 2):
+            for c in range(int(left // size) - 1, int(right // size) + 2):
+                bucket = buckets.get((r, c))
+                if bucket:
+                    yield from bucket
+
+    def query_rect(self, rect: pygame.Rect, inset: int = 0) -> list:
+        # `inset` shrinks each entity's rect per side first, e.g. for a forgiving hit box
+        nearby = self._nearby(rect.left, rect.top, rect.right, rect.bottom)
+        if inset:
+            return [e for e in nearby if rect.colliderect(e.rect.inflate(-2 * inset, -2 * inset))]
+        return [e for e in nearby if rect.colliderect(e.rect)]
+
+    def query_radius(self, x: float, y: float, radius: float) -> list:
+        # Entities whose centre lies within `radius` of (x, y)
+        found = []
+        for e in self._nearby(x - radius, y - radius, x + radius, y + radius):
+            ex = e.x + e.rect.width / 2
+            ey = e.y + e.rect.height / 2
+            if math.hypot(ex - x, ey - y) <= radius:
+                found.append(e)
+        return found
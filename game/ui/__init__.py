@@ -1,2 +1,3 @@
 from .ui_renderer import UIRenderer
-from .components import Button, InputField, Dropdown
\ No newline at end of file
+from .components import Button, InputField, Dropdown
+from .fonts import load_font, render_text, GlyphStrip
@@ -1,4 +1,5 @@
 import pygame
+from game.ui.fonts import load_font, render_text
 from game.config import *
 
 UI_BG = (50, 50, 50)
@@ -23,8 +24,10 @@ class Button(UIElement):
         self.text = text
         self.callback = callback
         self.base_color = color
-        self.font = pygame.font.SysFont("Arial", 16, bold=True)
+        self.font = load_font("Arial", 16, bold=True)
         self.icon = None
+        self._text_surf = None
+        self._rendered_text = None
 
     def set_icon(self, surface):
         self.icon = pygame.transform.scale(surface, (self.rect.width - 4, self.rect.height - 4))
@@ -45,7 +48,10 @@ class Button(UIElement):
             icon_rect = self.icon.get_rect(center=self.rect.center)
             screen.blit(self.icon, icon_rect)
         elif self.text:
-            text_surf = self.font.render(self.text, True, UI_TEXT)
+            if self.text != self._rendered_text:
+                self._rendered_text = self.text
+                self._text_surf = render_text(self.font, self.text, UI_TEXT)
+            text_surf = self._text_surf
             text_rect = text_surf.get_rect(center=self.rect.center)
             screen.blit(text_surf, text_rect)
 
@@ -55,7 +61,9 @@ class InputField(UIElement):
         super().__init__(x, y, w, h)
         self.text = text
         self.active = False
-        self.font = pygame.font.SysFont("Consolas", 18)
+        self.font = load_font("Consolas", 18)
+        self._text_surf = None
+        self._rendered_text = None
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -81,7 +89,11 @@ class InputField(UIElement):
         pygame.draw.rect(screen, color, self.rect)
         pygame.draw.rect(screen, UI_BORDER, self.rect, 2)
 
-        text_surf = self.font.render(self.text, True, UI_TEXT)
+        # Typed text is rendered once per edit, not once per frame
+        if self.text != self._rendered_text:
+            self._rendered_text = self.text
+            self._text_surf = self.font.render(self.text, True, UI_TEXT)
+        text_surf = self._text_surf
         screen.blit(text_surf, (self.rect.x + 5, self.rect.centery - text_surf.get_height() // 2))
 
 
@@ -93,7 +105,9 @@ class Dropdown(UIElement):
         self.direction = direction
         self.is_open = False
         self.selected_index = 0
-        self.font = pygame.font.SysFont("Arial", 14)
+        self.font = load_font("Arial", 14)
+        self._option_surfs = []
+        self._rendered_options = None
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -130,7 +144,7 @@ class Dropdown(UIElement):
         current_text = self.options[self.selected_index] if self.options else "Empty"
         if len(current_text) > 18: current_text = current_text[:15] + "..."
 
-        text_surf = self.font.render(current_text, True, UI_TEXT)
+        text_surf = render_text(self.font, current_text, UI_TEXT)
         screen.blit(text_surf, (self.rect.x + 5, self.rect.centery - text_surf.get_height() // 2))
 
         arrow_y = self.rect.centery - 2 if self.direction == 'down' else self.rect.centery + 2
@@ -141,7 +155,13 @@ class Dropdown(UIElement):
         ])
 
         if self.is_open:
-            for i, option in enumerate(self.options):
+            # Option labels are rendered when the list changes (levels added or renamed)
+            if self._rendered_options != self.options:
+                self._rendered_options = list(self.options)
+                self._option_surfs = [self.font.render(option, True, UI_TEXT) for option in self.options]
+
+            mouse_pos = pygame.mouse.get_pos()
+            for i, opt_surf in enumerate(self._option_surfs):
                 if self.direction == 'up':
                     y_pos = self.rect.top - (len(self.options) - i) * self.rect.height
                 else:
@@ -149,11 +169,9 @@ class Dropdown(UIElement):
 
                 opt_rect = pygame.Rect(self.rect.x, y_pos, self.rect.width, self.rect.height)
 
-                mouse_pos = pygame.mouse.get_pos()
                 color = UI_ACTIVE if opt_rect.collidepoint(mouse_pos) else UI_HOVER
 
                 pygame.draw.rect(screen, color, opt_rect)
                 pygame.draw.rect(screen, UI_BORDER, opt_rect, 1)
 
-                opt_surf = self.font.render(option, True, UI_TEXT)
                 screen.blit(opt_surf, (opt_rect.x + 5, opt_rect.centery - opt_surf.get_height() // 2))
\ No newline at end of file
@@ -0,0 +1,98 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import pygame
+from game.config import FONT_CACHE_FILE, TEXT_CACHE_SIZE
+from game.utils import atomic_write
+
+# pygame.font.SysFont scans every installed font on its first call. The file it resolves
+# to is remembered in FONT_CACHE_FILE, so later launches open fonts straight by path.
+
+_fonts: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+_paths: Optional[Dict[str, List]] = None
+_text_cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+
+def _read_cache() -> Dict[str, List]:
+    if not os.path.exists(FONT_CACHE_FILE):
+        return {}
+    try:
+        with open(FONT_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading font cache: {e}")
+        return {}
+
+
+def _resolve(name: str, bold: bool) -> List:
+    # [font file or None for pygame's default, whether bold has to be synthesized]
+    global _paths
+    if _paths is None:
+        _paths = _read_cache()
+
+    key = f"{name}|{int(bold)}"
+    entry = _paths.get(key)
+    if entry is None or (entry[0] and not os.path.exists(entry[0])):
+        entry = list(pygame.font.SysFont(name, 1, bold, constructor=lambda path, size, b, i: (path, b)))
+        _paths[key] = entry
+        try:
+            atomic_write(FONT_CACHE_FILE, json.dumps(_paths, indent=2))
+        except OSError as e:
+            print(f"Error saving font cache: {e}")
+    return entry
+
+
+def load_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    # Same font SysFont would return, shared between every caller asking for it
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        path, synthetic_bold = _resolve(name, bold)
+        font = pygame.font.Font(path, size)
+        if synthetic_bold:
+            font.set_bold(True)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font: pygame.font.Font, text: str, color) -> pygame.Surface:
+    # Antialiased font.render behind a small LRU, for labels that repeat frame to frame
+    key = (font, text, tuple(color))
+    surf = _text_cache.get(key)
+    if surf is None:
+        surf = font.render(text, True, color)
+        _text_cache[key] = surf
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    return surf
+
+
+class GlyphStrip:
+    # Characters pre-rendered side by side on one surface; a number is drawn as one blit
+    # per digit from subsurfaces, so a running timer never calls font.render
+
+    def __init__(self, font: pygame.font.Font, color, chars: str = "0123456789"):
+        widths = [font.size(ch)[0] for ch in chars]
+        self.height = font.get_height()
+        self.surface = pygame.Surface((max(sum(widths), 1), self.height), pygame.SRCALPHA)
+        self.glyphs: Dict[str, pygame.Surface] = {}
+        x = 0
+        for ch, width in zip(chars, widths):
+            # The strip starts transparent, so an additive blit copies the glyph's alpha exactly
+            self.surface.blit(font.render(ch, True, color), (x, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            self.glyphs[ch] = self.surface.subsurface((x, 0, width, self.height))
+            x += width
+
+    def width(self, text: str) -> int:
+        return sum(self.glyphs[ch].get_width() for ch in text)
+
+    def draw(self, screen: pygame.Surface, text: str, pos: Tuple[int, int]) -> pygame.Rect:
+        x, y = pos
+        for ch in text:
+            glyph = self.glyphs[ch]
+            screen.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
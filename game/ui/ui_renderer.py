@@ -1,13 +1,18 @@
 import pygame
+from game.ui.fonts import load_font, render_text, GlyphStrip
 from game.config import *
 
 
 class UIRenderer:
+    SCORES_POPUP_SIZE = (200, 160)
+    SUMMARY_SIZE = (300, 200)
+
     def __init__(self):
-        self.font = pygame.font.SysFont("Arial", 20)
-        self.ui_font = pygame.font.SysFont("Consolas", 28, bold=True)
-        self.pause_font = pygame.font.SysFont("Consolas", 60, bold=True)
-        self.msg_font = pygame.font.SysFont("Consolas", 20, bold=True)
+        self.font = load_font("Arial", 20)
+        self.ui_font = load_font("Consolas", 28, bold=True)
+        self.pause_font = load_font("Consolas", 60, bold=True)
+        self.msg_font = load_font("Consolas", 20, bold=True)
+        self.debug_font = load_font("Consolas", 14)
 
         self.nav_rects = {
             'prev': pygame.Rect(0, 0, 0, 0),
@@ -17,6 +22,20 @@ class UIRenderer:
             'next_lvl': pygame.Rect(0, 0, 0, 0)
         }
 
+        # Retained surfaces: each is rebuilt only when the key it was drawn for changes
+        self._overlays = {}
+        self._hud = None
+        self._hud_key = None
+        self._timer_pos = (0, 0)
+        self._icon = None
+        self._icon_source = None
+        self._scores_popup = None
+        self._scores_key = None
+        self._summary = None
+        self._summary_key = None
+        self.time_digits = GlyphStrip(self.font, (200, 200, 200))
+        self._seconds_suffix = render_text(self.font, "s", (200, 200, 200))
+
     def _truncate_text(self, text: str, font: pygame.font.Font, max_width: int) -> str:
         if font.size(text)[0] <= max_width: return text
         ellipsis = "..."
@@ -25,120 +44,198 @@ class UIRenderer:
             if font.size(candidate)[0] <= max_width: return candidate
         return ellipsis
 
-    def draw_hud(self, screen: pygame.Surface, level_idx: int, coins: int, total_coins: int, time_ms: int,
-                 is_finished: bool, best_time: int, fireballs: int, fireball_icon: pygame.Surface):
-        pygame.draw.rect(screen, COLOR_PANEL, (0, GAME_HEIGHT, SCREEN_WIDTH, PANEL_HEIGHT))
+    def _overlay(self, size: tuple, alpha: int) -> pygame.Surface:
+        # Dimming layers are plain black surfaces with surface alpha, built once per size
+        key = (size, alpha)
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = pygame.Surface(size)
+            overlay.set_alpha(alpha)
+            self._overlays[key] = overlay
+        return overlay
+
+    def _build_hud(self, level_idx: int, coins: int, total_coins: int, best_time: int, fireballs: int,
+                   fireball_icon: pygame.Surface) -> pygame.Surface:
+        panel = pygame.Surface((SCREEN_WIDTH, PANEL_HEIGHT))
+        panel.fill(COLOR_PANEL)
 
         prev_color = COLOR_TEXT if level_idx > 0 else (100, 100, 100)
         next_color = COLOR_TEXT
 
-        prev_surf = self.ui_font.render("<", True, prev_color)
-        next_surf = self.ui_font.render(">", True, next_color)
+        prev_surf = render_text(self.ui_font, "<", prev_color)
+        next_surf = render_text(self.ui_font, ">", next_color)
 
-        self.nav_rects['prev'] = screen.blit(prev_surf, (25, GAME_HEIGHT + 15))
-        self.nav_rects['next'] = screen.blit(next_surf, (270, GAME_HEIGHT + 15))
+        self.nav_rects['prev'] = panel.blit(prev_surf, (25, 15)).move(0, GAME_HEIGHT)
+        self.nav_rects['next'] = panel.blit(next_surf, (270, 15)).move(0, GAME_HEIGHT)
 
-        base_y = GAME_HEIGHT + 18
-        center_y = base_y + 10
+        center_y = 28
 
         if fireball_icon:
-            w, h = fireball_icon.get_size()
-            scaled_icon = pygame.transform.scale(fireball_icon, (w * 5, h * 5))
-            icon_rect = scaled_icon.get_rect(centery=center_y, x=310)
-            screen.blit(scaled_icon, icon_rect)
+            if self._icon_source is not fireball_icon:
+                w, h = fireball_icon.get_size()
+                self._icon_source = fireball_icon
+                self._icon = pygame.transform.scale(fireball_icon, (w * 5, h * 5))
+            icon_rect = self._icon.get_rect(centery=center_y, x=310)
+            panel.blit(self._icon, icon_rect)
             count_text = f"x {fireballs}"
-            text_surf = self.font.render(count_text, True, (255, 100, 100))
+            text_surf = render_text(self.font, count_text, (255, 100, 100))
             text_rect = text_surf.get_rect(centery=center_y, left=icon_rect.right + 5)
-            screen.blit(text_surf, text_rect)
-
+            panel.blit(text_surf, text_rect)
 
         coin_text = f"Coins: {coins}/{total_coins}"
-        coin_surf = self.font.render(coin_text, True, COLOR_GOLD)
+        coin_surf = render_text(self.font, coin_text, COLOR_GOLD)
         coin_rect = coin_surf.get_rect(centery=center_y, left=SCREEN_WIDTH - 430)
-        screen.blit(coin_surf, coin_rect)
+        panel.blit(coin_surf, coin_rect)
 
-        seconds = time_ms // 1000
-        time_text = f"Time: {seconds}s"
-        time_surf = self.font.render(time_text, True, (200, 200, 200))
+        # The timer itself changes every second, so only its fixed parts live on the panel
+        time_surf = render_text(self.font, "Time: ", (200, 200, 200))
         time_rect = time_surf.get_rect(centery=center_y, left=SCREEN_WIDTH - 290)
-        screen.blit(time_surf, time_rect)
+        panel.blit(time_surf, time_rect)
+        self._timer_pos = (time_rect.right, time_rect.y + GAME_HEIGHT)
 
         record_str = "Best: --"
         if best_time is not None:
             record_str = f"Best: {best_time // 1000}s"
 
-        best_surf = self.font.render(record_str, True, (255, 255, 100))
+        best_surf = render_text(self.font, record_str, (255, 255, 100))
         best_rect = best_surf.get_rect(centery=center_y, left=SCREEN_WIDTH - 170)
-        screen.blit(best_surf, best_rect)
+        panel.blit(best_surf, best_rect)
+        return panel
+
+    def draw_hud(self, screen: pygame.Surface, level_idx: int, coins: int, total_coins: int, time_ms: int,
+                 is_finished: bool, best_time: int, fireballs: int, fireball_icon: pygame.Surface):
+        # The panel is re-rendered only when one of its values changes; otherwise the HUD
+        # is the panel blit plus the timer digits from the glyph strip
+        key = (level_idx > 0, coins, total_coins, best_time, fireballs, fireball_icon)
+        if key != self._hud_key:
+            self._hud_key = key
+            self._hud = self._build_hud(level_idx, coins, total_coins, best_time, fireballs, fireball_icon)
+
+        panel_rect = screen.blit(self._hud, (0, GAME_HEIGHT))
+        digits_rect = self.time_digits.draw(screen, str(time_ms // 1000), self._timer_pos)
+        screen.blit(self._seconds_suffix, (digits_rect.right, digits_rect.y))
+        return panel_rect
 
     def draw_message(self, screen: pygame.Surface, text: str):
-        msg_surf = self.msg_font.render(text, True, (0, 255, 0))
+        msg_surf = render_text(self.msg_font, text, (0, 255, 0))
         msg_rect = msg_surf.get_rect(topright=(SCREEN_WIDTH - 10, 10))
-        screen.blit(msg_surf, msg_rect)
+        return screen.blit(msg_surf, msg_rect)
 
     def draw_pause(self, screen: pygame.Surface):
-        overlay = pygame.Surface((SCREEN_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        screen.blit(overlay, (0, 0))
-        pause_surf = self.pause_font.render("PAUSED", True, COLOR_TEXT)
+        screen.blit(self._overlay((SCREEN_WIDTH, GAME_HEIGHT), 128), (0, 0))
+        pause_surf = render_text(self.pause_font, "PAUSED", COLOR_TEXT)
         pause_rect = pause_surf.get_rect(center=(SCREEN_WIDTH // 2, GAME_HEIGHT // 2))
         screen.blit(pause_surf, pause_rect)
 
-    def draw_scores_popup(self, screen: pygame.Surface, level_idx: int, top_scores: list):
-        POPUP_W, POPUP_H = 200, 160
-        POPUP_X = (SCREEN_WIDTH - POPUP_W) // 2
-        POPUP_Y = (GAME_HEIGHT - POPUP_H) // 2
-        pygame.draw.rect(screen, (50, 50, 70), (POPUP_X, POPUP_Y, POPUP_W, POPUP_H))
-        pygame.draw.rect(screen, (200, 200, 200), (POPUP_X, POPUP_Y, POPUP_W, POPUP_H), 2)
+    def _build_scores_popup(self, level_idx: int, top_scores: tuple) -> pygame.Surface:
+        POPUP_W, POPUP_H = self.SCORES_POPUP_SIZE
+        popup = pygame.Surface((POPUP_W, POPUP_H))
+        popup.fill((50, 50, 70))
+        pygame.draw.rect(popup, (200, 200, 200), (0, 0, POPUP_W, POPUP_H), 2)
         title = self.font.render(f"Top 3 (Lvl {level_idx + 1})", True, COLOR_GOLD)
-        screen.blit(title, (POPUP_X + 20, POPUP_Y + 10))
-        self.nav_rects['close'] = pygame.Rect(POPUP_X + POPUP_W - 30, POPUP_Y + 5, 25, 25)
-        pygame.draw.rect(screen, (200, 50, 50), self.nav_rects['close'])
-        screen.blit(self.font.render("X", True, COLOR_TEXT),
-                    (self.nav_rects['close'].x + 6, self.nav_rects['close'].y - 2))
+        popup.blit(title, (20, 10))
+        close = pygame.Rect(POPUP_W - 30, 5, 25, 25)
+        pygame.draw.rect(popup, (200, 50, 50), close)
+        popup.blit(render_text(self.font, "X", COLOR_TEXT), (close.x + 6, close.y - 2))
         if not top_scores:
-            screen.blit(self.font.render("No records", True, (150, 150, 150)), (POPUP_X + 30, POPUP_Y + 60))
+            popup.blit(render_text(self.font, "No records", (150, 150, 150)), (30, 60))
         else:
             for i, score in enumerate(top_scores):
                 line = f"{i + 1}. {score // 1000}s"
-                screen.blit(self.font.render(line, True, COLOR_TEXT), (POPUP_X + 40, POPUP_Y + 50 + i * 30))
+                popup.blit(self.font.render(line, True, COLOR_TEXT), (40, 50 + i * 30))
+        return popup
 
-    def draw_summary_panel(self, screen: pygame.Surface, is_win: bool, time_ms: int):
-        overlay = pygame.Surface((SCREEN_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+    def draw_scores_popup(self, screen: pygame.Surface, level_idx: int, top_scores: list):
+        POPUP_W, POPUP_H = self.SCORES_POPUP_SIZE
+        POPUP_X = (SCREEN_WIDTH - POPUP_W) // 2
+        POPUP_Y = (GAME_HEIGHT - POPUP_H) // 2
+        key = (level_idx, tuple(top_scores))
+        if key != self._scores_key:
+            self._scores_key = key
+            self._scores_popup = self._build_scores_popup(level_idx, key[1])
+        screen.blit(self._scores_popup, (POPUP_X, POPUP_Y))
+        self.nav_rects['close'] = pygame.Rect(POPUP_X + POPUP_W - 30, POPUP_Y + 5, 25, 25)
 
-        W, H = 300, 200
-        X = (SCREEN_WIDTH - W) // 2
-        Y = (GAME_HEIGHT - H) // 2
+    def _build_summary_panel(self, is_win: bool, seconds: int) -> pygame.Surface:
+        W, H = self.SUMMARY_SIZE
+        panel = pygame.Surface((W, H))
 
         border_col = (50, 200, 50) if is_win else (200, 50, 50)
-        pygame.draw.rect(screen, (30, 30, 40), (X, Y, W, H))
-        pygame.draw.rect(screen, border_col, (X, Y, W, H), 3)
+        panel.fill((30, 30, 40))
+        pygame.draw.rect(panel, border_col, (0, 0, W, H), 3)
 
         title_text = "VICTORY!" if is_win else "GAME OVER"
         title_col = (100, 255, 100) if is_win else (255, 100, 100)
-        title_surf = self.ui_font.render(title_text, True, title_col)
-        screen.blit(title_surf, title_surf.get_rect(center=(X + W // 2, Y + 40)))
+        title_surf = render_text(self.ui_font, title_text, title_col)
+        panel.blit(title_surf, title_surf.get_rect(center=(W // 2, 40)))
 
-        res_text = f"Time: {time_ms // 1000}s" if is_win else "Try Again!"
+        res_text = f"Time: {seconds}s" if is_win else "Try Again!"
         res_surf = self.font.render(res_text, True, (255, 255, 255))
-        screen.blit(res_surf, res_surf.get_rect(center=(X + W // 2, Y + 80)))
+        panel.blit(res_surf, res_surf.get_rect(center=(W // 2, 80)))
 
         btn_w, btn_h = 100, 35
-        restart_rect = pygame.Rect(X + 20, Y + H - 50, btn_w, btn_h)
-        pygame.draw.rect(screen, (100, 100, 200), restart_rect)
-        pygame.draw.rect(screen, (200, 200, 255), restart_rect, 2)
-        rest_surf = self.font.render("Restart", True, (255, 255, 255))
-        screen.blit(rest_surf, rest_surf.get_rect(center=restart_rect.center))
-        self.nav_rects['restart'] = restart_rect
+        restart_rect = pygame.Rect(20, H - 50, btn_w, btn_h)
+        pygame.draw.rect(panel, (100, 100, 200), restart_rect)
+        pygame.draw.rect(panel, (200, 200, 255), restart_rect, 2)
+        rest_surf = render_text(self.font, "Restart", (255, 255, 255))
+        panel.blit(rest_surf, rest_surf.get_rect(center=restart_rect.center))
+
+        if is_win:
+            next_rect = pygame.Rect(W - 20 - btn_w, H - 50, btn_w, btn_h)
+            pygame.draw.rect(panel, (50, 150, 50), next_rect)
+            pygame.draw.rect(panel, (150, 255, 150), next_rect, 2)
+            next_surf = render_text(self.font, "Next Lvl", (255, 255, 255))
+            panel.blit(next_surf, next_surf.get_rect(center=next_rect.center))
+        return panel
 
+    def draw_summary_panel(self, screen: pygame.Surface, is_win: bool, time_ms: int):
+        screen.blit(self._overlay((SCREEN_WIDTH, GAME_HEIGHT), 180), (0, 0))
+
+        W, H = self.SUMMARY_SIZE
+        X = (SCREEN_WIDTH - W) // 2
+        Y = (GAME_HEIGHT - H) // 2
+
+        key = (is_win, time_ms // 1000 if is_win else 0)
+        if key != self._summary_key:
+            self._summary_key = key
+            self._summary = self._build_summary_panel(*key)
+        screen.blit(self._summary, (X, Y))
+
+        btn_w, btn_h = 100, 35
+        self.nav_rects['restart'] = pygame.Rect(X + 20, Y + H - 50, btn_w, btn_h)
         if is_win:
-            next_rect = pygame.Rect(X + W - 20 - btn_w, Y + H - 50, btn_w, btn_h)
-            pygame.draw.rect(screen, (50, 150, 50), next_rect)
-            pygame.draw.rect(screen, (150, 255, 150), next_rect, 2)
-            next_surf = self.font.render("Next Lvl", True, (255, 255, 255))
-            screen.blit(next_surf, next_surf.get_rect(center=next_rect.center))
-            self.nav_rects['next_lvl'] = next_rect
+            self.nav_rects['next_lvl'] = pygame.Rect(X + W - 20 - btn_w, Y + H - 50, btn_w, btn_h)
         else:
-            self.nav_rects['next_lvl'] = pygame.Rect(0, 0, 0, 0)
\ No newline at end of file
+            self.nav_rects['next_lvl'] = pygame.Rect(0, 0, 0, 0)
+
+    def draw_profiler(self, screen: pygame.Surface, fps: float, averages: dict, histogram: list,
+                      bin_ms: float) -> pygame.Rect:
+        rows = [("FPS", f"{fps:5.1f}"), ("frame", averages.get("frame", 0.0))]
+        for name in ("input", "update", "update.map", "update.player", "update.projectiles",
+                     "update.enemies", "draw"):
+            label = "  " + name.split(".")[1] if "." in name else name
+            rows.append((label, averages.get(name, 0.0)))
+
+        line_h = 16
+        hist_h = 40
+        panel = pygame.Rect(10, 10, 190, 12 + len(rows) * line_h + hist_h + 20)
+        screen.blit(self._overlay(panel.size, 170), panel)
+
+        y = panel.y + 6
+        for label, value in rows:
+            text = value if isinstance(value, str) else f"{value:6.2f} ms"
+            screen.blit(render_text(self.debug_font, label, COLOR_TEXT), (panel.x + 8, y))
+            screen.blit(self.debug_font.render(text, True, COLOR_GOLD), (panel.x + 100, y))
+            y += line_h
+
+        # Frame-time histogram: one bar per bin, budget bins green, slow ones red
+        y += 4
+        bar_w = (panel.width - 16) // max(len(histogram), 1)
+        peak = max(histogram, default=0) or 1
+        for i, count in enumerate(histogram):
+            h = int(hist_h * count / peak)
+            color = (80, 200, 80) if (i + 1) * bin_ms <= 1000.0 / FPS + bin_ms else (220, 80, 80)
+            pygame.draw.rect(screen, color, (panel.x + 8 + i * bar_w, y + hist_h - h, bar_w - 1, h))
+        screen.blit(render_text(self.debug_font, f"0 - {len(histogram) * bin_ms:.0f}+ ms", (160, 160, 160)),
+                    (panel.x + 8, y + hist_h + 2))
+        return panel
@@ -1,19 +1,72 @@
+import threading
 import time
-from functools import wraps
 
 import pygame
 import os
 
-def log_execution(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"[LOG] {func.__name__} executed in {end - start:.4f} seconds")
-        return result
 
-    return wrapper
+def atomic_write(path, data, mode="w", encoding="utf-8"):
+    # Write next to the target and rename over it, so a crash never leaves a truncated file
+    os.replace(write_temp(path, data, mode, encoding), path)
+
+
+def write_temp(path, data, mode="w", encoding="utf-8") -> str:
+    # First half of atomic_write, for callers that must rename under their own lock
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode, encoding=None if "b" in mode else encoding) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+class DebouncedWriter:
+    # Runs flush_fn on one background thread once changes stop arriving for `delay` seconds.
+    # flush_fn returns False when the write failed; the changes then stay dirty for the
+    # next flush instead of being dropped.
+
+    def __init__(self, flush_fn, delay: float):
+        self._flush_fn = flush_fn
+        self._delay = delay
+        self._deadline = None
+        self._worker = None
+        self._dirty = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._dirty
+
+    def mark_dirty(self):
+        with self._cond:
+            self._dirty = True
+            # Every change pushes the deadline back; the worker re-reads it when woken
+            self._deadline = time.monotonic() + self._delay
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._deadline is None or time.monotonic() < self._deadline:
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._cond.wait(timeout)
+            self.flush()
+
+    def flush(self):
+        # Waits for a write already in progress, so a flush on quit never returns early
+        with self._write_lock:
+            with self._cond:
+                self._deadline = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+            if self._flush_fn() is False:
+                with self._cond:
+                    self._dirty = True
 
 
 def load_image_asset(path, scale=None, auto_crop=True):
@@ -24,7 +77,10 @@ def load_image_asset(path, scale=None, auto_crop=True):
         return surf
 
     try:
-        image = pygame.image.load(path).convert_alpha()
+        image = pygame.image.load(path)
+        # Headless runs (no display mode set) keep the raw surface
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
     except pygame.error as e:
         print(f"Pygame Error loading {path}: {e}")
         return pygame.Surface((24, 24))